@@ -1,32 +1,47 @@
 """メタ学習を含む自律的なワークフロー実行のサンプル。"""
+import asyncio
 import os
 import logging
-from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import sys
+
+import numpy as np
 from genesis_agi.core.unified_manager import UnifiedManager
 from genesis_agi.llm.client import LLMClient
 from genesis_agi.operators.operator_registry import OperatorRegistry
 from genesis_agi.operators.operator_generator import OperatorGenerator
-from genesis_agi.models.operator import Base
 from genesis_agi.utils.cache import Cache
+from genesis_agi.utils.log_handlers import BufferedFileHandler, setup_queue_logging
 from genesis_agi.core.meta_learning import MetaLearner
 
+# 分析結果の出力テンプレート
+RECORD_TMPL = "\nタスク: {0}\n状態: {1}".format
+RECORD_DATA_TMPL = "データ: {0}".format
+OPERATOR_STATS_TMPL = (
+    "\nオペレーター: {0}\n実行回数: {1}\n成功率: {2:.2f}\n"
+    "平均実行時間: {3:.2f}秒\n生成タスク数: {4}"
+).format
+STRAT_TMPL = "\n戦略名: {0}\n成功率: {1:.2f}\n平均パフォーマンス: {2:.2f}\n使用回数: {3}".format
+EVOLUTION_TMPL = "\n=== 進化パターン ===\nパターン数: {0}\n平均改善度: {1:.2f}".format
+
 
 def setup_logging() -> None:
     """ロギングの設定を行う。"""
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(),  # 標準出力へのハンドラ
-            logging.FileHandler('genesis_agi.log')  # ファイルへのハンドラ
-        ]
-    )
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [
+        logging.StreamHandler(),  # 標準出力へのハンドラ
+        BufferedFileHandler('genesis_agi.log')  # ファイルへのハンドラ
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # 出力はキュー経由でバックグラウンドスレッドが行う
+    setup_queue_logging(*handlers, level=logging.DEBUG)
 
 
 def setup_environment() -> None:
     """環境設定を行う。"""
+    from dotenv import load_dotenv
+
     load_dotenv()
     
     required_vars = ["OPENAI_API_KEY", "DATABASE_URL"]
@@ -41,10 +56,23 @@ def setup_environment() -> None:
 
 def setup_database():
     """データベースの設定を行う。"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from genesis_agi.models.operator import Base
+
     database_url = os.getenv("DATABASE_URL")
     if database_url is None:
         raise ValueError("DATABASE_URLが設定されていません")
-    engine = create_engine(database_url)
+    # SQLite以外では接続プールを明示的に設定する
+    pool_options = {} if database_url.startswith("sqlite") else {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_pre_ping": True,
+        "pool_recycle": 300,
+    }
+    engine = create_engine(database_url, **pool_options)
+    logging.getLogger(__name__).info(f"データベース接続プール: {engine.pool.status()}")
     
     # テーブルの作成
     Base.metadata.create_all(engine)
@@ -74,8 +102,19 @@ def main():
         logger.info("データベース設定完了")
         
         # 基本コンポーネントの初期化
-        llm_client = LLMClient(api_key)
-        cache = Cache()  # 必要に応じてキャッシュの設定を追加
+        redis_url = os.getenv("REDIS_URL")
+        if redis_url:
+            from genesis_agi.utils.cache_backends import redis_config_from_url
+
+            # セマンティックキャッシュのベクトルをRedisで共有する
+            cache = Cache(
+                backend="redis",
+                redis_config=redis_config_from_url(redis_url, prefix="genesis:"),
+                l1_size=1024
+            )
+        else:
+            cache = Cache(l1_size=1024)  # 必要に応じてキャッシュの設定を追加
+        llm_client = LLMClient(api_key, cache=cache, semantic_threshold=0.95)
         
         # オペレーターレジストリの初期化
         registry = OperatorRegistry(db_session)
@@ -84,7 +123,7 @@ def main():
         generator = OperatorGenerator(llm_client, registry, cache)
         
         # メタラーナーの初期化
-        meta_learner = MetaLearner(llm_client, cache)
+        meta_learner = MetaLearner(llm_client, registry, generator, cache)
         
         # UnifiedManagerの初期化
         manager = UnifiedManager(
@@ -112,7 +151,7 @@ def main():
         
         # 自律的な実行を開始
         logger.info("自律的な実行を開始")
-        manager.run()
+        asyncio.run(manager.arun())
         
         # 結果の分析
         analyze_results(manager)
@@ -147,13 +186,49 @@ def analyze_results(manager: UnifiedManager) -> None:
         print("---")
     
     # 実行履歴の表示
-    print("\n=== 実行履歴 ===")
-    for record in manager.execution_history:
-        print(f"\nタスク: {record.task.description}")
-        if hasattr(record, 'result'):
-            print(f"状態: {record.result.get('status', '不明')}")
-            if 'data' in record.result:
-                print(f"データ: {record.result['data']}")
+    lines = ["\n=== 実行履歴 ==="]
+    for record in manager.iter_history():
+        lines.append(RECORD_TMPL(record.task.description, record.result.get('status', '不明')))
+        if 'data' in record.result:
+            lines.append(RECORD_DATA_TMPL(record.result['data']))
+
+    # オペレーター別の統計（実行ごとに差分更新された集計を参照する）
+    operator_stats = manager.operator_stats
+    if operator_stats:
+        lines.append("\n=== オペレーター別統計 ===")
+        for operator_name, stats in operator_stats.items():
+            lines.append(OPERATOR_STATS_TMPL(
+                operator_name,
+                stats["count"],
+                stats["success"] / stats["count"],
+                stats["total_time"] / stats["count"],
+                stats["generated"]
+            ))
+
+    if manager.meta_learner:
+        # 生成戦略の分析
+        strategies = manager.meta_learner.generation_strategies
+        if strategies:
+            lines.append("\n=== 生成戦略 ===")
+            for strategy_name, strategy in strategies.items():
+                lines.append(STRAT_TMPL(
+                    strategy_name,
+                    strategy.success_rate,
+                    strategy.avg_performance,
+                    strategy.usage_count
+                ))
+
+        # 進化パターンの分析
+        evolution_patterns = manager.meta_learner.evolution_patterns
+        if evolution_patterns:
+            improvements = np.array([
+                pattern.performance_improvement.after - pattern.performance_improvement.before
+                for pattern in evolution_patterns
+            ])
+            lines.append(EVOLUTION_TMPL(len(evolution_patterns), np.mean(improvements)))
+
+    # 出力はまとめて1回で書き出す
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
@@ -36,6 +36,12 @@ class DataCollectionOperator(BaseOperator):
                     "description": "基本的な統計分析の実行",
                     "operator_type": "DataAnalysisOperator",
                     "params": {"target_data": collected_data}
+                },
+                {
+                    "description": "クリーニング結果と分析結果の統合",
+                    "operator_type": "DataIntegrationOperator",
+                    "params": {},
+                    "depends_on": [0, 1]  # 上の2つのタスクの完了後に実行
                 }
             ]
         }
@@ -127,7 +133,8 @@ def main():
         llm_client=llm_client,
         registry=registry,
         cache=cache,
-        objective="顧客の購買パターンを分析し、インサイトを抽出する"
+        objective="顧客の購買パターンを分析し、インサイトを抽出する",
+        dag_workers=8  # 依存関係の無いタスク（クリーニングと分析など）を並列に実行
     )
     
     # 初期タスクの作成
@@ -142,9 +149,9 @@ def main():
     
     # 実行結果の確認
     print("実行履歴:")
-    for record in manager.execution_history:
-        print(f"タスク: {record['task']['description']}")
-        print(f"結果: {record['result']}\n")
+    for record in manager.iter_history():
+        print(f"タスク: {record.task.description}")
+        print(f"結果: {record.result}\n")
     
     print("パフォーマンス指標:")
     print(manager.current_context["performance_metrics"])
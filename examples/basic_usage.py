@@ -1,20 +1,29 @@
 """基本的な使用方法を示すサンプルスクリプト。"""
+import asyncio
 import json
 import logging
 import os
+import time
 from datetime import datetime
 from pathlib import Path
 
 from dotenv import load_dotenv
+from pydantic import BaseModel
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+try:
+    import orjson
+except ImportError:  # orjsonが無い環境では標準のjsonを使用する
+    orjson = None
+
 from genesis_agi.llm.client import LLMClient
 from genesis_agi.operators.task_creation import TaskCreationOperator
 from genesis_agi.operators.task_execution import TaskExecutionOperator
 from genesis_agi.operators.task_prioritization import TaskPrioritizationOperator
 from genesis_agi.task_manager import TaskManager
 from genesis_agi.utils.cache import Cache
+from genesis_agi.utils.log_handlers import BufferedFileHandler, setup_queue_logging
 from genesis_agi.models.task_record import Base
 
 # 環境変数の読み込み
@@ -27,13 +36,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 1イテレーションで並行して実行するタスク数
+BATCH_SIZE = 3
+
 def setup_database():
     """データベースの設定を行う。"""
     database_url = os.getenv("DATABASE_URL")
     if database_url is None:
         raise ValueError("DATABASE_URLが設定されていません")
     
-    engine = create_engine(database_url)
+    # SQLite以外では接続プールを明示的に設定する
+    pool_options = {} if database_url.startswith("sqlite") else {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_pre_ping": True,
+        "pool_recycle": 300,
+    }
+    engine = create_engine(database_url, **pool_options)
+    logger.info(f"データベース接続プール: {engine.pool.status()}")
     
     # テーブルの作成
     Base.metadata.create_all(engine)
@@ -52,59 +72,82 @@ def setup_logging():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     log_file = log_dir / f"genesis_agi_{timestamp}.log"
 
-    # ログハンドラの設定
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    # ログハンドラの設定（書き込みはバックグラウンドスレッドでまとめて行う）
+    file_handler = BufferedFileHandler(log_file)
     file_handler.setFormatter(
         logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
     )
 
     # ルートロガーの設定
-    logger = logging.getLogger()
-    logger.addHandler(file_handler)
-    logger.setLevel(logging.INFO)
+    setup_queue_logging(file_handler, level=logging.INFO)
 
     return log_file
 
-def save_artifacts(task_manager, output_dir: Path):
-    """アーティファクトを保存する。
+class RunLogger:
+    """実行中の記録を1つのJSONLファイル（run.jsonl）に逐次書き出すロガー。
 
-    Args:
-        task_manager: タスクマネージャー
-        output_dir: 出力ディレクトリ
+    各行は {"t": タイムスタンプ, "type": 記録の種類, "payload": 内容} の形式。
     """
-    # 出力ディレクトリの作成
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    # タスク履歴の保存
-    task_history_file = output_dir / "task_history.json"
-    with open(task_history_file, "w", encoding="utf-8") as f:
-        json.dump(task_manager.task_history, f, ensure_ascii=False, indent=2)
-
-    # 現在のタスクの保存
-    current_tasks_file = output_dir / "current_tasks.json"
-    with open(current_tasks_file, "w", encoding="utf-8") as f:
-        json.dump(
-            [task.dict() for task in task_manager.current_tasks],
-            f,
-            ensure_ascii=False,
-            indent=2,
-        )
-
-    # パフォーマンス指標の保存
-    metrics_file = output_dir / "performance_metrics.json"
-    with open(metrics_file, "w", encoding="utf-8") as f:
-        json.dump(task_manager.performance_metrics, f, ensure_ascii=False, indent=2)
 
-def main():
+    def __init__(self, path: Path):
+        """初期化。
+
+        Args:
+            path: 出力先のパス
+        """
+        self.path = path
+        self._file = None
+
+    def __enter__(self) -> "RunLogger":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "ab")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._file.close()
+        self._file = None
+
+    def log(self, record_type: str, payload) -> None:
+        """記録を1行書き出す。
+
+        pydanticモデル（またはそのリスト）はmodel_dump_jsonで直接JSONにする。
+
+        Args:
+            record_type: 記録の種類
+            payload: 記録の内容
+        """
+        if isinstance(payload, BaseModel):
+            payload_json = payload.model_dump_json().encode("utf-8")
+        elif isinstance(payload, list) and all(isinstance(item, BaseModel) for item in payload):
+            payload_json = (
+                "[" + ",".join(item.model_dump_json() for item in payload) + "]"
+            ).encode("utf-8")
+        else:
+            payload_json = self._dumps(payload)
+
+        header = self._dumps({"t": time.time(), "type": record_type})
+        self._file.write(header[:-1] + b',"payload":' + payload_json + b"}\n")
+
+    @staticmethod
+    def _dumps(obj) -> bytes:
+        """オブジェクトをJSONのバイト列に変換する。"""
+        if orjson is not None:
+            return orjson.dumps(
+                obj,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+            )
+        return json.dumps(obj, ensure_ascii=False, default=str).encode("utf-8")
+
+async def amain():
     # ログの設定
     log_file = setup_logging()
     logger.info(f"ログファイル: {log_file}")
 
-    # アーティファクトディレクトリの設定
+    # 実行記録の出力先の設定
     artifacts_dir = Path("./artifacts")
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_dir = artifacts_dir / timestamp
-    logger.info(f"アーティファクトディレクトリ: {output_dir}")
+    run_file = artifacts_dir / timestamp / "run.jsonl"
+    logger.info(f"実行記録ファイル: {run_file}")
 
     # OpenAI APIキーの取得
     api_key = os.getenv("OPENAI_API_KEY")
@@ -119,7 +162,8 @@ def main():
     cache = Cache(
         backend="filesystem",
         cache_dir=cache_dir,
-        max_size=1000
+        max_size=1000,
+        l1_size=1024
     )
 
     # データベースセッションの初期化
@@ -128,7 +172,8 @@ def main():
     # LLMクライアントの初期化
     llm_client = LLMClient(
         api_key=api_key,
-        model="gpt-3.5-turbo"
+        model="gpt-3.5-turbo",
+        cache=cache
     )
 
     # タスクマネージャーの初期化
@@ -147,49 +192,53 @@ def main():
     # タスクの実行
     try:
         logger.info("タスクの実行を開始します...")
-        
-        # 初期タスクの生成
-        initial_task = task_manager.create_initial_task()
-        logger.info(f"初期タスク: {initial_task}")
-
-        # タスクの実行ループ
-        for i in range(5):  # 5回のイテレーション
-            logger.info(f"\nイテレーション {i+1}")
-            
-            # 次のタスクを取得
-            current_task = task_manager.get_next_task()
-            if not current_task:
-                logger.info("実行するタスクがありません。")
-                break
-
-            logger.info(f"現在のタスク: {current_task}")
-
-            # タスクの実行
-            result = task_manager.execute_task(current_task)
-            logger.info(f"実行結果: {result}")
-
-            # 新しいタスクの生成
-            new_tasks = task_manager.create_new_tasks(current_task, result)
-            logger.info(f"生成された新しいタスク: {new_tasks}")
-
-            # タスクの優先順位付け
-            task_manager.prioritize_tasks()
-            logger.info("タスクの優先順位を更新しました")
-
-            # パフォーマンス分析
-            performance = task_manager.analyze_performance()
-            logger.info(f"パフォーマンス分析: {performance}")
-
-        # アーティファクトの保存
-        save_artifacts(task_manager, output_dir)
-        logger.info(f"アーティファクトを保存しました: {output_dir}")
+
+        with RunLogger(run_file) as run:
+            # 初期タスクの生成
+            initial_task = task_manager.create_initial_task()
+            logger.info(f"初期タスク: {initial_task}")
+            run.log("task_created", initial_task)
+            seen_task_ids = {initial_task.id}
+
+            # タスクの実行ループ
+            for i in range(5):  # 5回のイテレーション
+                logger.info(f"\nイテレーション {i+1}")
+
+                # タスクの実行、新しいタスクの生成、優先順位付けを並行して実行
+                results = await task_manager.aexecute_iteration(BATCH_SIZE)
+                if not results:
+                    logger.info("実行するタスクがありません。")
+                    break
+
+                for result in results:
+                    logger.info(f"実行結果: {result}")
+                    run.log("result", result)
+
+                for task in task_manager.current_tasks:
+                    if task.id not in seen_task_ids:
+                        seen_task_ids.add(task.id)
+                        run.log("task_created", task)
+
+                # パフォーマンス分析（aexecute_iterationで更新済み）
+                performance = task_manager.performance_metrics
+                logger.info(f"パフォーマンス分析: {performance}")
+                run.log("metrics", performance)
+
+            # 未実行のタスクを記録
+            run.log("pending_tasks", task_manager.current_tasks)
+
+        logger.info(f"実行記録を保存しました: {run_file}")
 
     except Exception as e:
         logger.error(f"エラーが発生しました: {e}", exc_info=True)
     finally:
         # クリーンアップ
         task_manager.cleanup()
+        await llm_client.aclose()
         db_session.close()
 
+def main():
+    asyncio.run(amain())
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,10 +1,19 @@
 """分散キャッシュを使用したサンプルスクリプト。"""
+import asyncio
 import logging
+import os
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from genesis_agi.llm.client import LLMClient
+from genesis_agi.models.task_record import Base
 from genesis_agi.task_manager import TaskManager
 from genesis_agi.operators.task_creation import TaskCreationOperator
 from genesis_agi.operators.task_execution import TaskExecutionOperator
 from genesis_agi.operators.task_prioritization import TaskPrioritizationOperator
 from genesis_agi.utils.cache import Cache
+from genesis_agi.utils.cache_backends import redis_config_from_url
 
 # ログの設定
 logging.basicConfig(
@@ -13,30 +22,41 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def main():
+# 1イテレーションで並行して実行するタスク数
+BATCH_SIZE = 3
+
+def setup_database():
+    """データベースの設定を行う。"""
+    engine = create_engine(os.getenv("DATABASE_URL", "sqlite:///genesis_agi.db"))
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    return Session()
+
+async def amain():
     # Redisキャッシュの初期化
     cache = Cache(
         backend="redis",
-        redis_config={
-            "host": "localhost",
-            "port": 6379,
-            "db": 0,
-            "prefix": "genesis:",
-            "decode_responses": True,
-        }
+        redis_config=redis_config_from_url(
+            os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+            prefix="genesis:",
+        )
     )
 
     # タスクマネージャーの初期化
+    llm_client = LLMClient(cache=cache)
+    db_session = setup_database()
     task_manager = TaskManager(
-        openai_api_key="your-api-key-here",
+        llm_client=llm_client,
+        db_session=db_session,
         cache=cache,
         objective="機械学習モデルの性能改善計画を立てる",
+        max_concurrency=8,
     )
 
     # オペレーターの設定
-    task_manager.add_operator(TaskCreationOperator())
-    task_manager.add_operator(TaskExecutionOperator())
-    task_manager.add_operator(TaskPrioritizationOperator())
+    task_manager.add_operator(TaskCreationOperator(llm_client))
+    task_manager.add_operator(TaskExecutionOperator(llm_client))
+    task_manager.add_operator(TaskPrioritizationOperator(llm_client))
 
     # タスクの実行
     try:
@@ -50,29 +70,17 @@ def main():
         for i in range(5):  # 5回のイテレーション
             logger.info(f"\nイテレーション {i+1}")
             
-            # キャッシュからタスク情報を取得
-            current_task = task_manager.get_next_task()
-            if not current_task:
+            # タスクの実行、新しいタスクの生成、優先順位付けを並行して実行
+            results = await task_manager.aexecute_iteration(BATCH_SIZE)
+            if not results:
                 logger.info("実行するタスクがありません。")
                 break
 
-            logger.info(f"現在のタスク: {current_task}")
+            for result in results:
+                logger.info(f"実行結果: {result}")
 
-            # タスクの実行とキャッシュの更新
-            result = task_manager.execute_task(current_task)
-            logger.info(f"実行結果: {result}")
-
-            # 新しいタスクの生成とキャッシュへの保存
-            new_tasks = task_manager.create_new_tasks(current_task, result)
-            logger.info(f"生成された新しいタスク: {new_tasks}")
-
-            # タスクの優先順位付けとキャッシュの更新
-            task_manager.prioritize_tasks()
-            logger.info("タスクの優先順位を更新しました")
-
-            # パフォーマンス分析の結果をキャッシュに保存
-            performance = task_manager.analyze_performance()
-            logger.info(f"パフォーマンス分析: {performance}")
+            # パフォーマンス分析の結果
+            logger.info(f"パフォーマンス分析: {task_manager.performance_metrics}")
 
             # キャッシュの統計情報を表示
             cache_stats = cache.get_stats()
@@ -83,6 +91,11 @@ def main():
     finally:
         # クリーンアップ
         task_manager.cleanup()
+        await llm_client.aclose()
+        db_session.close()
+
+def main():
+    asyncio.run(amain())
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
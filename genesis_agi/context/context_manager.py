@@ -1,9 +1,58 @@
 """コンテキストマネージャー。"""
-from typing import Any, Dict, Optional
+import logging
+import queue
+import threading
+from string import Formatter
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from genesis_agi.utils.cache import Cache
 from genesis_agi.utils.semantic_search import SemanticSearch
 
+logger = logging.getLogger(__name__)
+
+# インデックス待ちのドキュメントがこの数に達したらまとめて登録する
+INDEX_FLUSH_SIZE = 32
+
+# バックグラウンドのインデックス登録で1回にまとめる最大件数と、続きを待つ時間（秒）
+INDEX_BATCH_SIZE = 64
+INDEX_BATCH_WAIT = 0.05
+
+# キャッシュに保存する値の種類ごとの有効期限（秒）
+CACHE_TTLS: Dict[str, int] = {
+    "context": 60 * 60,
+    "prompt_template": 24 * 60 * 60,
+    "parameter": 24 * 60 * 60,
+    "strategy": 24 * 60 * 60,
+}
+
+
+def compile_template(template: str) -> Callable[[Dict[str, Any]], str]:
+    """str.format形式のテンプレートを、展開用の関数に変換する。
+
+    テンプレートの解析は変換時の1回だけ行う。書式指定や属性参照を含む
+    テンプレートはformat_mapで展開する。
+
+    Args:
+        template: テンプレート
+
+    Returns:
+        値の辞書を受け取って展開結果を返す関数
+    """
+    parts = list(Formatter().parse(template))
+    if any(
+        field is not None and (not field.isidentifier() or spec or conversion)
+        for _, field, spec, conversion in parts
+    ):
+        return template.format_map
+
+    def render(values: Dict[str, Any]) -> str:
+        return "".join(
+            literal if field is None else literal + str(values[field])
+            for literal, field, _, _ in parts
+        )
+
+    return render
+
 
 class ContextManager:
     """コンテキストマネージャー。"""
@@ -12,12 +61,15 @@ class ContextManager:
         self,
         cache: Optional[Cache] = None,
         semantic_search: Optional[SemanticSearch] = None,
+        background_indexing: bool = False,
     ):
         """初期化。
 
         Args:
             cache: キャッシュ
             semantic_search: セマンティック検索
+            background_indexing: インデックス登録をバックグラウンドのスレッドで行うかどうか
+                （有効にした場合は使い終わったらclose()を呼ぶこと）
         """
         self.cache = cache
         self.semantic_search = semantic_search or SemanticSearch()
@@ -25,6 +77,19 @@ class ContextManager:
         self.parameters: Dict[str, Any] = {}
         self.strategies: Dict[str, Dict[str, Any]] = {}
         self.context: Dict[str, Any] = {}
+        self._compiled_templates: Dict[str, Callable[[Dict[str, Any]], str]] = {}
+        self._pending_index: List[Tuple[str, str, Dict[str, Any]]] = []
+        self._index_lock = threading.Lock()
+        # _idx_queue・_pending_indexの確認と追加、close()での差し替えを排他する
+        self._queue_lock = threading.Lock()
+        self._idx_queue: Optional[queue.Queue] = None
+        self._indexer: Optional[threading.Thread] = None
+        if background_indexing:
+            self._idx_queue = queue.Queue()
+            self._indexer = threading.Thread(
+                target=self._indexer_loop, args=(self._idx_queue,), daemon=True
+            )
+            self._indexer.start()
 
     def add_to_context(self, key: str, value: Any) -> None:
         """コンテキストに情報を追加する。
@@ -37,14 +102,14 @@ class ContextManager:
 
         # キャッシュに保存
         if self.cache:
-            self.cache.set(f"context:{key}", value)
+            self.cache.set(f"context:{key}", value, ttl=CACHE_TTLS["context"])
 
         # セマンティック検索用のインデックスを更新
         if isinstance(value, (str, dict, list)):
-            self.semantic_search.index_document(
+            self._queue_index(
                 key,
                 str(value),
-                metadata={"type": "context", "key": key},
+                {"type": "context", "key": key},
             )
 
     def get_context(self, key: str) -> Optional[Any]:
@@ -86,17 +151,28 @@ class ContextManager:
         Returns:
             関連するコンテキスト
         """
-        results = self.semantic_search.search(
-            query,
-            limit=limit,
-            min_score=min_score,
-            filter_metadata={"type": "context"},
-        )
+        self.flush_index(force=True)
+        with self._index_lock:
+            results = self.semantic_search.search(
+                query,
+                limit=limit,
+                min_score=min_score,
+                filter_metadata={"type": "context"},
+            )
+
+        keys = [result.metadata["key"] for result in results]
+
+        # メモリに無いものはキャッシュからまとめて取得
+        missing_keys = [key for key in keys if self.context.get(key) is None]
+        if self.cache and missing_keys:
+            cached_values = self.cache.mget([f"context:{key}" for key in missing_keys])
+            for key, value in zip(missing_keys, cached_values):
+                if value is not None:
+                    self.context[key] = value
 
         relevant_context = {}
-        for result in results:
-            key = result.metadata["key"]
-            value = self.get_context(key)
+        for key in keys:
+            value = self.context.get(key)
             if value is not None:
                 relevant_context[key] = value
 
@@ -109,6 +185,8 @@ class ContextManager:
             template_name: テンプレート名
             new_template: 新しいテンプレート
         """
+        if self.prompt_templates.get(template_name) != new_template:
+            self._compiled_templates[template_name] = compile_template(new_template)
         self.prompt_templates[template_name] = new_template
 
         # キャッシュに保存
@@ -116,16 +194,29 @@ class ContextManager:
             self.cache.set(
                 f"prompt_template:{template_name}",
                 new_template,
+                ttl=CACHE_TTLS["prompt_template"],
                 metadata={"type": "prompt_template"},
             )
 
         # セマンティック検索用のインデックスを更新
-        self.semantic_search.index_document(
+        self._queue_index(
             f"prompt_template:{template_name}",
             new_template,
-            metadata={"type": "prompt_template", "name": template_name},
+            {"type": "prompt_template", "name": template_name},
         )
 
+    def render_prompt(self, template_name: str, values: Dict[str, Any]) -> str:
+        """プロンプトテンプレートを展開する。
+
+        Args:
+            template_name: テンプレート名
+            values: テンプレートに埋め込む値
+
+        Returns:
+            展開したプロンプト
+        """
+        return self._compiled_templates[template_name](values)
+
     def update_parameter(self, parameter_name: str, new_value: Any) -> None:
         """パラメータを更新する。
 
@@ -140,6 +231,7 @@ class ContextManager:
             self.cache.set(
                 f"parameter:{parameter_name}",
                 new_value,
+                ttl=CACHE_TTLS["parameter"],
                 metadata={"type": "parameter"},
             )
 
@@ -157,12 +249,121 @@ class ContextManager:
             self.cache.set(
                 f"strategy:{strategy_name}",
                 new_strategy,
+                ttl=CACHE_TTLS["strategy"],
                 metadata={"type": "strategy"},
             )
 
         # セマンティック検索用のインデックスを更新
-        self.semantic_search.index_document(
+        self._queue_index(
             f"strategy:{strategy_name}",
             str(new_strategy),
-            metadata={"type": "strategy", "name": strategy_name},
-        ) 
\ No newline at end of file
+            {"type": "strategy", "name": strategy_name},
+        )
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """値の種類ごとのキャッシュのヒット・ミス数を取得する。
+
+        Returns:
+            名前空間ごとの統計情報
+        """
+        if not self.cache:
+            return {}
+        namespaces = self.cache.get_stats().get("namespaces", {})
+        return {
+            namespace: namespaces.get(namespace, {"hits": 0, "misses": 0})
+            for namespace in CACHE_TTLS
+        }
+
+    def flush_index(self, force: bool = False) -> None:
+        """インデックス待ちのドキュメントをまとめて登録する。
+
+        バックグラウンドで登録している場合、forceを指定するとキュー内の
+        ドキュメントがすべて登録されるまで待つ。
+
+        Args:
+            force: 待ち件数にかかわらず登録する場合はTrue
+        """
+        idx_queue = self._idx_queue
+        if idx_queue is not None:
+            if force:
+                idx_queue.join()
+            return
+
+        with self._queue_lock:
+            if not self._pending_index:
+                return
+            if not force and len(self._pending_index) < INDEX_FLUSH_SIZE:
+                return
+
+            pending = self._pending_index
+            self._pending_index = []
+        self._index_batch(pending)
+
+    def close(self) -> None:
+        """残りのドキュメントを登録し、バックグラウンドのスレッドを停止する。
+
+        停止後に追加されたドキュメントは同期的に登録する。
+        """
+        with self._queue_lock:
+            # 以降の追加は_pending_index経由で同期的に登録する
+            idx_queue = self._idx_queue
+            self._idx_queue = None
+        if idx_queue is not None and self._indexer is not None:
+            # 差し替え前にキューへ入ったドキュメントは終了の合図より先に登録される
+            idx_queue.put(None)
+            self._indexer.join()
+            self._indexer = None
+        self.flush_index(force=True)
+
+    def _queue_index(self, doc_id: str, text: str, metadata: Dict[str, Any]) -> None:
+        """ドキュメントをインデックス待ちに追加する。
+
+        Args:
+            doc_id: ドキュメントID
+            text: ドキュメントの内容
+            metadata: メタデータ
+        """
+        with self._queue_lock:
+            if self._idx_queue is not None:
+                self._idx_queue.put((doc_id, text, metadata))
+                return
+            self._pending_index.append((doc_id, text, metadata))
+        self.flush_index()
+
+    def _index_batch(self, documents: List[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """ドキュメントをまとめてインデックスに登録する。
+
+        Args:
+            documents: (ドキュメントID, 内容, メタデータ)のリスト
+        """
+        # 同じIDのドキュメントは最新のものだけを登録する
+        latest = {doc_id: (doc_id, text, metadata) for doc_id, text, metadata in documents}
+        with self._index_lock:
+            self.semantic_search.index_documents_batch(list(latest.values()))
+
+    def _indexer_loop(self, idx_queue: queue.Queue) -> None:
+        """キューからドキュメントを取り出し、まとめて登録する（バックグラウンドスレッド）。
+
+        Args:
+            idx_queue: インデックス待ちのキュー（Noneを受け取ると終了する）
+        """
+        while True:
+            batch = [idx_queue.get()]
+            while batch[-1] is not None and len(batch) < INDEX_BATCH_SIZE:
+                try:
+                    batch.append(idx_queue.get(timeout=INDEX_BATCH_WAIT))
+                except queue.Empty:
+                    break
+
+            documents = [item for item in batch if item is not None]
+            try:
+                if documents:
+                    self._index_batch(documents)
+            except Exception as e:
+                logger.error(f"インデックスの登録中にエラーが発生: {str(e)}")
+            finally:
+                for _ in batch:
+                    idx_queue.task_done()
+
+            if batch[-1] is None:
+                return
@@ -0,0 +1,124 @@
+"""実行時間の予測に基づくタスクのマルチビンバッチング。"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from genesis_agi.models.task import ExecutionRecord, Task
+
+
+class BinBatcher:
+    """予測実行時間が近いタスクを同じバッチにまとめるクラス。
+
+    実行時間の長いタスクと短いタスクを同じバッチで待ち合わせると、
+    短いタスクが長いタスクの完了までブロックされる。予測実行時間の
+    分位点でタスクをビンに分け、ビンごとにバッチを構成する。
+    """
+
+    def __init__(self, num_bins: int = 4):
+        """初期化。
+
+        Args:
+            num_bins: ビンの数
+        """
+        if num_bins < 1:
+            raise ValueError("num_binsは1以上である必要があります")
+        self.num_bins = num_bins
+
+    def estimate_times(self, history: Iterable[ExecutionRecord]) -> Dict[str, float]:
+        """実行履歴からオペレーター別の平均実行時間を推定する。
+
+        Args:
+            history: 実行履歴
+
+        Returns:
+            オペレータータイプごとの平均実行時間（秒）
+        """
+        totals: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0])
+        for record in history:
+            if not record.operator or not isinstance(record.result, dict):
+                continue
+            execution_time = record.result.get("execution_time")
+            if execution_time is None:
+                continue
+            total = totals[record.operator]
+            total[0] += float(execution_time)
+            total[1] += 1
+
+        return {
+            operator: total_time / count
+            for operator, (total_time, count) in totals.items()
+            if count > 0
+        }
+
+    def predict(self, task: Task, estimates: Dict[str, float]) -> float:
+        """タスクの実行時間を予測する。
+
+        履歴のないオペレーターは既知のオペレーターの平均値で補完する。
+
+        Args:
+            task: 対象のタスク
+            estimates: オペレーター別の平均実行時間
+
+        Returns:
+            予測実行時間（秒）
+        """
+        predicted = estimates.get(task.metadata.task_type)
+        if predicted is not None:
+            return predicted
+        return float(np.mean(list(estimates.values()))) if estimates else 0.0
+
+    def make_bins(
+        self,
+        tasks: List[Task],
+        history: Iterable[ExecutionRecord]
+    ) -> List[List[Tuple[Task, float]]]:
+        """タスクを予測実行時間の分位点でビンに分ける。
+
+        Args:
+            tasks: 対象のタスク
+            history: 実行履歴
+
+        Returns:
+            空でないビンのリスト（各要素はタスクと予測実行時間のペア）
+        """
+        if not tasks:
+            return []
+
+        estimates = self.estimate_times(history)
+        predicted = np.array([self.predict(task, estimates) for task in tasks])
+
+        num_bins = min(self.num_bins, len(tasks))
+        edges = np.quantile(predicted, np.linspace(0, 1, num_bins + 1)[1:-1])
+        bin_ids = np.searchsorted(edges, predicted, side="right")
+
+        bins: List[List[Tuple[Task, float]]] = [[] for _ in range(num_bins)]
+        for task, bin_id, predicted_time in zip(tasks, bin_ids, predicted):
+            bins[int(bin_id)].append((task, float(predicted_time)))
+
+        return [bin_tasks for bin_tasks in bins if bin_tasks]
+
+    @staticmethod
+    def utilization(
+        bin_tasks: List[Tuple[Task, float]],
+        wall_time: float,
+        bin_index: Optional[int] = None
+    ) -> Dict[str, float]:
+        """ビンの実行結果から利用率の指標を計算する。
+
+        Args:
+            bin_tasks: ビン内のタスクと予測実行時間
+            wall_time: ビンの実行にかかった実時間（秒）
+            bin_index: ビンの番号
+
+        Returns:
+            利用率の指標
+        """
+        predicted_times = [predicted for _, predicted in bin_tasks]
+        return {
+            "bin": bin_index if bin_index is not None else -1,
+            "tasks": len(bin_tasks),
+            "predicted_time": float(np.mean(predicted_times)),
+            "wall_time": wall_time,
+            "throughput": len(bin_tasks) / wall_time if wall_time > 0 else 0.0
+        }
@@ -0,0 +1,117 @@
+"""実行履歴の列指向（SoA）ストレージ。"""
+from typing import Any, Dict
+
+import numpy as np
+
+from genesis_agi.models.task import ExecutionRecord
+from genesis_agi.operators.base_operator import OPERATOR_NAMES, operator_code
+from genesis_agi.utils.stats_kernels import reduce_op_stats
+
+
+class ExecutionHistorySoA:
+    """実行履歴の集計に使う列を、レコードごとではなく列ごとの配列で保持する。
+
+    集計は少数の数値列だけを走査するため、列ごとに連続したメモリに
+    並べておくことでベクトル演算や数値カーネルにそのまま渡せる。
+    """
+
+    def __init__(self, capacity: int = 256):
+        """初期化。
+
+        Args:
+            capacity: 配列の初期容量
+        """
+        self._size = 0
+        self._op_codes = np.empty(capacity, dtype=np.int32)
+        self._status_ok = np.empty(capacity, dtype=np.bool_)
+        self._exec_time = np.empty(capacity, dtype=np.float32)
+        self._gen_count = np.empty(capacity, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def op_codes(self) -> np.ndarray:
+        """オペレーターコードの列。"""
+        return self._op_codes[:self._size]
+
+    @property
+    def status_ok(self) -> np.ndarray:
+        """成功フラグの列。"""
+        return self._status_ok[:self._size]
+
+    @property
+    def exec_time(self) -> np.ndarray:
+        """実行時間（秒）の列。"""
+        return self._exec_time[:self._size]
+
+    @property
+    def gen_count(self) -> np.ndarray:
+        """生成タスク数の列。"""
+        return self._gen_count[:self._size]
+
+    def record(
+        self,
+        op_code: int,
+        status_ok: bool,
+        exec_time: float,
+        gen_count: int
+    ) -> None:
+        """1件分の値を各列に追加する。
+
+        Args:
+            op_code: オペレーターコード
+            status_ok: 成功したかどうか
+            exec_time: 実行時間（秒）
+            gen_count: 生成タスク数
+        """
+        if self._size == len(self._op_codes):
+            # 容量を倍にして拡張する
+            capacity = max(1, 2 * self._size)
+            self._op_codes = np.resize(self._op_codes, capacity)
+            self._status_ok = np.resize(self._status_ok, capacity)
+            self._exec_time = np.resize(self._exec_time, capacity)
+            self._gen_count = np.resize(self._gen_count, capacity)
+
+        i = self._size
+        self._op_codes[i] = op_code
+        self._status_ok[i] = status_ok
+        self._exec_time[i] = exec_time
+        self._gen_count[i] = gen_count
+        self._size += 1
+
+    def record_execution(self, record: ExecutionRecord) -> None:
+        """実行記録から集計用の値を取り出して追加する。
+
+        Args:
+            record: 実行記録
+        """
+        code = record.operator_code
+        if code is None:
+            code = operator_code(record.operator or "unknown")
+        result = record.result
+        self.record(
+            op_code=code,
+            status_ok=result.get("status") == "success",
+            exec_time=float(result.get("execution_time", 0)),
+            gen_count=len(result.get("generated_tasks", []))
+        )
+
+    def operator_stats(self) -> Dict[str, Dict[str, Any]]:
+        """オペレーター別の実行回数・成功数・合計実行時間・生成タスク数を集計する。
+
+        Returns:
+            オペレーター名ごとの統計（実行記録の無いオペレーターは含まない）
+        """
+        counts, successes, total_times, generated = reduce_op_stats(
+            self.op_codes, self.status_ok, self.exec_time, self.gen_count, len(OPERATOR_NAMES)
+        )
+        return {
+            OPERATOR_NAMES[code]: {
+                "count": int(counts[code]),
+                "success": int(successes[code]),
+                "total_time": float(total_times[code]),
+                "generated": int(generated[code])
+            }
+            for code in np.flatnonzero(counts)
+        }
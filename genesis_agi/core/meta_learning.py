@@ -1,47 +1,240 @@
 """メタ学習システム。"""
-from typing import Any, Dict, List, Optional, Type
+import hashlib
+import heapq
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
 from datetime import datetime
-from genesis_agi.llm.client import LLMClient
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+try:
+    import orjson
+except ImportError:  # orjsonが無い環境では標準のjsonを使用する
+    orjson = None
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # sentence-transformersが無い環境ではLLMクライアントの埋め込みを使用する
+    SentenceTransformer = None
+
+from genesis_agi.llm.client import EMBEDDING_MODEL, PROMPT_HISTORY_WINDOW, LLMClient
 from genesis_agi.operators.operator_registry import OperatorRegistry
 from genesis_agi.operators.operator_generator import OperatorGenerator
-from genesis_agi.utils.cache import Cache
-from genesis_agi.operators.base_operator import BaseOperator
+from genesis_agi.utils.cache import Cache, SemanticCache
+from genesis_agi.utils.json_tree import to_jsonable
+from genesis_agi.operators.base_operator import BaseOperator, extract_class_state
 
+logger = logging.getLogger(__name__)
 
-class GenerationStrategy:
-    """オペレーター生成戦略。"""
+# 戦略の近似一致とみなすコサイン類似度の既定値
+STRATEGY_SIMILARITY_THRESHOLD = 0.92
 
-    def __init__(
-        self,
-        strategy_type: str,
-        parameters: Dict[str, Any],
-        success_rate: float = 0.0,
-        last_updated: Optional[datetime] = None
-    ):
-        """初期化。"""
-        self.strategy_type = strategy_type
-        self.parameters = parameters
-        self.success_rate = success_rate
-        self.last_updated = last_updated or datetime.now()
+# キャッシュした戦略の有効期限（秒）
+STRATEGY_CACHE_TTL = 24 * 60 * 60
+
+# 類似の進化パターンとみなすコサイン類似度の閾値
+PATTERN_SIMILARITY_THRESHOLD = 0.7
+
+# ローカル埋め込みに使用するモデル
+LOCAL_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# 戦略スコアのキャッシュに保持するコンテキストの最大数
+STRATEGY_SCORE_CACHE_SIZE = 128
+
+# コンテキスト変換関数を保持するスキーマの最大数
+PREPARE_FUNC_CACHE_SIZE = 64
+
+# プロンプトに含める既知の戦略の最大数
+PROMPT_STRATEGY_LIMIT = 10
+
+# メモリ上に保持する生成戦略の最大数（超えた分は利用頻度の低いものから破棄する）
+MAX_GENERATION_STRATEGIES = 256
+
+# メタ知識に保持する改善度上位の成功パターンの数
+SUCCESS_PATTERN_TOPK = 32
+
+
+def simhash(features: Sequence[str]) -> int:
+    """特徴量の集合から64ビットのSimHashを計算する。
+
+    似た特徴量の集合は近い値になるため、完全一致でなくても同じ値になりやすい。
+
+    Args:
+        features: 特徴量の文字列のリスト
+
+    Returns:
+        64ビットの指紋
+    """
+    weights = [0] * 64
+    for feature in features:
+        value = int.from_bytes(
+            hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def dumps_sorted(obj: Any) -> str:
+    """キー順を固定してJSON文字列に変換する。
+
+    同じ内容には常に同じ文字列を返すため、プロンプトやキャッシュキーに使える。
+
+    Args:
+        obj: 変換するオブジェクト
+
+    Returns:
+        JSON文字列
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=str,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        ).decode("utf-8")
+    return json.dumps(
+        obj, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str
+    )
+
+
+def fingerprint(text: str) -> str:
+    """テキストの決定的な指紋（128ビット）を計算する。
+
+    Args:
+        text: dumps_sortedで正規化したテキストなど
+
+    Returns:
+        16進文字列の指紋
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class GenerationStrategy(BaseModel):
+    """オペレーター生成戦略。"""
+    strategy_type: str
+    parameters: Dict[str, Any] = Field(default_factory=dict)
+    success_rate: float = 0.0
+    avg_performance: float = 0.0
+    usage_count: int = 0
+    last_updated: datetime = Field(default_factory=datetime.now)
 
     def to_dict(self) -> Dict[str, Any]:
         """辞書形式に変換する。"""
-        return {
-            "strategy_type": self.strategy_type,
-            "parameters": self.parameters,
-            "success_rate": self.success_rate,
-            "last_updated": self.last_updated.isoformat()
-        }
+        return self.model_dump(mode="json")
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'GenerationStrategy':
         """辞書からインスタンスを生成する。"""
-        return cls(
-            strategy_type=data["strategy_type"],
-            parameters=data["parameters"],
-            success_rate=data["success_rate"],
-            last_updated=datetime.fromisoformat(data["last_updated"])
-        )
+        return cls.model_validate(data)
+
+
+class PerformanceImprovement(BaseModel):
+    """進化前後のパフォーマンス。"""
+    before: float = 0.0
+    after: float = 0.0
+
+
+class EvolutionPattern(BaseModel):
+    """オペレーターの進化パターン。"""
+    original_operator: str
+    evolved_operator: str
+    performance_improvement: PerformanceImprovement
+    strategy: Dict[str, Any] = Field(default_factory=dict)
+    timestamp: datetime = Field(default_factory=datetime.now)
+
+
+class SemanticStrategyCache(SemanticCache):
+    """タスクの説明とコンテキストの意味的な近さで生成戦略を引くキャッシュ。
+
+    表現が少し異なるだけのタスクにも、過去に生成した戦略を返す。
+    """
+
+    @staticmethod
+    def make_text(task_description: str, context: Dict[str, Any]) -> str:
+        """検索に使うテキストを作る。
+
+        Args:
+            task_description: タスクの説明
+            context: コンテキスト（JSON化可能な形式）
+
+        Returns:
+            キー順を固定したテキスト
+        """
+        return task_description.strip() + "\n" + dumps_sorted(context)
+
+
+class EvolutionPatternColumns:
+    """進化パターンの検索・集計に使う値を、パターンごとではなく列ごとの配列で保持する。
+
+    検索や成功・失敗の判定は埋め込みと性能の列だけを走査し、パターン本体は
+    該当したものだけ参照する。パターン本体もこのクラスが唯一の保持先となる。
+    """
+
+    def __init__(self, capacity: int = 64):
+        """初期化。
+
+        Args:
+            capacity: 配列の初期容量
+        """
+        self._size = 0
+        self._embeddings: Optional[np.ndarray] = None
+        self._before = np.empty(capacity, dtype=np.float32)
+        self._after = np.empty(capacity, dtype=np.float32)
+        self.patterns: List[EvolutionPattern] = []
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def embeddings(self) -> Optional[np.ndarray]:
+        """正規化済みの埋め込みの列（パターン数, 次元数）。埋め込めなかった行はゼロ。"""
+        return None if self._embeddings is None else self._embeddings[:self._size]
+
+    @property
+    def improvements(self) -> np.ndarray:
+        """改善度（進化後 - 進化前）の列。"""
+        return self._after[:self._size] - self._before[:self._size]
+
+    @property
+    def successful(self) -> np.ndarray:
+        """性能が改善したパターンを示す真偽値の列。"""
+        return self._after[:self._size] > self._before[:self._size]
+
+    def select(self, mask: np.ndarray) -> List[EvolutionPattern]:
+        """真偽値の列で選んだパターンを返す。"""
+        return [self.patterns[i] for i in np.flatnonzero(mask)]
+
+    def append(self, pattern: EvolutionPattern, embedding: Optional[np.ndarray]) -> None:
+        """1件分の値を各列に追加する。
+
+        Args:
+            pattern: 進化パターン
+            embedding: 正規化済みの埋め込みベクトル（埋め込めなかった場合はNone）
+        """
+        capacity = len(self._before)
+        if self._size == capacity:
+            # 容量を倍にして拡張する
+            capacity = 2 * self._size
+            self._before = np.resize(self._before, capacity)
+            self._after = np.resize(self._after, capacity)
+            if self._embeddings is not None:
+                self._embeddings = np.resize(
+                    self._embeddings, (capacity, self._embeddings.shape[1])
+                )
+
+        i = self._size
+        if embedding is not None:
+            if self._embeddings is None:
+                self._embeddings = np.zeros((capacity, len(embedding)), dtype=np.float32)
+            self._embeddings[i] = embedding
+        elif self._embeddings is not None:
+            self._embeddings[i] = 0.0
+        self._before[i] = pattern.performance_improvement.before
+        self._after[i] = pattern.performance_improvement.after
+        self.patterns.append(pattern)
+        self._size += 1
 
 
 class MetaLearner:
@@ -52,19 +245,125 @@ class MetaLearner:
         llm_client: LLMClient,
         registry: OperatorRegistry,
         operator_generator: Optional[OperatorGenerator] = None,
-        cache: Optional[Cache] = None
+        cache: Optional[Cache] = None,
+        similarity_threshold: Optional[float] = STRATEGY_SIMILARITY_THRESHOLD,
+        embedding_fn: Optional[Callable[[str], Sequence[float]]] = None
     ):
-        """初期化。"""
+        """初期化。
+
+        Args:
+            llm_client: LLMクライアント
+            registry: オペレーターレジストリ
+            operator_generator: オペレータージェネレーター
+            cache: キャッシュ
+            similarity_threshold: 戦略を再利用するコサイン類似度の閾値（Noneで無効）
+            embedding_fn: テキストを埋め込みベクトルに変換する関数
+                （省略時はsentence-transformers、無ければLLMクライアントの埋め込みを使用）
+        """
         self.llm_client = llm_client
         self.registry = registry
         self.operator_generator = operator_generator
         self.cache = cache
+        # 既定の埋め込み関数を使う場合だけ、モデル名で名前空間を分けて共有キャッシュに保存する
+        self._embedding_model: Optional[str] = None
+        self.embedding_fn = embedding_fn or self._default_embedding_fn()
+        self._embedding_cache: Dict[str, np.ndarray] = {}
+        self.strategy_cache: Optional[SemanticStrategyCache] = None
+        if similarity_threshold is not None:
+            self.strategy_cache = SemanticStrategyCache(
+                embedding_fn=self.embedding_fn,
+                cache=cache,
+                threshold=similarity_threshold,
+                namespace="semantic:strategy",
+                ttl=STRATEGY_CACHE_TTL
+            )
         self.generation_strategies: Dict[str, GenerationStrategy] = {}
-        self.evolution_patterns: List[Dict[str, Any]] = []
+        # 成功・失敗のパターンは件数と改善度上位のヒープ（(改善度, 学習順, パターン)）だけを持つ
         self.meta_knowledge: Dict[str, Any] = {
             "context_dependencies": {},
-            "successful_patterns": [],
-            "failed_patterns": []
+            "successful_patterns": {
+                "success_count": 0,
+                "failure_count": 0,
+                "recent_success_topk": []
+            }
+        }
+
+        # プロンプトの固定部分の直列化結果（内容が変わったときだけ作り直す）
+        self._known_strategies_json: Optional[str] = None
+        self._meta_knowledge_json: Optional[str] = None
+
+        # 戦略の埋め込み行列と、コンテキストの指紋ごとの全戦略との類似度
+        self._strategy_names: List[str] = []
+        self._strategy_vecs: Optional[np.ndarray] = None
+        self._strategy_scores_cache: Dict[int, np.ndarray] = {}
+
+        # 進化パターン（成功・失敗の判定と類似パターンの検索に使う列を含む）
+        self._pattern_columns = EvolutionPatternColumns()
+        self._operator_states: Dict[int, Dict[str, Any]] = {}
+        self._prepare_funcs: Dict[Tuple[Tuple[Any, type], ...], Callable[..., Dict[str, Any]]] = {}
+
+    @property
+    def evolution_patterns(self) -> List[EvolutionPattern]:
+        """学習した進化パターン（学習順）。"""
+        return self._pattern_columns.patterns
+
+    @property
+    def successful_patterns(self) -> List[EvolutionPattern]:
+        """性能が改善した進化パターン。"""
+        return self._pattern_columns.select(self._pattern_columns.successful)
+
+    @property
+    def failed_patterns(self) -> List[EvolutionPattern]:
+        """性能が改善しなかった進化パターン。"""
+        return self._pattern_columns.select(~self._pattern_columns.successful)
+
+    def pattern_summary(self) -> Dict[str, Any]:
+        """成功・失敗したパターンの件数と、改善度上位の成功パターンを返す。
+
+        Returns:
+            success_count, failure_count, top_successful（改善度の降順）を含む辞書
+        """
+        stats = self.meta_knowledge["successful_patterns"]
+        return {
+            "success_count": stats["success_count"],
+            "failure_count": stats["failure_count"],
+            "top_successful": [
+                pattern for _, _, pattern in sorted(stats["recent_success_topk"], reverse=True)
+            ]
+        }
+
+    def _stable_prompt_blocks(self) -> Dict[str, str]:
+        """呼び出し間で共通のプロンプト部分を直列化して返す。
+
+        同じ内容に対しては毎回同じ文字列を返すため、プロンプトの先頭が
+        バイト単位で一致し、プロバイダ側のプレフィックスキャッシュが効く。
+
+        Returns:
+            既知の戦略とメタ知識のJSON文字列
+        """
+        if self._known_strategies_json is None:
+            # 利用回数と成功率の高い戦略に絞り、名前順に並べて順序を安定させる
+            names = heapq.nlargest(
+                PROMPT_STRATEGY_LIMIT,
+                self.generation_strategies,
+                key=self._strategy_frequency
+            )
+            self._known_strategies_json = dumps_sorted({
+                name: {
+                    "strategy_type": self.generation_strategies[name].strategy_type,
+                    "parameters": self.generation_strategies[name].parameters,
+                    "success_rate": self.generation_strategies[name].success_rate
+                }
+                for name in sorted(names)
+            })
+        if self._meta_knowledge_json is None:
+            self._meta_knowledge_json = dumps_sorted(to_jsonable({
+                "context_dependencies": self.meta_knowledge["context_dependencies"],
+                "successful_patterns": self.pattern_summary()
+            }))
+        return {
+            "known_strategies": self._known_strategies_json,
+            "meta_knowledge": self._meta_knowledge_json
         }
 
     def optimize_generation_strategy(
@@ -88,17 +387,41 @@ class MetaLearner:
         if self.cache:
             cached_strategy = self.cache.get(cache_key)
             if cached_strategy:
-                return GenerationStrategy.from_dict(cached_strategy).to_dict()
+                strategy = (
+                    self.generation_strategies.get(task_description)
+                    or GenerationStrategy.from_dict(cached_strategy)
+                )
+                strategy.usage_count += 1
+                self._store_strategy(task_description, strategy)
+                return strategy.to_dict()
+
+        prepared_context = self._prepare_context_for_json(current_context)
 
-        # LLMを使用して戦略を生成
+        # 意味的に近いタスクの戦略を再利用
+        query_text = query_embedding = None
+        if self.strategy_cache:
+            query_text = SemanticStrategyCache.make_text(task_description, prepared_context)
+            similar_strategy = None
+            try:
+                query_embedding = self.strategy_cache.embed(query_text)
+                similar_strategy = self.strategy_cache.lookup(query_text, embedding=query_embedding)
+            except Exception as e:
+                # 埋め込みに失敗した場合はキャッシュを使わずにLLMで生成する
+                logger.warning(f"戦略キャッシュの検索に失敗しました: {str(e)}")
+                query_embedding = None
+            if similar_strategy:
+                strategy = GenerationStrategy.from_dict(similar_strategy)
+                strategy.usage_count += 1
+                self._store_strategy(task_description, strategy)
+                return strategy.to_dict()
+
+        # LLMを使用して戦略を生成（固定部分を先に並べる）
         prompt = {
+            **self._stable_prompt_blocks(),
             "task": task_description,
-            "context": self._prepare_context_for_json(current_context),
-            "history": execution_history,
-            "known_strategies": [
-                strategy.to_dict()
-                for strategy in self.generation_strategies.values()
-            ]
+            "context": prepared_context,
+            "best_strategies": self.select_best_strategies(prepared_context),
+            "history": execution_history[-PROMPT_HISTORY_WINDOW:]
         }
 
         response = self.llm_client.generate_strategy(prompt)
@@ -106,13 +429,16 @@ class MetaLearner:
         # 新しい戦略を保存
         strategy = GenerationStrategy(
             strategy_type=response["strategy_type"],
-            parameters=response["parameters"]
+            parameters=response["parameters"],
+            usage_count=1
         )
-        self.generation_strategies[task_description] = strategy
+        self._store_strategy(task_description, strategy)
 
         # キャッシュに保存
         if self.cache:
-            self.cache.set(cache_key, strategy.to_dict())
+            self.cache.set(cache_key, strategy.to_dict(), ttl=STRATEGY_CACHE_TTL)
+        if self.strategy_cache and query_embedding is not None:
+            self.strategy_cache.add(query_text, strategy.to_dict(), embedding=query_embedding)
 
         return strategy.to_dict()
 
@@ -131,61 +457,327 @@ class MetaLearner:
             performance_data: パフォーマンスデータ
             evolution_strategy: 進化戦略
         """
-        pattern = {
-            "original_operator": original_operator.__name__,
-            "evolved_operator": evolved_operator.__name__,
-            "performance_improvement": {
-                "before": performance_data.get("historical_success_rate", 0),
-                "after": performance_data.get("success_rate", 0)
-            },
-            "strategy": evolution_strategy,
-            "timestamp": datetime.now().isoformat()
-        }
+        pattern = EvolutionPattern(
+            original_operator=original_operator.__name__,
+            evolved_operator=evolved_operator.__name__,
+            performance_improvement=PerformanceImprovement(
+                before=performance_data.get("historical_success_rate", 0),
+                after=performance_data.get("success_rate", 0)
+            ),
+            strategy=evolution_strategy
+        )
 
-        self.evolution_patterns.append(pattern)
+        # 成功・失敗は性能の列から判定するため、パターンは列に1回だけ追加する
+        embedding = self._pattern_embedding(pattern, self._extract_operator_state(original_operator))
+        self._pattern_columns.append(pattern, embedding)
 
-        # 成功・失敗パターンの更新
-        if pattern["performance_improvement"]["after"] > pattern["performance_improvement"]["before"]:
-            self.meta_knowledge["successful_patterns"].append(pattern)
+        # 件数を数え、成功パターンは改善度の上位だけをヒープに残す
+        stats = self.meta_knowledge["successful_patterns"]
+        improvement = pattern.performance_improvement.after - pattern.performance_improvement.before
+        if improvement > 0:
+            stats["success_count"] += 1
+            entry = (improvement, len(self._pattern_columns), pattern)
+            topk = stats["recent_success_topk"]
+            if len(topk) < SUCCESS_PATTERN_TOPK:
+                heapq.heappush(topk, entry)
+            else:
+                heapq.heappushpop(topk, entry)
         else:
-            self.meta_knowledge["failed_patterns"].append(pattern)
+            stats["failure_count"] += 1
+        self._meta_knowledge_json = None
+
+    def _store_strategy(self, task_description: str, strategy: GenerationStrategy) -> None:
+        """生成戦略を保存する。
+
+        保持数が上限を超えた場合は、利用回数（同数なら成功率）の最も低い戦略を
+        破棄する（LFU）。
+
+        Args:
+            task_description: タスクの説明
+            strategy: 生成戦略
+        """
+        previous = self.generation_strategies.get(task_description)
+        self.generation_strategies[task_description] = strategy
+        evicted = False
+        if len(self.generation_strategies) > MAX_GENERATION_STRATEGIES:
+            victim = min(
+                (name for name in self.generation_strategies if name != task_description),
+                key=self._strategy_frequency
+            )
+            del self.generation_strategies[victim]
+            evicted = True
+
+        if previous is None or evicted or previous.parameters != strategy.parameters:
+            self._strategies_changed()
+        else:
+            # 利用回数などの数値だけが変わった場合は、埋め込みから求めた類似度を使い回す
+            self._known_strategies_json = None
+
+    def _strategy_frequency(self, name: str) -> Tuple[int, float]:
+        """LFUの順位付けに使う(利用回数, 成功率)を返す。"""
+        strategy = self.generation_strategies[name]
+        return strategy.usage_count, strategy.success_rate
+
+    def _strategies_changed(self) -> None:
+        """生成戦略の変更に合わせて、戦略から作ったキャッシュを破棄する。"""
+        self._known_strategies_json = None
+        self._strategy_vecs = None
+        self._strategy_scores_cache.clear()
+
+    def select_best_strategies(self, context: Dict[str, Any], k: int = 3) -> List[Dict[str, Any]]:
+        """コンテキストに最も適した戦略を選択する。
+
+        全戦略との類似度はコンテキストのSimHashをキーにキャッシュし、戦略の内容が
+        変わるまで再利用する。成功率や利用回数による重み付けは毎回行う。
+
+        Args:
+            context: 現在のコンテキスト（JSON化可能な形式）
+            k: 選択する戦略の数
+
+        Returns:
+            選択された戦略のリスト（辞書形式）
+        """
+        if not self.generation_strategies:
+            return []
+
+        names = list(self.generation_strategies)
+        if names != self._strategy_names:
+            self._strategies_changed()
+
+        fingerprint = simhash([
+            f"{key}={dumps_sorted(value)}" for key, value in context.items()
+        ])
+        similarities = self._strategy_scores_cache.get(fingerprint)
+        if similarities is None:
+            try:
+                similarities = self._strategy_similarities(names, context)
+            except Exception as e:
+                logger.warning(f"戦略のスコア計算に失敗しました: {str(e)}")
+                return []
+            if len(self._strategy_scores_cache) >= STRATEGY_SCORE_CACHE_SIZE:
+                self._strategy_scores_cache.clear()
+            self._strategy_scores_cache[fingerprint] = similarities
+
+        scored = self._score_strategies(names, similarities)
+
+        return [
+            self.generation_strategies[name].to_dict()
+            for _, name in heapq.nlargest(k, scored)
+            if name in self.generation_strategies
+        ]
+
+    def _strategy_similarities(self, names: List[str], context: Dict[str, Any]) -> np.ndarray:
+        """全戦略とコンテキストの類似度を計算する。
+
+        Args:
+            names: 戦略のキーのリスト
+            context: 現在のコンテキスト
+
+        Returns:
+            namesと同じ順序の類似度の配列
+        """
+        if self._strategy_vecs is None:
+            self._strategy_vecs = np.stack([
+                self._embed(dumps_sorted(
+                    self.generation_strategies[name].parameters.get("target_context", {})
+                ))
+                for name in names
+            ])
+            self._strategy_names = names
+
+        # 全戦略との類似度を1回の行列ベクトル積で計算する
+        return self._strategy_vecs @ self._embed(dumps_sorted(context))
+
+    def _score_strategies(self, names: List[str], similarities: np.ndarray) -> List[tuple]:
+        """全戦略のスコアを計算する。
+
+        Args:
+            names: 戦略のキーのリスト
+            similarities: namesと同じ順序のコンテキストとの類似度
+
+        Returns:
+            (スコア, 戦略のキー)のリスト
+        """
+        strategies = [self.generation_strategies[name] for name in names]
+        success_rates = np.array([strategy.success_rate for strategy in strategies])
+        avg_performances = np.array([strategy.avg_performance for strategy in strategies])
+        usage_counts = np.array([strategy.usage_count for strategy in strategies])
+
+        # 基本スコア × コンテキスト類似性 × 使用頻度による調整（探索と活用のバランス）
+        scores = (
+            (success_rates * 0.6 + avg_performances * 0.4)
+            * similarities
+            / (1.0 + np.log1p(usage_counts))
+        )
+        return list(zip(scores.tolist(), names))
+
+    def find_similar_patterns(
+        self,
+        operator: Type[BaseOperator],
+        evolution_strategy: Optional[Dict[str, Any]] = None,
+        min_improvement: Optional[float] = None
+    ) -> List[EvolutionPattern]:
+        """類似の進化パターンを検索する。
+
+        Args:
+            operator: 対象のオペレーター
+            evolution_strategy: 検討中の進化戦略
+            min_improvement: 指定した場合、改善度がこの値を超えるパターンだけを返す
+
+        Returns:
+            類似パターンのリスト
+        """
+        columns = self._pattern_columns
+        if columns.embeddings is None:
+            return []
+
+        # 全パターンとの類似度を1回の行列ベクトル積で計算する
+        query = self._embed(
+            self._pattern_text(self._extract_operator_state(operator), evolution_strategy or {})
+        )
+        mask = columns.embeddings @ query > PATTERN_SIMILARITY_THRESHOLD
+        if min_improvement is not None:
+            mask &= columns.improvements > min_improvement
+        return columns.select(mask)
+
+    def _default_embedding_fn(self) -> Callable[[str], Sequence[float]]:
+        """既定の埋め込み関数を返す。
+
+        Returns:
+            埋め込み関数
+        """
+        if SentenceTransformer is not None:
+            model = SentenceTransformer(LOCAL_EMBEDDING_MODEL)
+            self._embedding_model = LOCAL_EMBEDDING_MODEL
+            return model.encode
+        self._embedding_model = EMBEDDING_MODEL
+        return self.llm_client.embed
+
+    def _embed(self, text: str) -> np.ndarray:
+        """テキストを単位長に正規化した埋め込みベクトルに変換する。
+
+        同じテキストの結果は指紋をキーにしてプロセス内にキャッシュし、既定の
+        埋め込み関数を使う場合は共有キャッシュにも保存して他のワーカーと共有する。
+
+        Args:
+            text: テキスト
+
+        Returns:
+            正規化された埋め込みベクトル
+        """
+        key = fingerprint(text)
+        vector = self._embedding_cache.get(key)
+        if vector is not None:
+            return vector
+
+        shared_key = None
+        if self.cache and self._embedding_model:
+            shared_key = f"embedding:{self._embedding_model}:{key}"
+            cached = self.cache.get(shared_key)
+            if cached is not None:
+                vector = np.asarray(cached, dtype=np.float32)
+                self._embedding_cache[key] = vector
+                return vector
+
+        vector = np.asarray(self.embedding_fn(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        self._embedding_cache[key] = vector
+        if shared_key:
+            self.cache.set(shared_key, vector.tolist())
+        return vector
+
+    def _extract_operator_state(self, operator: Type[BaseOperator]) -> Dict[str, Any]:
+        """オペレーターの状態を抽出する。
+
+        Args:
+            operator: 対象のオペレーター
+
+        Returns:
+            オペレーターの状態
+        """
+        if isinstance(operator, type) and issubclass(operator, BaseOperator):
+            return operator.cached_state()
+
+        state = self._operator_states.get(id(operator))
+        if state is None:
+            state = self._operator_states[id(operator)] = extract_class_state(operator)
+        return state
+
+    def _pattern_text(self, state: Dict[str, Any], strategy: Dict[str, Any]) -> str:
+        """パターン検索用にオペレーターの状態と進化戦略をテキストに変換する。
+
+        Args:
+            state: オペレーターの状態
+            strategy: 進化戦略
+
+        Returns:
+            埋め込み用のテキスト
+        """
+        return dumps_sorted(to_jsonable({"state": state, "strategy": strategy}))
+
+    def _pattern_embedding(
+        self,
+        pattern: EvolutionPattern,
+        state: Dict[str, Any]
+    ) -> Optional[np.ndarray]:
+        """類似検索に使う進化パターンの埋め込みを計算する。
+
+        Args:
+            pattern: 進化パターン
+            state: 元のオペレーターの状態
+
+        Returns:
+            正規化された埋め込みベクトル（失敗した場合はNone）
+        """
+        try:
+            return self._embed(self._pattern_text(state, pattern.strategy))
+        except Exception as e:
+            logger.warning(f"進化パターンの埋め込みに失敗しました: {str(e)}")
+            return None
 
     def _prepare_context_for_json(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """コンテキストをJSON直列化可能な形式に変換する。
 
+        キーと値の型の組（スキーマ）ごとに専用の変換関数を生成して使い回す。
+
         Args:
             context: 変換するコンテキスト
 
         Returns:
             JSON直列化可能なコンテキスト
         """
-        serializable_context = {}
-        for key, value in context.items():
-            if isinstance(value, datetime):
-                serializable_context[key] = value.isoformat()
-            elif isinstance(value, (list, dict)):
-                serializable_context[key] = self._prepare_nested_structure(value)
-            else:
-                serializable_context[key] = value
-        return serializable_context
+        schema = tuple(zip(context, map(type, context.values())))
+        prepare = self._prepare_funcs.get(schema)
+        if prepare is None:
+            if len(self._prepare_funcs) >= PREPARE_FUNC_CACHE_SIZE:
+                self._prepare_funcs.clear()
+            prepare = self._prepare_funcs[schema] = self._compile_prepare_func(schema)
+        return prepare(context, to_jsonable)
 
-    def _prepare_nested_structure(self, data: Any) -> Any:
-        """ネストされたデータ構造をJSON直列化可能な形式に変換する。
+    @staticmethod
+    def _compile_prepare_func(
+        schema: Tuple[Tuple[Any, type], ...]
+    ) -> Callable[[Dict[str, Any], Callable[[Any], Any]], Dict[str, Any]]:
+        """スキーマ専用の、分岐を含まないコンテキスト変換関数を生成する。
 
         Args:
-            data: 変換するデータ
+            schema: (キー, 値の型)の組
 
         Returns:
-            JSON直列化可能なデータ
+            (コンテキスト, ネスト構造の変換関数)を受け取る変換関数
         """
-        if isinstance(data, dict):
-            return {
-                key: self._prepare_nested_structure(value)
-                for key, value in data.items()
-            }
-        elif isinstance(data, list):
-            return [self._prepare_nested_structure(item) for item in data]
-        elif isinstance(data, datetime):
-            return data.isoformat()
-        else:
-            return data 
\ No newline at end of file
+        items = []
+        for i, (key, value_type) in enumerate(schema):
+            if issubclass(value_type, datetime):
+                items.append(f"keys[{i}]: context[keys[{i}]].isoformat()")
+            elif issubclass(value_type, (list, dict)):
+                items.append(f"keys[{i}]: nested(context[keys[{i}]])")
+            else:
+                items.append(f"keys[{i}]: context[keys[{i}]]")
+
+        source = "def prepare(context, nested):\n    return {" + ", ".join(items) + "}\n"
+        namespace: Dict[str, Any] = {"keys": tuple(key for key, _ in schema)}
+        exec(source, namespace)
+        return namespace["prepare"]
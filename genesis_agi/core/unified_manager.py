@@ -1,19 +1,71 @@
 """Unified task and workflow management system."""
+import asyncio
+import heapq
+import itertools
 import logging
+import os
+import re
+import threading
 import time
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, FrozenSet, Iterator, List, Optional, Set, TextIO, Tuple
 from uuid import uuid4
 
+from genesis_agi.core.bin_batcher import BinBatcher
+from genesis_agi.core.history import ExecutionHistorySoA
 from genesis_agi.core.meta_learning import MetaLearner
-from genesis_agi.llm.client import LLMClient
+from genesis_agi.llm.client import PROMPT_HISTORY_WINDOW, BatchLLMClient, LLMClient
 from genesis_agi.models.task import ExecutionRecord, Task, TaskMetadata
+from genesis_agi.operators.base_operator import operator_code
 from genesis_agi.operators.operator_generator import OperatorGenerator
 from genesis_agi.operators.operator_registry import OperatorRegistry
 from genesis_agi.utils.cache import Cache
+from genesis_agi.utils.json_tree import to_jsonable
 
 logger = logging.getLogger(__name__)
 
+# 無効になったヒープ要素がこの倍率を超えたらヒープを作り直す
+TASK_HEAP_COMPACT_RATIO = 2
+
+# 実行履歴の要約を更新する間隔（記録数）
+HISTORY_SUMMARY_INTERVAL = 20
+
+# タスク作成時のコンテキストを保持する版数の最大数（古い版から破棄する）
+CONTEXT_SNAPSHOT_LIMIT = 64
+
+# オペレーターの進化を検討する前に必要な実行回数
+EVOLUTION_MIN_SAMPLES = 5
+# 同じオペレーターを再び進化させるまでに空ける実行記録の数
+EVOLUTION_COOLDOWN = 20
+
+# 目的達成をLLMで評価する前に満たすべき最低条件
+OBJECTIVE_MIN_TASKS = 3
+OBJECTIVE_MIN_SUCCESS_RATE = 0.5
+
+# タスク分析に渡す既定の生成戦略
+ANALYSIS_GENERATION_STRATEGY = {
+    "strategy_type": "adaptive",
+    "parameters": {
+        "complexity": "medium",
+        "focus_areas": ["error_handling", "performance_optimization"]
+    }
+}
+
+# current_contextに保持する完了タスクIDの最大数
+COMPLETED_TASKS_WINDOW = 1024
+
+# 分析で決まったオペレータータイプを説明ごとに保持する最大件数
+ANALYSIS_CACHE_SIZE = 1024
+# タスクの説明の正規化に使う、先頭の番号・箇条書き記号と連続する空白のパターン
+_LEADING_BULLET = re.compile(r"^(?:\d+[.)、．](?!\d)|[-*・])\s*")
+_WHITESPACE = re.compile(r"\s+")
+
+# タスクの評価に使うスコアと、成功とみなす閾値
+SCORE_KEYS = ("quality_score", "progress_score", "confidence_score")
+SUCCESS_SCORE_THRESHOLD = 0.3
+
 
 class UnifiedManager:
     """タスクとワークフローを統合的に管理するシステム。"""
@@ -29,44 +81,150 @@ class UnifiedManager:
         max_iterations: int = 10,
         iteration_delay: float = 1.0,
         max_execution_time: int = 600,
+        batch_size: int = 1,
+        max_concurrency: int = 10,
+        history_path: Optional[str] = None,
+        history_window: int = 256,
+        dag_workers: int = 1,
     ):
-        """初期化。"""
+        """初期化。
+
+        history_pathを指定すると実行履歴がそのJSONLファイルに追記され、メモリ上には
+        直近history_window件のみが保持される。全履歴はiter_history()で参照する。
+        ファイルは実行の終了時（またはclose()）に閉じられる。
+        dag_workersが2以上の場合、依存関係の解決したタスクを並列に実行する。
+        """
         self.llm_client = llm_client
         self.registry = registry
         self.cache = cache
         self.objective = objective
-        self.meta_learner = meta_learner
-        self.operator_generator = operator_generator
+        # 未指定の場合は初回参照時に生成する（meta_learner/operator_generatorプロパティ）
+        self._meta_learner = meta_learner
+        self._operator_generator = operator_generator
         self.max_iterations = max_iterations
         self.iteration_delay = iteration_delay
         self.max_execution_time = max_execution_time
+        self.batch_size = batch_size
+        self.dag_workers = dag_workers
+        self.batch_client = BatchLLMClient(llm_client, max_concurrency=max_concurrency)
+        self.bin_batcher: Optional[BinBatcher] = (
+            BinBatcher() if os.getenv("GENESIS_BIN_BATCHING") == "1" else None
+        )
 
-        self.execution_history: List[ExecutionRecord] = []
-        self.task_queue: List[Task] = []
+        self.execution_history: Deque[ExecutionRecord] = deque(maxlen=history_window)
+        self._history_path: Optional[Path] = Path(history_path) if history_path else None
+        self._history_fp: Optional[TextIO] = None
+        self.history_soa = ExecutionHistorySoA()
+        # メモリ上の履歴（直近history_window件）の集計値。記録の追加と押し出しで差分更新する
+        self._window_stats: Dict[str, float] = {
+            "success": 0,
+            "failed": 0,
+            "error": 0,
+            "lenient_success": 0,
+            "lenient_failed": 0,
+            "execution_time": 0.0
+        }
+        self._window_operator_stats: Dict[str, Dict[str, float]] = {}
+        # 実行開始からの全記録の集計値（メモリ上の履歴から押し出された記録も含む）
+        self._total_stats: Dict[str, int] = {
+            "total": 0,
+            "lenient_success": 0,
+            "lenient_failed": 0
+        }
+        # メモリ上の履歴の実行時間の最大・最小（(通し番号, 実行時間)の単調キュー）
+        self._exec_time_max: Deque[Tuple[int, float]] = deque()
+        self._exec_time_min: Deque[Tuple[int, float]] = deque()
+        self._exec_time_count = 0
+        # オペレーターに渡す実行履歴（記録時に一度だけ直列化しておく）
+        self._task_history_context: Deque[Dict[str, Any]] = deque(maxlen=history_window)
+        # 進捗表示で詳細を出力済みの記録数
+        self._progress_logged = 0
+        # プロンプトに含める直近の実行履歴（記録時に一度だけ要点を抜き出しておく）
+        self._recent_compact: Deque[Dict[str, Any]] = deque(
+            maxlen=min(history_window, PROMPT_HISTORY_WINDOW)
+        )
+        # プロンプトには直近の履歴と、それより前の履歴の要約を渡す
+        self.history_summary = ""
+        self._unsummarized: List[Dict[str, Any]] = []
+        # 要約は1スレッドで順番に行う（前の要約に次の記録を畳み込むため）
+        self._summary_executor: Optional[ThreadPoolExecutor] = None
+        self._summary_future: Optional[Future] = None
+        self._summary_version = 0
+        # オペレーターの進化の判定に使う、前回の成功率と前回進化した時点の総記録数
+        self._evolution_success_rates: Dict[str, float] = {}
+        # 未登録のオペレータータイプに使うオペレーター（必要になったときに作成する）
+        self._default_operator: Optional[Any] = None
+        # 正規化したタスクの説明から分析で決まったオペレータータイプへの対応（LRU）
+        self._analysis_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._last_evolved_at: Dict[str, int] = {}
+        # タスクキューは(-優先度, 投入順, タスク)のヒープで管理する。優先度を変更した
+        # タスクは新しい要素を積み直し、古い要素は取り出した時点で読み捨てる
+        self._task_heap: List[Tuple[float, int, Task]] = []
+        self._task_entries: Dict[str, Tuple[float, int, Task]] = {}
+        self._task_counter = itertools.count()
+        self._queue_lock = threading.Lock()
+        # キュー内の全タスクの優先度がタスク生成の応答で決まったばかりかどうか
+        # （その場合は直後の優先順位付けのLLM呼び出しを省く）
+        self._priorities_from_generation = False
+        # 前回の優先順位付けの時点のキューと履歴の状態
+        self._last_priority_state: Optional[Tuple[FrozenSet[str], int, int]] = None
+        self._completed_ids: Set[str] = set()
         self.current_context: Dict[str, Any] = {
             "objective": objective,
-            "completed_tasks": [],
+            "completed_tasks": deque(maxlen=COMPLETED_TASKS_WINDOW),
             "current_state": {},
             "performance_metrics": {},
             "meta_knowledge": self._initialize_meta_knowledge()
         }
-
-        # meta_learnerが必要な場合は初期化
-        if self.meta_learner is None and meta_learner is None:
-            self.meta_learner = MetaLearner(
-                llm_client=llm_client,
-                registry=registry,
-                cache=cache,
+        self._completed_count = 0
+        # 目的達成の評価結果（(総タスク数, 成功率)ごと）
+        self._objective_verdicts: Dict[Tuple[int, float], bool] = {}
+        # オペレーターが要求するコンテキストのキーごとの取得関数
+        # （ここに無いキーはcurrent_contextから取得する）
+        self._context_providers: Dict[str, Callable[[], Any]] = {
+            "task_history": lambda: self.execution_history,
+            "objective": lambda: self.objective,
+            "task_list": lambda: self.task_queue,
+            "performance_metrics": lambda: self.current_context["performance_metrics"],
+        }
+        # current_contextを変更するたびに進める版数（直列化結果のキャッシュに使用）
+        self._context_version = 0
+        self._context_json: Optional[Tuple[int, Dict[str, Any]]] = None
+        # タスク生成のプロンプト（コンテキスト・総記録数・要約の版数が同じ間は再利用する）
+        self._generation_prompt: Optional[Tuple[Tuple[int, int, int], Dict[str, Any]]] = None
+        # タスク作成時のコンテキスト（版数ごとに1つだけ保持し、タスクからは版数で参照する）
+        self._context_snapshots: Dict[int, Dict[str, Any]] = {}
+
+    @property
+    def meta_learner(self) -> MetaLearner:
+        """メタ学習器。未指定の場合は初回参照時に生成する。"""
+        if self._meta_learner is None:
+            self._meta_learner = MetaLearner(
+                llm_client=self.llm_client,
+                registry=self.registry,
+                cache=self.cache,
                 operator_generator=self.operator_generator
             )
-
-        # operator_generatorが必要な場合は初期化
-        if self.operator_generator is None and operator_generator is None:
-            self.operator_generator = OperatorGenerator(
-                llm_client=llm_client,
-                registry=registry,
-                cache=cache
+        return self._meta_learner
+
+    @meta_learner.setter
+    def meta_learner(self, meta_learner: Optional[MetaLearner]) -> None:
+        self._meta_learner = meta_learner
+
+    @property
+    def operator_generator(self) -> OperatorGenerator:
+        """オペレーター生成器。未指定の場合は初回参照時に生成する。"""
+        if self._operator_generator is None:
+            self._operator_generator = OperatorGenerator(
+                llm_client=self.llm_client,
+                registry=self.registry,
+                cache=self.cache
             )
+        return self._operator_generator
+
+    @operator_generator.setter
+    def operator_generator(self, operator_generator: Optional[OperatorGenerator]) -> None:
+        self._operator_generator = operator_generator
 
     def analyze_and_create_task(self, task_description: str) -> Task:
         """タスクを分析し、必要なオペレーターを生成して、タスクを作成する。
@@ -84,20 +242,123 @@ class UnifiedManager:
         if not task_description:
             raise ValueError("タスクの説明が必要です")
 
-        try:
-            # タスクの分析とオペレータータイプの決定
-            analysis = self.llm_client.analyze_task({
-                "description": task_description,
-                "context": self._prepare_context_for_json(self.current_context),
-                "generation_strategy": {
-                    "strategy_type": "adaptive",
-                    "parameters": {
-                        "complexity": "medium",
-                        "focus_areas": ["error_handling", "performance_optimization"]
-                    }
-                }
-            })
+        # 表記の揺れだけが異なる説明は、前回の分析で決まったオペレータータイプを使う
+        analysis = self._cached_analysis(task_description)
+        if analysis is None:
+            try:
+                # タスクの分析とオペレータータイプの決定
+                analysis = self.llm_client.analyze_task({
+                    "description": task_description,
+                    "context": self._serialized_context(),
+                    "generation_strategy": ANALYSIS_GENERATION_STRATEGY
+                })
+                self._remember_analysis(task_description, analysis)
+            except Exception as e:
+                logger.error(f"タスクの分析中にエラーが発生: {str(e)}")
+                analysis = None
+
+        return self._create_task_from_analysis(task_description, analysis)
+
+    def analyze_and_create_tasks(self, task_descriptions: List[str]) -> List[Task]:
+        """複数のタスクをまとめて分析し、必要なオペレーターを生成して、タスクを作成する。
+
+        分析は1回のLLM呼び出し（タスク数が多い場合は数回）にまとめて行う。
+
+        Args:
+            task_descriptions: タスクの説明のリスト
+
+        Returns:
+            作成されたタスクのリスト
+
+        Raises:
+            ValueError: タスクの説明が無効な場合
+            RuntimeError: タスクの生成に失敗した場合
+        """
+        if not all(task_descriptions):
+            raise ValueError("タスクの説明が必要です")
+        if not task_descriptions:
+            return []
+
+        # 分析済みの説明は除き、残りだけをまとめて分析する
+        analyses: List[Optional[Dict[str, Any]]] = [
+            self._cached_analysis(task_description) for task_description in task_descriptions
+        ]
+        missing = [i for i, analysis in enumerate(analyses) if analysis is None]
+        if missing:
+            try:
+                batch_analyses = self.llm_client.analyze_tasks_batch({
+                    "descriptions": [task_descriptions[i] for i in missing],
+                    "context": self._serialized_context(),
+                    "generation_strategy": ANALYSIS_GENERATION_STRATEGY
+                })
+                for i, analysis in zip(missing, batch_analyses):
+                    analyses[i] = analysis
+                    self._remember_analysis(task_descriptions[i], analysis)
+            except Exception as e:
+                logger.error(f"タスクの一括分析中にエラーが発生: {str(e)}")
+
+        return [
+            self._create_task_from_analysis(task_description, analysis)
+            for task_description, analysis in zip(task_descriptions, analyses)
+        ]
+
+    @staticmethod
+    def _normalize_description(description: str) -> str:
+        """タスクの説明から表記の揺れ（前後・連続する空白、大文字小文字、先頭の番号）を除く。"""
+        return _WHITESPACE.sub(" ", _LEADING_BULLET.sub("", description.strip())).lower()
+
+    def _cached_analysis(self, task_description: str) -> Optional[Dict[str, Any]]:
+        """同じ（正規化後の）説明を分析済みであれば、そのオペレータータイプで分析結果を作る。
+
+        再利用するのはオペレータータイプの決定だけで、分析のパラメータは既定値を使う。
+
+        Args:
+            task_description: タスクの説明
+
+        Returns:
+            分析結果（分析済みでない場合はNone）
+        """
+        key = self._normalize_description(task_description)
+        operator_type = self._analysis_cache.get(key)
+        if operator_type is None:
+            return None
+        self._analysis_cache.move_to_end(key)
+        logger.debug(f"分析済みのオペレータータイプを使用: {operator_type}")
+        return {"required_operator_type": operator_type, "required_params": {}}
+
+    def _remember_analysis(self, task_description: str, analysis: Optional[Dict[str, Any]]) -> None:
+        """分析で決まったオペレータータイプを説明ごとに保持する。
 
+        Args:
+            task_description: タスクの説明
+            analysis: タスクの分析結果
+        """
+        if not analysis or "required_operator_type" not in analysis:
+            return
+        key = self._normalize_description(task_description)
+        self._analysis_cache[key] = analysis["required_operator_type"]
+        self._analysis_cache.move_to_end(key)
+        if len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+
+    def _create_task_from_analysis(
+        self,
+        task_description: str,
+        analysis: Optional[Dict[str, Any]]
+    ) -> Task:
+        """分析結果に基づいて、必要なオペレーターを生成してタスクを作成する。
+
+        Args:
+            task_description: タスクの説明
+            analysis: タスクの分析結果（分析に失敗した場合はNone）
+
+        Returns:
+            作成されたタスク
+
+        Raises:
+            RuntimeError: フォールバックタスクの作成にも失敗した場合
+        """
+        try:
             if not analysis or "required_operator_type" not in analysis:
                 raise ValueError("タスクの分析に失敗しました")
 
@@ -105,7 +366,7 @@ class UnifiedManager:
             logger.info(f"必要なオペレータータイプ: {operator_type}")
 
             # 必要なオペレーターが存在しない場合は生成
-            if not self.registry.has_operator(operator_type):
+            if not self.registry.contains(operator_type):
                 logger.info(f"オペレーター '{operator_type}' が存在しないため、生成を開始します")
                 try:
                     # 生成戦略の準備
@@ -167,133 +428,412 @@ class UnifiedManager:
                 logger.error(error_msg)
                 raise RuntimeError(error_msg) from fallback_error
 
-    def execute_next_task(self) -> Optional[Dict[str, Any]]:
-        """次のタスクを実行する。"""
-        if not self.task_queue:
-            return None
+    def execute_next_task(self, task: Optional[Task] = None) -> Optional[Dict[str, Any]]:
+        """次のタスクを実行する。
 
-        # 最適なタスクを選択
-        next_task = self.select_next_task()
-        if not next_task:
-            return None
+        Args:
+            task: 選択済みのタスク（Noneの場合はここで選択する）
+
+        Returns:
+            実行結果（実行可能なタスクが無い場合はNone）
+        """
+        next_task = task
+        if next_task is None:
+            if not self._task_entries:
+                return None
 
+            # 最適なタスクを選択
+            next_task = self.select_next_task()
+            if not next_task:
+                return None
+
+        operator_type = next_task.metadata.task_type
         try:
-            # オペレーターの取得または生成
-            operator_type = next_task.metadata.task_type
-            logger.debug(f"オペレータータイプ: {operator_type}")
-
-            operator = self.registry.get_operator(operator_type)
-            if not operator:
-                logger.debug("オペレーターが見つからないため、TaskExecutionOperatorを使用")
-                from genesis_agi.operators.task_execution_operator import (
-                    TaskExecutionOperator,
-                )
-                operator = TaskExecutionOperator(self.llm_client)
-
-            # コンテキストの準備
-            context = {
-                "objective": self.objective,
-                "task_history": [
-                    {
-                        "task": record.task.model_dump(mode='json'),
-                        "result": record.result,
-                        "operator": record.operator
-                    }
-                    for record in self.execution_history
-                ],
-                "current_state": {
-                    "total_tasks": len(self.execution_history),
-                    "successful_tasks": sum(
-                        1 for record in self.execution_history
-                        if record.result.get("status") == "success"
-                    ),
-                    "failed_tasks": sum(
-                        1 for record in self.execution_history
-                        if record.result.get("status") in ["failed", "error"]
-                    )
-                }
-            }
+            _, result, context = self._run_operator(next_task)
+            return self._record_result(next_task, operator_type, result, context)
+        except Exception as e:
+            return self._record_error(next_task, operator_type, e)
+
+    def execute_tasks(self, tasks: List[Task]) -> List[Dict[str, Any]]:
+        """複数のタスクをまとめて実行する。
+
+        各タスクのオペレーター実行（LLM呼び出しを含む）を並行してディスパッチし、
+        実行結果の記録は順番に行う。
+
+        Args:
+            tasks: 実行するタスクのリスト
+
+        Returns:
+            タスクと同じ順序の実行結果リスト
+        """
+        outcomes = self.batch_client.map(self._run_operator, tasks, return_exceptions=True)
 
-            logger.debug(f"実行コンテキスト: {context}")
+        results = []
+        for task, outcome in zip(tasks, outcomes):
+            operator_type = task.metadata.task_type
+            if isinstance(outcome, Exception):
+                results.append(self._record_error(task, operator_type, outcome))
+                continue
+            _, result, context = outcome
+            try:
+                results.append(self._record_result(task, operator_type, result, context))
+            except Exception as e:
+                results.append(self._record_error(task, operator_type, e))
+        return results
 
-            # タスクの実行
+    def _execute_binned(self, tasks: List[Task]) -> None:
+        """予測実行時間の近いタスクごとにビンを分けて実行する。
+
+        Args:
+            tasks: 実行するタスクのリスト
+        """
+        utilization = []
+        bins = self.bin_batcher.make_bins(tasks, self.execution_history)
+        for bin_index, bin_tasks in enumerate(bins):
             start_time = time.time()
-            result = operator.execute(next_task, context)
-            execution_time = time.time() - start_time
+            self.execute_tasks([task for task, _ in bin_tasks])
+            utilization.append(
+                BinBatcher.utilization(bin_tasks, time.time() - start_time, bin_index)
+            )
 
-            logger.debug(f"実行結果: {result}")
+        metrics = self.current_context.setdefault("performance_metrics", {})
+        metrics["bin_utilization"] = utilization
+        self._context_version += 1
 
-            # 実行結果の検証と整形
-            if not isinstance(result, dict):
-                result = {"output": result}
+    def execute_dag(self, max_tasks: int, start_time: Optional[float] = None) -> int:
+        """依存関係の解決したタスクをスレッドプールで並列に実行する。
 
-            if "status" not in result:
-                result["status"] = "success" if result.get("output") else "failed"
+        タスクが完了するたびに結果を記録し、それによって依存関係が解決した
+        タスク（生成されたタスクを含む）を順次投入する。
 
-            result.update({
-                "execution_time": execution_time,
-                "task_id": next_task.id,
-                "performance_metrics": {
-                    "execution_success": result.get("status") == "success",
-                    "quality_score": result.get("metrics", {}).get("quality_score", 0.5)
-                }
-            })
+        Args:
+            max_tasks: 実行するタスク数の上限
+            start_time: 実行開始時刻（max_execution_timeの判定に使用）
 
-            # パフォーマンスの分析と改善
-            self._analyze_and_improve_operator(operator_type, result)
-
-            # 実行履歴の更新
-            record = ExecutionRecord(
-                task=next_task,
-                result=result,
-                operator=operator_type,
-                meta_data={
-                    "context": context,
-                    "performance_metrics": result.get("performance_metrics", {})
-                }
+        Returns:
+            実行したタスク数
+        """
+        if not self._task_entries or max_tasks <= 0:
+            return 0
+
+        self._update_task_priorities()
+        executed = 0
+        futures: Dict[Future, Task] = {}
+
+        with ThreadPoolExecutor(max_workers=self.dag_workers) as executor:
+            def submit_ready() -> None:
+                if start_time is not None and time.time() - start_time > self.max_execution_time:
+                    return
+                # 実行コンテキストは記録と競合しないよう投入時に作成する
+                capacity = min(self.dag_workers, max_tasks - executed) - len(futures)
+                for task in self._pop_ready_tasks(capacity):
+                    context = self._build_execution_context()
+                    futures[executor.submit(self._run_operator, task, context)] = task
+
+            submit_ready()
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = futures.pop(future)
+                    operator_type = task.metadata.task_type
+                    try:
+                        _, result, context = future.result()
+                        self._record_result(task, operator_type, result, context)
+                    except Exception as e:
+                        self._record_error(task, operator_type, e)
+                    executed += 1
+                submit_ready()
+
+        return executed
+
+    def _is_ready(self, task: Task) -> bool:
+        """タスクの依存先がすべて完了しているかを判定する。"""
+        return all(task_id in self._completed_ids for task_id in task.metadata.depends_on)
+
+    @property
+    def task_queue(self) -> List[Task]:
+        """未実行のタスクのリスト（投入順）。"""
+        return [entry[2] for entry in list(self._task_entries.values())]
+
+    def _push_task(self, task: Task) -> None:
+        """タスクをキューに投入する（同じIDの既存の要素は無効になる）。"""
+        self._push_tasks([task])
+
+    def _push_tasks(self, tasks: List[Task]) -> None:
+        """複数のタスクをまとめてキューに投入する。
+
+        無効な要素が溜まる場合は1件ずつ積まず、有効な要素だけで
+        ヒープを1回作り直す。
+
+        Args:
+            tasks: 投入するタスクのリスト
+        """
+        with self._queue_lock:
+            self._push_tasks_locked(tasks)
+
+    def _push_tasks_locked(self, tasks: List[Task]) -> None:
+        """_queue_lockを取得済みの状態でタスクをまとめてキューに投入する。"""
+        entries = [(-task.priority, next(self._task_counter), task) for task in tasks]
+        self._priorities_from_generation = False
+        for entry in entries:
+            self._task_entries[entry[2].id] = entry
+        if len(self._task_heap) + len(entries) > TASK_HEAP_COMPACT_RATIO * len(self._task_entries) + 64:
+            self._task_heap = list(self._task_entries.values())
+            heapq.heapify(self._task_heap)
+        else:
+            for entry in entries:
+                heapq.heappush(self._task_heap, entry)
+
+    def _pop_ready_tasks(self, count: int) -> List[Task]:
+        """依存関係の解決したタスクを優先度の高い順にキューから取り出す。
+
+        Args:
+            count: 取り出す最大数
+
+        Returns:
+            取り出したタスクのリスト
+        """
+        if count <= 0:
+            return []
+
+        ready: List[Task] = []
+        waiting: List[Tuple[float, int, Task]] = []
+        with self._queue_lock:
+            while self._task_heap and len(ready) < count:
+                entry = heapq.heappop(self._task_heap)
+                task = entry[2]
+                if self._task_entries.get(task.id) is not entry:
+                    continue
+                if self._is_ready(task):
+                    del self._task_entries[task.id]
+                    ready.append(task)
+                else:
+                    waiting.append(entry)
+            for entry in waiting:
+                heapq.heappush(self._task_heap, entry)
+        return ready
+
+    def _drop_dependents(self, task_id: str) -> None:
+        """失敗したタスクに依存するタスクをキューから取り除く。
+
+        Args:
+            task_id: 失敗したタスクのID
+        """
+        with self._queue_lock:
+            dependents = [
+                entry[2] for entry in self._task_entries.values()
+                if task_id in entry[2].metadata.depends_on
+            ]
+            for task in dependents:
+                del self._task_entries[task.id]
+        for task in dependents:
+            logger.warning(f"依存先のタスクが失敗したため、タスクをスキップします: {task.name}")
+            self._drop_dependents(task.id)
+
+    def _fallback_operator(self) -> Any:
+        """登録されていないオペレータータイプの代わりに使うオペレーターを取得する。
+
+        インスタンスは最初に必要になったときに1つだけ作成し、使い回す。
+        """
+        if self._default_operator is None:
+            from genesis_agi.operators.task_execution_operator import (
+                TaskExecutionOperator,
             )
-            self.execution_history.append(record)
-            self.current_context["completed_tasks"].append(next_task.id)
+            self._default_operator = TaskExecutionOperator(self.llm_client)
+        return self._default_operator
 
-            # パフォーマンス指標の更新
-            self._update_performance_metrics(result)
+    def _build_execution_context(self) -> Dict[str, Any]:
+        """オペレーターの実行コンテキストを作成する。
 
-            # 新しいタスクの生成
-            if result.get("status") == "success":
-                self._generate_new_tasks()
+        Returns:
+            実行コンテキスト
+        """
+        return {
+            "objective": self.objective,
+            "task_history": list(self._task_history_context),
+            "current_state": self._current_state()
+        }
 
-            return result
+    def _current_state(self) -> Dict[str, Any]:
+        """メモリ上の履歴の集計値から現在の実行状態を作成する。"""
+        return {
+            "total_tasks": len(self.execution_history),
+            "successful_tasks": self._window_stats["success"],
+            "failed_tasks": self._window_stats["failed"] + self._window_stats["error"]
+        }
 
-        except Exception as e:
-            logger.error(f"タスク実行中にエラーが発生: {str(e)}")
-            error_result = {
-                "status": "failed",
-                "error": str(e),
-                "task_id": next_task.id,
-                "output": f"タスクの実行中にエラーが発生しました: {str(e)}",
-                "metrics": {
-                    "execution_time": 0,
-                    "quality_score": 0
-                },
-                "performance_metrics": {
-                    "execution_success": False,
-                    "error_type": type(e).__name__
-                }
+    def _record_context(self, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """実行記録に残すコンテキストの要点を作成する。
+
+        実行履歴や完了タスクの一覧のように記録のたびに伸びる部分は複製せず、
+        目的・実行時の状態・記録時点の総記録数とコンテキストの版数だけを残す。
+
+        Args:
+            context: 実行コンテキスト（Noneの場合は現在の状態を使用）
+
+        Returns:
+            記録用のコンテキスト
+        """
+        current_state = context.get("current_state") if context else None
+        return {
+            "objective": self.objective,
+            "completed_at": len(self.history_soa),
+            "context_version": self._context_version,
+            "current_state": current_state if current_state is not None else self._current_state()
+        }
+
+    def _run_operator(
+        self,
+        task: Task,
+        context: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
+        """タスクに対応するオペレーターを実行する。
+
+        Args:
+            task: 実行するタスク
+            context: 実行コンテキスト（Noneの場合は現在の履歴から作成）
+
+        Returns:
+            オペレータータイプ、整形済みの実行結果、実行コンテキストのタプル
+        """
+        # オペレーターの取得または生成
+        operator_type = task.metadata.task_type
+        logger.debug(f"オペレータータイプ: {operator_type}")
+
+        operator = self.registry.get_operator(operator_type)
+        if not operator:
+            logger.debug("オペレーターが見つからないため、TaskExecutionOperatorを使用")
+            operator = self._fallback_operator()
+
+        # コンテキストの準備
+        if context is None:
+            context = self._build_execution_context()
+
+        logger.debug("実行コンテキスト: %s", context)
+
+        # タスクの実行
+        start_time = time.time()
+        result = operator.execute(task, context)
+        execution_time = time.time() - start_time
+
+        logger.debug("実行結果: %s", result)
+
+        # 実行結果の検証と整形
+        if not isinstance(result, dict):
+            result = {"output": result}
+
+        if "status" not in result:
+            result["status"] = "success" if result.get("output") else "failed"
+
+        result.update({
+            "execution_time": execution_time,
+            "task_id": task.id,
+            "performance_metrics": {
+                "execution_success": result.get("status") == "success",
+                "quality_score": result.get("metrics", {}).get("quality_score", 0.5)
             }
+        })
 
-            # エラー時の実行履歴の更新
-            record = ExecutionRecord(
-                task=next_task,
-                result=error_result,
-                operator=operator_type,
-                meta_data={
-                    "error": str(e),
-                    "error_type": type(e).__name__
-                }
-            )
-            self.execution_history.append(record)
+        return operator_type, result, context
+
+    def _record_result(
+        self,
+        task: Task,
+        operator_type: str,
+        result: Dict[str, Any],
+        context: Dict[str, Any],
+        plan: bool = True
+    ) -> Dict[str, Any]:
+        """実行結果を記録し、後続処理を行う。
+
+        Args:
+            task: 実行したタスク
+            operator_type: オペレータータイプ
+            result: 実行結果
+            context: 実行コンテキスト
+            plan: 成功時に新しいタスクの生成と優先順位付けを行うかどうか
+                （呼び出し側が計画を別に行う場合はFalse）
+
+        Returns:
+            実行結果
+        """
+        # パフォーマンスの分析と改善
+        self._analyze_and_improve_operator(operator_type, result)
+
+        # 実行履歴の更新
+        record = ExecutionRecord(
+            task=task,
+            result=result,
+            operator=operator_type,
+            meta_data={
+                "context": self._record_context(context),
+                "performance_metrics": result.get("performance_metrics", {})
+            }
+        )
+        self.record_execution(record)
+        self.current_context["completed_tasks"].append(task.id)
+        self._completed_count += 1
+        self._context_version += 1
+
+        # パフォーマンス指標の更新
+        self._update_performance_metrics(result)
+
+        if result.get("status") != "success":
+            self._drop_dependents(task.id)
+        elif result.get("generated_tasks"):
+            # オペレーターが後続タスクを指定した場合はそれに従う
+            self._completed_ids.add(task.id)
+            self._create_generated_tasks(result["generated_tasks"])
+        else:
+            self._completed_ids.add(task.id)
+            if plan:
+                # 新しいタスクの生成と優先順位付けを1回の呼び出しで行う
+                self._plan_iteration()
+
+        return result
+
+    def _record_error(self, task: Task, operator_type: str, error: Exception) -> Dict[str, Any]:
+        """実行エラーを記録する。
+
+        Args:
+            task: 実行したタスク
+            operator_type: オペレータータイプ
+            error: 発生した例外
+
+        Returns:
+            エラー結果
+        """
+        logger.error(f"タスク実行中にエラーが発生: {str(error)}")
+        error_result = {
+            "status": "failed",
+            "error": str(error),
+            "task_id": task.id,
+            "output": f"タスクの実行中にエラーが発生しました: {str(error)}",
+            "metrics": {
+                "execution_time": 0,
+                "quality_score": 0
+            },
+            "performance_metrics": {
+                "execution_success": False,
+                "error_type": type(error).__name__
+            }
+        }
+
+        self._drop_dependents(task.id)
+
+        # エラー時の実行履歴の更新
+        record = ExecutionRecord(
+            task=task,
+            result=error_result,
+            operator=operator_type,
+            meta_data={
+                "error": str(error),
+                "error_type": type(error).__name__
+            }
+        )
+        self.record_execution(record)
 
-            return error_result
+        return error_result
 
     def _analyze_and_improve_operator(self, operator_type: str, result: Dict[str, Any]) -> None:
         """オペレーターのパフォーマンスを分析し、必要に応じて改善する。
@@ -311,20 +851,11 @@ class UnifiedManager:
         }
 
         # 実行履歴からの追加データ
-        operator_history = [
-            record for record in self.execution_history
-            if record.operator == operator_type
-        ]
-
-        if operator_history:
-            success_rate = sum(
-                1 for record in operator_history
-                if record.result.get("status") == "success"
-            ) / len(operator_history)
-
+        operator_stats = self._window_operator_stats.get(operator_type)
+        if operator_stats:
             performance_data.update({
-                "historical_success_rate": success_rate,
-                "execution_count": len(operator_history)
+                "historical_success_rate": operator_stats["success"] / operator_stats["total"],
+                "execution_count": operator_stats["total"]
             })
 
         # 改善が必要かどうかの判断
@@ -332,7 +863,7 @@ class UnifiedManager:
             performance_data["success_rate"] == 0 or
             performance_data.get("historical_success_rate", 0) < 0.5 or
             performance_data.get("output_quality", 0) < 0.5
-        )
+        ) and self._should_evolve(operator_type, performance_data)
 
         if needs_improvement:
             try:
@@ -367,19 +898,57 @@ class UnifiedManager:
                     self.registry.register_operator(evolved_operator)
 
                     # メタ知識の更新
-                    if self.meta_learner:
-                        self.meta_learner.learn_evolution_patterns(
-                            current_operator,
-                            evolved_operator,
-                            performance_data,
-                            evolution_strategy
-                        )
+                    self.meta_learner.learn_evolution_patterns(
+                        current_operator,
+                        evolved_operator,
+                        performance_data,
+                        evolution_strategy
+                    )
 
             except Exception as e:
                 logger.error(f"オペレーターの進化中にエラーが発生: {str(e)}")
 
+    def _should_evolve(self, operator_type: str, performance_data: Dict[str, Any]) -> bool:
+        """オペレーターの進化（重いLLM呼び出し）を行う価値があるかを判定する。
+
+        実行回数が少なく成功率がまだ安定しない間、成功率が前回の判定から
+        改善している間、前回の進化から間もない間は進化を見送る。
+
+        Args:
+            operator_type: オペレーターの種類
+            performance_data: パフォーマンスデータ
+
+        Returns:
+            進化を行う場合はTrue
+        """
+        if performance_data.get("execution_count", 0) < EVOLUTION_MIN_SAMPLES:
+            return False
+
+        success_rate = performance_data.get("historical_success_rate", 0)
+        previous_rate = self._evolution_success_rates.get(operator_type)
+        self._evolution_success_rates[operator_type] = success_rate
+        if previous_rate is not None and success_rate > previous_rate:
+            return False
+
+        tick = len(self.history_soa)
+        last_evolved = self._last_evolved_at.get(operator_type)
+        if last_evolved is not None and tick - last_evolved < EVOLUTION_COOLDOWN:
+            return False
+        self._last_evolved_at[operator_type] = tick
+        return True
+
     def run(self) -> None:
-        """タスクを自律的に実行する。"""
+        """タスクを自律的に実行する。
+
+        終了時には履歴ファイルなどのリソースを解放する。
+        """
+        try:
+            self._run_loop()
+        finally:
+            self.close()
+
+    def _run_loop(self) -> None:
+        """runの本体。"""
         start_time = time.time()
         iteration = 0
 
@@ -388,6 +957,37 @@ class UnifiedManager:
             if time.time() - start_time > self.max_execution_time:
                 logger.warning("最大実行時間を超過しました")
                 break
+            iteration_start = time.monotonic()
+
+            # 依存関係の解決したタスクを並列に実行
+            if self.dag_workers > 1:
+                executed = self.execute_dag(self.max_iterations - iteration, start_time)
+                if not executed:
+                    self._generate_new_tasks()
+                    continue
+
+                iteration += executed
+                self._display_progress(iteration)
+                time.sleep(self._remaining_delay(iteration_start))
+                continue
+
+            # 複数タスクをまとめてディスパッチ
+            if self.batch_size > 1:
+                tasks = self.select_next_tasks(self.batch_size)
+                if not tasks:
+                    self._generate_new_tasks()
+                    continue
+
+                logger.info(f"タスクを一括実行: {len(tasks)}件")
+                if self.bin_batcher:
+                    self._execute_binned(tasks)
+                else:
+                    self.execute_tasks(tasks)
+
+                time.sleep(self._remaining_delay(iteration_start))
+                iteration += 1
+                self._display_progress(iteration)
+                continue
 
             # 次のタスクを取得
             next_task = self.select_next_task()
@@ -396,61 +996,88 @@ class UnifiedManager:
                 self._generate_new_tasks()
                 continue
 
+            # タスクの実行（実行記録と後続タスクの計画はexecute_next_taskで行う）
+            logger.info(f"タスク実行: {next_task.name}")
             try:
-                # タスクの実行
-                logger.info(f"タスク実行: {next_task.name}")
-                result = self.execute_next_task()
-
-                if not result:
-                    result = {
-                        "status": "failed",
-                        "output": "タスクの実行に失敗しました",
-                        "metrics": {
-                            "execution_time": 0,
-                            "quality_score": 0
-                        }
-                    }
+                self.execute_next_task(next_task)
+            except Exception as e:
+                # 実行エラーはexecute_next_taskで記録済み。記録自体の失敗でも次のタスクへ進む
+                logger.error(f"タスク実行中にエラーが発生: {str(e)}")
 
-                # 実行結果の記録
-                record = ExecutionRecord(
-                    task=next_task,
-                    result=result,
-                    operator=next_task.metadata.task_type,
-                    meta_data={
-                        "context": self.current_context.copy(),
-                        "performance_metrics": result.get("performance_metrics", {})
-                    }
-                )
-                self.execution_history.append(record)
+            # イテレーション間の待機（実行にかかった時間の分は待たない）
+            time.sleep(self._remaining_delay(iteration_start))
+            iteration += 1
 
-                # 成功した場合は新しいタスクを生成
-                if result.get("status") == "success":
-                    self._generate_new_tasks()
+            # 進捗状況の表示
+            self._display_progress(iteration)
 
-            except Exception as e:
-                logger.error(f"タスク実行中にエラーが発生: {str(e)}")
-                # エラーを記録して次のタスクへ
-                error_result = {
-                    "status": "failed",
-                    "output": f"エラーが発生しました: {str(e)}",
-                    "metrics": {
-                        "execution_time": 0,
-                        "quality_score": 0
-                    }
-                }
-                record = ExecutionRecord(
-                    task=next_task,
-                    result=error_result,
-                    operator=next_task.metadata.task_type,
-                    meta_data={
-                        "error": str(e),
-                        "error_type": type(e).__name__
-                    }
-                )
-                self.execution_history.append(record)
+        if iteration >= self.max_iterations:
+            logger.warning(f"最大イテレーション数（{self.max_iterations}）に達しました")
+
+    async def arun(self) -> None:
+        """タスクを自律的に実行する（非同期版）。
+
+        LLM呼び出しを非同期に発行し、現在のタスクを実行している間に次の
+        イテレーションの計画（タスクの生成と優先順位付け）を1回だけ先行して行う。batch_sizeが2以上の場合は
+        選択したタスクのオペレーターを同時に実行する。dag_workersやビン分割を
+        使用する場合は同期版のrun()に委譲する。終了時には履歴ファイルなどの
+        リソースを解放する。
+        """
+        if self.dag_workers > 1 or self.bin_batcher:
+            await asyncio.to_thread(self.run)
+            return
+
+        try:
+            await self._arun_loop()
+        finally:
+            self.close()
+
+    async def _arun_loop(self) -> None:
+        """arunの本体。"""
+        start_time = time.time()
+        iteration = 0
+        await self._aupdate_task_priorities()
 
-            # イテレーション間の待機
-            time.sleep(self.iteration_delay)
+        while iteration < self.max_iterations:
+            # 実行時間のチェック
+            if time.time() - start_time > self.max_execution_time:
+                logger.warning("最大実行時間を超過しました")
+                break
+
+            iteration_start = time.monotonic()
+            tasks = self._pop_ready_tasks(max(self.batch_size, 1))
+            if not tasks:
+                # 新しいタスクの生成と優先順位付けを1回の呼び出しで行う
+                await self._aplan_iteration()
+                continue
+
+            logger.info(f"タスク実行: {', '.join(task.name for task in tasks)}")
+
+            # 実行中に次のイテレーションの計画（タスクの生成と優先順位付け）を先行して行う。
+            # 計画はこの1回だけとし、実行結果の記録では計画しない
+            prefetch = asyncio.create_task(self._aplan_iteration())
+            outcomes = await asyncio.gather(
+                *(asyncio.to_thread(self._run_operator, task) for task in tasks),
+                return_exceptions=True
+            )
+
+            # 実行結果の記録は順番に行う
+            for task, outcome in zip(tasks, outcomes):
+                operator_type = task.metadata.task_type
+                if isinstance(outcome, Exception):
+                    self._record_error(task, operator_type, outcome)
+                    continue
+                _, result, context = outcome
+                try:
+                    await asyncio.to_thread(
+                        self._record_result, task, operator_type, result, context, False
+                    )
+                except Exception as e:
+                    self._record_error(task, operator_type, e)
+            await prefetch
+
+            # イテレーション間の待機（実行にかかった時間の分は待たない）
+            await asyncio.sleep(self._remaining_delay(iteration_start))
             iteration += 1
 
             # 進捗状況の表示
@@ -459,41 +1086,289 @@ class UnifiedManager:
         if iteration >= self.max_iterations:
             logger.warning(f"最大イテレーション数（{self.max_iterations}）に達しました")
 
+    def close(self) -> None:
+        """履歴ファイルと履歴要約用のスレッドを解放する。
+
+        何度呼び出してもよい。閉じた後に実行を記録すると履歴ファイルを開き直す。
+        """
+        if self._history_fp is not None:
+            try:
+                self._history_fp.close()
+            except Exception as e:
+                logger.warning(f"実行履歴ファイルのクローズに失敗: {str(e)}")
+            self._history_fp = None
+        if self._summary_executor is not None:
+            self._summary_executor.shutdown(wait=False)
+            self._summary_executor = None
+
+    def _remaining_delay(self, iteration_start: float) -> float:
+        """イテレーションの間隔をiteration_delay以上に保つために必要な待機時間を求める。
+
+        Args:
+            iteration_start: イテレーションの開始時刻（time.monotonic()）
+
+        Returns:
+            待機時間（秒）。イテレーションが既にiteration_delay以上かかっていれば0
+        """
+        return max(0.0, self.iteration_delay - (time.monotonic() - iteration_start))
+
+    def record_execution(self, record: ExecutionRecord) -> None:
+        """実行記録を履歴に追加する。
+
+        メモリ上のリングバッファに加え、JSONLファイルへ1行ずつ追記する。
+        オペレーター別の集計用の値は列指向の履歴（history_soa）に追加する。
+
+        Args:
+            record: 実行記録
+        """
+        if record.operator and record.operator_code is None:
+            record.operator_code = operator_code(record.operator)
+        if len(self.execution_history) == self.execution_history.maxlen:
+            self._update_window_stats(self.execution_history[0], -1)
+        self.execution_history.append(record)
+        self._update_window_stats(record, 1)
+        lenient_success, lenient_failed = self._lenient_outcome(record.result)
+        self._total_stats["total"] += 1
+        self._total_stats["lenient_success"] += lenient_success
+        self._total_stats["lenient_failed"] += lenient_failed
+        self._task_history_context.append({
+            "task": record.task.model_dump(mode='json'),
+            "result": record.result,
+            "operator": record.operator
+        })
+        self.history_soa.record_execution(record)
+        compact = self._compact_record(record)
+        self._recent_compact.append(compact)
+        self._unsummarized.append(compact)
+        if len(self._unsummarized) >= HISTORY_SUMMARY_INTERVAL:
+            self._schedule_history_summary()
+
+        if self._history_path is None:
+            return
+
+        try:
+            if self._history_fp is None:
+                # 既存の履歴は消さずに追記する
+                self._history_path.parent.mkdir(parents=True, exist_ok=True)
+                self._history_fp = self._history_path.open("a", encoding="utf-8")
+            self._history_fp.write(record.model_dump_json())
+            self._history_fp.write("\n")
+            self._history_fp.flush()
+        except Exception as e:
+            logger.warning(f"実行履歴の書き込みに失敗: {str(e)}")
+
+    @staticmethod
+    def _lenient_outcome(result: Dict[str, Any]) -> Tuple[bool, bool]:
+        """スコアも考慮した寛容な基準で、実行結果が成功・失敗のどちらに数えられるかを判定する。
+
+        Args:
+            result: タスク実行結果
+
+        Returns:
+            (成功に数えるか, 失敗に数えるか)
+        """
+        task_metrics = result.get("metrics", {})
+        scored_ok = any(
+            task_metrics.get(name, 0) >= SUCCESS_SCORE_THRESHOLD for name in SCORE_KEYS
+        )
+        status = result.get("status")
+        return status == "success" or scored_ok, status == "failed" and not scored_ok
+
+    def _update_window_stats(self, record: ExecutionRecord, sign: int) -> None:
+        """メモリ上の履歴の集計値に記録を加算（sign=1）または減算（sign=-1）する。
+
+        Args:
+            record: 実行記録
+            sign: 加算なら1、減算なら-1
+        """
+        result = record.result
+        task_metrics = result.get("metrics", {})
+        status = result.get("status")
+        scores = [task_metrics.get(name, 0) for name in SCORE_KEYS]
+        scored_ok = any(score >= SUCCESS_SCORE_THRESHOLD for score in scores)
+        lenient_success, lenient_failed = self._lenient_outcome(result)
+
+        stats = self._window_stats
+        stats["success"] += sign * (status == "success")
+        stats["failed"] += sign * (status == "failed")
+        stats["error"] += sign * (status == "error")
+        stats["lenient_success"] += sign * lenient_success
+        stats["lenient_failed"] += sign * lenient_failed
+        execution_time = float(task_metrics.get("execution_time", 0))
+        stats["execution_time"] += sign * execution_time
+        if sign > 0:
+            self._push_execution_time(execution_time)
+
+        if not record.operator:
+            return
+        operator_stats = self._window_operator_stats.setdefault(record.operator, {
+            "total": 0,
+            "success": 0,
+            "successful": 0,
+            "failed": 0,
+            **{name: 0.0 for name in SCORE_KEYS}
+        })
+        operator_stats["total"] += sign
+        operator_stats["success"] += sign * (status == "success")
+        operator_stats["successful"] += sign * scored_ok
+        operator_stats["failed"] += sign * (not scored_ok)
+        for name, score in zip(SCORE_KEYS, scores):
+            operator_stats[name] += sign * score
+        if operator_stats["total"] <= 0:
+            del self._window_operator_stats[record.operator]
+
+    def _push_execution_time(self, execution_time: float) -> None:
+        """実行時間を追加し、メモリ上の履歴の範囲の最大・最小を保つ。
+
+        各キューは値が単調になるように保ち、先頭が範囲内の最大（最小）になる。
+        追加と押し出しはならしO(1)で、参照時に履歴を走査しない。
+
+        Args:
+            execution_time: 追加する実行時間
+        """
+        seq = self._exec_time_count
+        self._exec_time_count += 1
+        oldest = seq - self.execution_history.maxlen + 1
+
+        max_queue = self._exec_time_max
+        while max_queue and max_queue[0][0] < oldest:
+            max_queue.popleft()
+        while max_queue and max_queue[-1][1] <= execution_time:
+            max_queue.pop()
+        max_queue.append((seq, execution_time))
+
+        min_queue = self._exec_time_min
+        while min_queue and min_queue[0][0] < oldest:
+            min_queue.popleft()
+        while min_queue and min_queue[-1][1] >= execution_time:
+            min_queue.pop()
+        min_queue.append((seq, execution_time))
+
+    def _schedule_history_summary(self) -> None:
+        """未要約の実行記録の要約をバックグラウンドで開始する。
+
+        要約のLLM呼び出しはタスクの実行・生成・優先順位付けと独立しているため、
+        専用の1スレッドで順番に行い、記録する側は待たない。要約が終わるまでの
+        プロンプトには直前の要約が使われる。
+        """
+        records, self._unsummarized = self._unsummarized, []
+        if self._summary_executor is None:
+            self._summary_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="history-summary"
+            )
+        self._summary_future = self._summary_executor.submit(
+            self._fold_history_summary, records
+        )
+
+    def wait_for_history_summary(self) -> None:
+        """実行中の履歴の要約が終わるまで待つ。"""
+        if self._summary_future is not None:
+            self._summary_future.result()
+
+    def _fold_history_summary(self, records: List[Dict[str, Any]]) -> None:
+        """実行記録を履歴の要約に畳み込む。
+
+        Args:
+            records: 要約に加える実行記録
+        """
+        try:
+            self.history_summary = self.llm_client.summarize_history(
+                self.history_summary, records
+            )
+            self._summary_version += 1
+        except Exception as e:
+            logger.warning(f"実行履歴の要約に失敗: {str(e)}")
+
+    @staticmethod
+    def _compact_record(record: ExecutionRecord) -> Dict[str, Any]:
+        """プロンプト用に実行記録を要点だけの辞書にする。"""
+        return {
+            "task": record.task.name[:100],
+            "operator": record.operator,
+            "status": record.result.get("status", "unknown"),
+            "time": record.timestamp.timestamp(),
+            "quality": record.result.get("performance_metrics", {}).get("quality_score")
+        }
+
+    def _recent_history(self) -> List[Dict[str, Any]]:
+        """プロンプトに含める直近の実行履歴を取得する。"""
+        return list(self._recent_compact)
+
+    @property
+    def operator_stats(self) -> Dict[str, Dict[str, Any]]:
+        """オペレーター別の実行統計（実行回数・成功数・合計実行時間・生成タスク数）。
+
+        実行開始からの全記録を、列指向の履歴から数値カーネルで集計する。
+        """
+        return self.history_soa.operator_stats()
+
+    def iter_history(self) -> Iterator[ExecutionRecord]:
+        """全実行履歴を古い順に1件ずつ返す。
+
+        履歴ファイルが無い場合はメモリ上の直近の履歴のみを返す。履歴ファイルには
+        同じパスを指定した以前の実行の記録も含まれる。
+
+        Returns:
+            実行記録のイテレーター
+        """
+        if self._history_path is None or not self._history_path.exists():
+            yield from list(self.execution_history)
+            return
+
+        if self._history_fp is not None:
+            self._history_fp.flush()
+        with self._history_path.open("r", encoding="utf-8") as fp:
+            for line in fp:
+                if line.strip():
+                    yield ExecutionRecord.model_validate_json(line)
+
     def _display_progress(self, iteration: int) -> None:
         """進捗状況を表示する。"""
         logger.info(f"進捗: {iteration}/{self.max_iterations} "
                    f"({iteration/self.max_iterations*100:.1f}%)")
 
         # 成功率の計算
-        success_count = sum(
-            1 for record in self.execution_history
-            if record.result.get("status") == "success"
-        )
-        logger.debug(f"実行履歴の長さ: {len(self.execution_history)}")
-        logger.debug("実行結果の詳細:")
-        for i, record in enumerate(self.execution_history):
-            logger.debug(f"タスク {i+1}:")
-            logger.debug(f"  - ステータス: {record.result.get('status')}")
-            logger.debug(f"  - 品質スコア: {record.result.get('metrics', {}).get('quality_score')}")
-            logger.debug(f"  - 出力: {record.result.get('output')}")
+        success_count = self._window_stats["success"]
+        if logger.isEnabledFor(logging.DEBUG):
+            # 前回の表示以降に記録された分だけを出力する（毎回履歴全体を走査しない）
+            total_records = len(self.history_soa)
+            new_count = min(total_records - self._progress_logged, len(self.execution_history))
+            self._progress_logged = total_records
+            logger.debug(f"実行履歴の長さ: {len(self.execution_history)}")
+            logger.debug("実行結果の詳細:")
+            new_records = itertools.islice(
+                self.execution_history, len(self.execution_history) - new_count, None
+            )
+            for i, record in enumerate(new_records, total_records - new_count):
+                logger.debug(f"タスク {i+1}:")
+                logger.debug(f"  - ステータス: {record.result.get('status')}")
+                logger.debug(f"  - 品質スコア: {record.result.get('metrics', {}).get('quality_score')}")
+                logger.debug(f"  - 出力: {record.result.get('output')}")
 
         if self.execution_history:
             success_rate = success_count / len(self.execution_history) * 100
             logger.info(f"成功率: {success_rate:.1f}% (成功: {success_count}, 総数: {len(self.execution_history)})")
 
     def _display_execution_stats(self) -> None:
-        """実行統計を表示する。"""
-        total_tasks = len(self.execution_history)
-        successful_tasks = sum(
-            1 for record in self.execution_history
-            if record.result.get("status") == "success"
-        )
+        """実行統計を表示する。
+
+        全履歴のファイルは読み直さず、列指向の履歴からオペレーター別に集計する。
+        """
+        operator_stats = self.history_soa.operator_stats()
+        total_tasks = sum(stats["count"] for stats in operator_stats.values())
+        successful_tasks = sum(stats["success"] for stats in operator_stats.values())
 
         logger.info("\n=== 実行統計 ===")
         logger.info(f"総タスク数: {total_tasks}")
         logger.info(f"成功タスク数: {successful_tasks}")
         if total_tasks > 0:
             logger.info(f"全体の成功率: {successful_tasks/total_tasks*100:.1f}%")
+        for operator, stats in operator_stats.items():
+            logger.info(
+                f"  - {operator}: {stats['count']}件 "
+                f"(成功率: {stats['success']/stats['count']*100:.1f}%, "
+                f"平均実行時間: {stats['total_time']/stats['count']:.2f}秒)"
+            )
 
     def _initialize_meta_knowledge(self) -> Dict[str, Any]:
         """メタ知識を初期化する。
@@ -505,135 +1380,316 @@ class UnifiedManager:
             "generation_strategies": {},
             "evolution_patterns": [],
             "context_dependencies": {},
-            "successful_patterns": [],
-            "failed_patterns": []
+            "successful_patterns": {
+                "success_count": 0,
+                "failure_count": 0,
+                "top_successful": []
+            }
         }
 
     def _generate_new_tasks(self) -> None:
         """新しいタスクを生成する。"""
         try:
-            # 実行履歴をJSON直列化可能な形式に変換
-            serializable_history = [
-                record.model_dump(mode='json')
-                for record in self.execution_history
+            # LLMに新しいタスクの生成を依頼
+            response = self.llm_client.generate_tasks(self._task_generation_prompt())
+            self._create_tasks_from_response(response)
+        except Exception as e:
+            logger.error(f"タスク生成中にエラーが発生: {str(e)}")
+
+    def _plan_iteration(self) -> None:
+        """新しいタスクの生成と現在のタスクの優先順位付けを1回のLLM呼び出しで行う。
+
+        応答の優先度で現在のタスクを並べ直してから生成したタスクを追加する。
+        キュー全体の優先度が決まった場合は、次のタスク選択での優先順位付けを省く。
+        """
+        try:
+            self._apply_plan(self.llm_client.plan_iteration(self._planning_prompt()))
+        except Exception as e:
+            logger.error(f"タスク計画中にエラーが発生: {str(e)}")
+
+    async def _aplan_iteration(self) -> None:
+        """新しいタスクの生成と現在のタスクの優先順位付けを非同期に行う。"""
+        try:
+            response = await self.llm_client.aplan_iteration(self._planning_prompt())
+            self._apply_plan(response)
+        except Exception as e:
+            logger.error(f"タスク計画中にエラーが発生: {str(e)}")
+
+    def _planning_prompt(self) -> Dict[str, Any]:
+        """タスク生成のプロンプトに現在のタスクを加えた計画のプロンプトを作成する。"""
+        return {
+            **self._task_generation_prompt(),
+            "current_tasks": [
+                {"id": task.id, "description": task.description}
+                for task in self.task_queue
             ]
+        }
 
-            # コンテキストをJSON直列化可能な形式に変換
-            serializable_context = {
-                k: (v.isoformat() if isinstance(v, datetime) else v)
-                for k, v in self.current_context.items()
-            }
+    def _apply_plan(self, response: Dict[str, Any]) -> None:
+        """計画の応答の優先度と生成したタスクをキューに反映する。"""
+        with self._queue_lock:
+            queue_was_empty = not self._task_entries
+        self._apply_priorities(response)
+        tasks = response.get("tasks", [])
+        if tasks:
+            self._create_generated_tasks(tasks)
+            logger.info(f"{len(tasks)}個の新しいタスクを生成しました")
+        else:
+            logger.warning("新しいタスクは生成されませんでした")
+        if response.get("priorities") or (tasks and queue_was_empty):
+            with self._queue_lock:
+                self._priorities_from_generation = True
 
-            # LLMに新しいタスクの生成を依頼
-            response = self.llm_client.generate_tasks({
-                "objective": self.objective,
-                "context": serializable_context,
-                "execution_history": serializable_history,
-                "current_state": {
-                    "total_tasks": len(self.execution_history),
-                    "successful_tasks": sum(
-                        1 for record in self.execution_history
-                        if record.result.get("status") == "success"
-                    ),
-                    "failed_tasks": sum(
-                        1 for record in self.execution_history
-                        if record.result.get("status") == "failed"
-                    )
-                }
-            })
+    def _task_generation_prompt(self) -> Dict[str, Any]:
+        """タスク生成のプロンプトを作成する。
 
-            # レスポンスの形式をチェック
-            if isinstance(response, dict):
-                tasks = response.get("tasks", [])
-                if not tasks and "task" in response:
-                    tasks = [response["task"]]
-            elif isinstance(response, list):
-                tasks = response
-            else:
-                tasks = []
-
-            if tasks:
-                self._create_generated_tasks(tasks)
-                logger.info(f"{len(tasks)}個の新しいタスクを生成しました")
-            else:
-                logger.warning("新しいタスクは生成されませんでした")
+        コンテキストも実行記録も変わっていなければ、前回作成したものを再利用する。
+        """
+        version = (self._context_version, len(self.history_soa), self._summary_version)
+        cached = self._generation_prompt
+        if cached is not None and cached[0] == version:
+            return cached[1]
 
-        except Exception as e:
-            logger.error(f"タスク生成中にエラーが発生: {str(e)}")
+        prompt = {
+            "objective": self.objective,
+            "context": self._serialized_context(),
+            "execution_history": self._recent_history(),
+            "history_summary": self.history_summary,
+            "current_state": {
+                "total_tasks": len(self.execution_history),
+                "successful_tasks": self._window_stats["success"],
+                "failed_tasks": self._window_stats["failed"]
+            }
+        }
+        self._generation_prompt = (version, prompt)
+        return prompt
+
+    def _create_tasks_from_response(self, response: Any) -> None:
+        """タスク生成の応答から新しいタスクを作成する。"""
+        # レスポンスの形式をチェック
+        if isinstance(response, dict):
+            tasks = response.get("tasks", [])
+            if not tasks and "task" in response:
+                tasks = [response["task"]]
+        elif isinstance(response, list):
+            tasks = response
+        else:
+            tasks = []
+
+        if tasks:
+            with self._queue_lock:
+                queue_was_empty = not self._task_entries
+            self._create_generated_tasks(tasks)
+            if queue_was_empty:
+                # 生成の応答に優先度が含まれるため、別の優先順位付けの往復は不要
+                with self._queue_lock:
+                    self._priorities_from_generation = True
+            logger.info(f"{len(tasks)}個の新しいタスクを生成しました")
+        else:
+            logger.warning("新しいタスクは生成されませんでした")
 
     def create_task(
         self,
         description: str,
         task_type: str,
         params: Optional[Dict[str, Any]] = None,
-        priority: float = 1.0
+        priority: float = 1.0,
+        depends_on: Optional[List[str]] = None,
+        task_id: Optional[str] = None
     ) -> Task:
         """タスクを作成する。"""
+        # コンテキストはタスクごとにコピーせず、版数で参照する
+        self._snapshot_context()
         metadata = TaskMetadata(
             task_type=task_type,
             params=params or {},
-            context=self.current_context.copy()
+            context_version=self._context_version,
+            depends_on=depends_on or []
         )
 
         task = Task(
-            id=f"task-{uuid4()}",
+            id=task_id or f"task-{uuid4()}",
             name=description,
             description=description,
             priority=priority,
             metadata=metadata
         )
-        self.task_queue.append(task)
+        self._push_task(task)
         return task
 
+    def _snapshot_context(self) -> None:
+        """現在の版のコンテキストを保存する（保存済みの版は何もしない）。"""
+        version = self._context_version
+        if version in self._context_snapshots:
+            return
+        # 完了タスクの一覧はコピーせず、件数だけを記録する
+        context = {
+            key: value for key, value in self.current_context.items()
+            if key != "completed_tasks"
+        }
+        context["completed_tasks_count"] = self._completed_count
+        self._context_snapshots[version] = context
+        if len(self._context_snapshots) > CONTEXT_SNAPSHOT_LIMIT:
+            del self._context_snapshots[next(iter(self._context_snapshots))]
+
+    def context_snapshot(self, version: Optional[int]) -> Optional[Dict[str, Any]]:
+        """タスク作成時のコンテキストを取得する。
+
+        Args:
+            version: タスクのmetadata.context_version
+
+        Returns:
+            その版のコンテキスト（破棄済みの場合はNone）
+        """
+        if version is None:
+            return None
+        return self._context_snapshots.get(version)
+
     def select_next_task(self) -> Optional[Task]:
         """次に実行すべきタスクを選択する。
 
         Returns:
             選択されたタスク
         """
-        if not self.task_queue:
+        if not self._task_entries:
             return None
 
         # LLMを使用してタスクの優先順位を更新
         self._update_task_priorities()
 
-        # 優先度でソート
-        self.task_queue.sort(key=lambda x: x.priority, reverse=True)
+        # 優先度順に、依存関係の解決したタスクを選択
+        ready_tasks = self._pop_ready_tasks(1)
+        return ready_tasks[0] if ready_tasks else None
 
-        # 最適なタスクを選択
-        selected_task = self.task_queue[0]
-        self.task_queue.remove(selected_task)
-        return selected_task
+    def select_next_tasks(self, count: int) -> List[Task]:
+        """優先度の高い順に複数のタスクを選択する。
+
+        優先順位の更新は1回だけ行う。
+
+        Args:
+            count: 選択するタスク数
+
+        Returns:
+            選択されたタスクのリスト
+        """
+        if not self._task_entries:
+            return []
+
+        self._update_task_priorities()
+        return self._pop_ready_tasks(count)
 
     def _update_task_priorities(self) -> None:
         """LLMを使用してタスクの優先順位を更新する。"""
-        context = {
+        state = self._priority_state()
+        if state is None:
+            return
+
+        # LLMに優先順位付けを依頼
+        response = self.llm_client.prioritize_tasks(self._priority_context())
+        self._apply_priorities(response)
+        self._last_priority_state = state
+
+    async def _aupdate_task_priorities(self) -> None:
+        """LLMを使用してタスクの優先順位を非同期に更新する。"""
+        state = self._priority_state()
+        if state is None:
+            return
+        try:
+            response = await self.llm_client.aprioritize_tasks(self._priority_context())
+            self._apply_priorities(response)
+            self._last_priority_state = state
+        except Exception as e:
+            logger.error(f"優先順位付け中にエラーが発生: {str(e)}")
+
+    def _priority_state(self) -> Optional[Tuple[FrozenSet[str], int, int]]:
+        """優先順位付けが必要な場合に、判定に使ったキューと履歴の状態を返す。
+
+        前回の優先順位付けからキュー内のタスクも実行記録も変わっていなければ、
+        LLMの応答も変わらないとみなして呼び出しを省く。
+
+        Returns:
+            (キュー内のタスクIDの集合, 総記録数, 成功数)。省略できる場合はNone
+        """
+        # タスクが1件以下なら順序は決まっている
+        if len(self._task_entries) <= 1 or self._consume_generated_priorities():
+            return None
+        with self._queue_lock:
+            task_ids = frozenset(self._task_entries)
+        state = (task_ids, len(self.history_soa), self._window_stats["success"])
+        if state == self._last_priority_state:
+            logger.debug("キューと実行履歴が前回から変わっていないため、優先順位付けを省略します")
+            return None
+        return state
+
+    def _consume_generated_priorities(self) -> bool:
+        """タスク生成の応答で決まった優先度をそのまま使えるかを判定する。
+
+        キューが空の状態で生成されたタスクは、生成の応答に含まれる優先度で
+        並んでいるため、直後の1回に限り優先順位付けのLLM呼び出しを省ける。
+
+        Returns:
+            優先順位付けを省略できる場合はTrue
+        """
+        with self._queue_lock:
+            fresh = self._priorities_from_generation
+            self._priorities_from_generation = False
+        if fresh:
+            logger.debug("生成時の優先度を使用するため、優先順位付けを省略します")
+        return fresh
+
+    def _priority_context(self) -> Dict[str, Any]:
+        """優先順位付けのコンテキストを作成する。"""
+        return {
             "objective": self.objective,
-            "current_tasks": [task.model_dump(mode='json') for task in self.task_queue],
-            "completed_tasks": self.current_context["completed_tasks"],
-            "execution_history": [record.model_dump(mode='json') for record in self.execution_history]
+            # 優先順位付けにはIDと説明しか使わないため、モデル全体は直列化しない
+            "current_tasks": [
+                {"id": task.id, "description": task.description}
+                for task in self.task_queue
+            ],
+            "completed_tasks": list(itertools.islice(
+                reversed(self.current_context["completed_tasks"]), PROMPT_HISTORY_WINDOW
+            ))[::-1],
+            "execution_history": self._recent_history(),
+            "history_summary": self.history_summary
         }
 
-        # LLMに優先順位付けを依頼
-        response = self.llm_client.prioritize_tasks(context)
-
-        # 優先順位の更新
-        for priority_info in response.get("priorities", []):
-            task_id = priority_info["task_id"]
-            new_priority = priority_info["priority"]
-            for task in self.task_queue:
-                if task.id == task_id:
+    def _apply_priorities(self, response: Dict[str, Any]) -> None:
+        """優先順位付けの結果をタスクキューに反映する。
+
+        優先度が変わったタスクはまとめて1回でキューに積み直す。
+        """
+        with self._queue_lock:
+            changed: List[Task] = []
+            for priority_info in response.get("priorities", []):
+                entry = self._task_entries.get(priority_info["task_id"])
+                if entry is None:
+                    continue
+                task = entry[2]
+                new_priority = priority_info["priority"]
+                if task.priority != new_priority:
                     task.priority = new_priority
-                    break
+                    changed.append(task)
+            if changed:
+                self._push_tasks_locked(changed)
 
     def _create_generated_tasks(self, task_specs: List[Dict[str, Any]]) -> None:
-        """生成されたタスク仕様から新しいタスクを作成する。"""
-        for spec in task_specs:
+        """生成されたタスク仕様から新しいタスクを作成する。
+
+        仕様のdepends_onには、同じリスト内の仕様の添字か既存タスクのIDを指定できる。
+        """
+        task_ids = [f"task-{uuid4()}" for _ in task_specs]
+        for spec, task_id in zip(task_specs, task_ids):
+            depends_on = [
+                task_ids[dep] if isinstance(dep, int) else dep
+                for dep in spec.get("depends_on", [])
+            ]
             self.create_task(
                 description=spec["description"],
                 task_type=spec.get("operator_type", "default"),
                 params=spec.get("params", {}),
-                priority=float(spec.get("priority", 1.0))
+                priority=float(spec.get("priority", 1.0)),
+                depends_on=depends_on,
+                task_id=task_id
             )
 
     def _prepare_context(self, required_keys: List[str]) -> Dict[str, Any]:
@@ -645,16 +1701,12 @@ class UnifiedManager:
         Returns:
             実行コンテキスト
         """
+        providers = self._context_providers
         context = {}
         for key in required_keys:
-            if key == "task_history":
-                context[key] = self.execution_history
-            elif key == "objective":
-                context[key] = self.objective
-            elif key == "task_list":
-                context[key] = self.task_queue
-            elif key == "performance_metrics":
-                context[key] = self.current_context["performance_metrics"]
+            provider = providers.get(key)
+            if provider is not None:
+                context[key] = provider()
             elif key in self.current_context:
                 context[key] = self.current_context[key]
 
@@ -666,136 +1718,89 @@ class UnifiedManager:
         Args:
             result: タスク実行結果
         """
+        self._context_version += 1
         metrics = self.current_context.setdefault("performance_metrics", {})
 
-        # 基本的な実行統計
-        metrics["total_tasks"] = len(self.execution_history)
-
-        # 成功したタスクの数を計算（より寛容な判定基準を使用）
-        successful_tasks = sum(
-            1 for record in self.execution_history
-            if (
-                isinstance(record.result, dict) and
-                (
-                    record.result.get("status") == "success" or
-                    record.result.get("metrics", {}).get("quality_score", 0) >= 0.3 or
-                    record.result.get("metrics", {}).get("progress_score", 0) >= 0.3 or
-                    record.result.get("metrics", {}).get("confidence_score", 0) >= 0.3
-                )
+        # 基本的な実行統計（record_executionで差分更新した集計値を使用）。
+        # 総数と成功率は実行開始からの全記録で、window_*はメモリ上の直近の履歴で数える
+        stats = self._window_stats
+        totals = self._total_stats
+        metrics["total_tasks"] = totals["total"]
+
+        # 成功したタスクの数（より寛容な判定基準を使用）
+        successful_tasks = totals["lenient_success"]
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("パフォーマンス指標の更新:")
+            logger.debug(f"  - 総タスク数: {metrics['total_tasks']}")
+            logger.debug(f"  - 成功タスク数: {successful_tasks}")
+            # 判定基準は今回の結果の分だけを出力する
+            logger.debug("タスクの判定基準:")
+            task_metrics = result.get("metrics", {})
+            status = result.get("status")
+            quality_score = task_metrics.get("quality_score", 0)
+            progress_score = task_metrics.get("progress_score", 0)
+            confidence_score = task_metrics.get("confidence_score", 0)
+            logger.debug(
+                f"  - ステータス: {status}, "
+                f"品質スコア: {quality_score:.2f}, "
+                f"進捗スコア: {progress_score:.2f}, "
+                f"信頼度スコア: {confidence_score:.2f}"
+            )
+            logger.debug(
+                f"    -> 成功判定: {status == 'success' or quality_score >= 0.3 or progress_score >= 0.3 or confidence_score >= 0.3}"
             )
-        )
-
-        logger.debug("パフォーマンス指標の更新:")
-        logger.debug(f"  - 総タスク数: {metrics['total_tasks']}")
-        logger.debug(f"  - 成功タスク数: {successful_tasks}")
-        logger.debug("各タスクの判定基準:")
-        for record in self.execution_history:
-            if isinstance(record.result, dict):
-                task_metrics = record.result.get("metrics", {})
-                status = record.result.get("status")
-                quality_score = task_metrics.get("quality_score", 0)
-                progress_score = task_metrics.get("progress_score", 0)
-                confidence_score = task_metrics.get("confidence_score", 0)
-                logger.debug(
-                    f"  - ステータス: {status}, "
-                    f"品質スコア: {quality_score:.2f}, "
-                    f"進捗スコア: {progress_score:.2f}, "
-                    f"信頼度スコア: {confidence_score:.2f}"
-                )
-                logger.debug(
-                    f"    -> 成功判定: {status == 'success' or quality_score >= 0.3 or progress_score >= 0.3 or confidence_score >= 0.3}"
-                )
 
         metrics["successful_tasks"] = successful_tasks
 
-        # 失敗したタスクの数を計算
-        failed_tasks = sum(
-            1 for record in self.execution_history
-            if (
-                isinstance(record.result, dict) and
-                record.result.get("status") == "failed" and
-                all(
-                    record.result.get("metrics", {}).get(score, 0) < 0.3
-                    for score in ["quality_score", "progress_score", "confidence_score"]
-                )
-            )
-        )
-        metrics["failed_tasks"] = failed_tasks
+        # 失敗したタスクの数
+        metrics["failed_tasks"] = totals["lenient_failed"]
 
         # 成功率の計算（より寛容な計算方法）
         total_completed = metrics["total_tasks"]
-        logger.debug(f"total_completed: {total_completed}")
         metrics["success_rate"] = (
             successful_tasks / total_completed
             if total_completed > 0 else 0.0
         )
 
-        # 実行時間の統計
-        execution_times = [
-            float(record.result.get("metrics", {}).get("execution_time", 0))
-            for record in self.execution_history
-            if isinstance(record.result, dict)
-        ]
+        # 直近の履歴での実行統計
+        window_total = len(self.execution_history)
+        metrics["window_total_tasks"] = window_total
+        metrics["window_successful_tasks"] = stats["lenient_success"]
+        metrics["window_failed_tasks"] = stats["lenient_failed"]
+        metrics["window_success_rate"] = (
+            stats["lenient_success"] / window_total
+            if window_total > 0 else 0.0
+        )
 
-        if execution_times:
-            metrics["avg_execution_time"] = sum(execution_times) / len(execution_times)
-            metrics["max_execution_time"] = max(execution_times)
-            metrics["min_execution_time"] = min(execution_times)
+        # 実行時間の統計
+        if self.execution_history:
+            metrics["avg_execution_time"] = stats["execution_time"] / len(self.execution_history)
+            metrics["max_execution_time"] = self._exec_time_max[0][1]
+            metrics["min_execution_time"] = self._exec_time_min[0][1]
 
         # オペレーター別の統計
-        operator_stats = {}
-        for record in self.execution_history:
-            if not record.operator:
-                continue
-
-            operator = record.operator
-            if operator not in operator_stats:
-                operator_stats[operator] = {
-                    "total": 0,
-                    "successful": 0,
-                    "failed": 0,
-                    "avg_quality_score": 0,
-                    "avg_progress_score": 0,
-                    "avg_confidence_score": 0
+        metrics["operator_stats"] = {
+            operator: {
+                "total": operator_stats["total"],
+                "successful": operator_stats["successful"],
+                "failed": operator_stats["failed"],
+                **{
+                    f"avg_{name}": operator_stats[name] / operator_stats["total"]
+                    for name in SCORE_KEYS
                 }
+            }
+            for operator, operator_stats in self._window_operator_stats.items()
+        }
 
-            stats = operator_stats[operator]
-            stats["total"] += 1
-
-            if isinstance(record.result, dict):
-                task_metrics = record.result.get("metrics", {})
-                if any(
-                    task_metrics.get(score, 0) >= 0.3
-                    for score in ["quality_score", "progress_score", "confidence_score"]
-                ):
-                    stats["successful"] += 1
-                else:
-                    stats["failed"] += 1
-
-                # 平均スコアの更新
-                stats["avg_quality_score"] = (
-                    (stats["avg_quality_score"] * (stats["total"] - 1) +
-                     task_metrics.get("quality_score", 0)) / stats["total"]
-                )
-                stats["avg_progress_score"] = (
-                    (stats["avg_progress_score"] * (stats["total"] - 1) +
-                     task_metrics.get("progress_score", 0)) / stats["total"]
-                )
-                stats["avg_confidence_score"] = (
-                    (stats["avg_confidence_score"] * (stats["total"] - 1) +
-                     task_metrics.get("confidence_score", 0)) / stats["total"]
-                )
-
-        metrics["operator_stats"] = operator_stats
-
-        # メタ知識の更新
-        if self.meta_learner:
+        # メタ知識の更新（メタ学習器が未生成の間は学習内容が無いので生成しない）
+        meta_learner = self._meta_learner
+        if meta_learner is not None:
             self.current_context["meta_knowledge"] = {
-                "generation_strategies": self.meta_learner.generation_strategies,
-                "evolution_patterns": self.meta_learner.evolution_patterns,
-                "context_dependencies": self.meta_learner.meta_knowledge.get("context_dependencies", {}),
-                "successful_patterns": self.meta_learner.meta_knowledge.get("successful_patterns", []),
-                "failed_patterns": self.meta_learner.meta_knowledge.get("failed_patterns", [])
+                "generation_strategies": meta_learner.generation_strategies,
+                "evolution_patterns": meta_learner.evolution_patterns,
+                "context_dependencies": meta_learner.meta_knowledge.get("context_dependencies", {}),
+                "successful_patterns": meta_learner.pattern_summary()
             }
 
     def _is_objective_achieved(self) -> bool:
@@ -804,52 +1809,60 @@ class UnifiedManager:
         Returns:
             目的達成の判定結果
         """
+        # 明らかに未達成の間はLLMを呼び出さない
+        metrics = self.current_context["performance_metrics"]
+        total_tasks = metrics.get("total_tasks", 0)
+        success_rate = metrics.get("success_rate", 0.0)
+        if (
+            total_tasks < OBJECTIVE_MIN_TASKS
+            or success_rate < OBJECTIVE_MIN_SUCCESS_RATE
+            or self._task_entries
+        ):
+            return False
+
+        # ほぼ同じ状態の評価結果は使い回す
+        state_key = (total_tasks, round(success_rate, 2))
+        verdict = self._objective_verdicts.get(state_key)
+        if verdict is not None:
+            return verdict
+
         # LLMを使用して目的達成を評価
         context = {
             "objective": self.objective,
-            "execution_history": self.execution_history,
+            "execution_history": self._recent_history(),
+            "history_summary": self.history_summary,
             "performance_metrics": self.current_context["performance_metrics"]
         }
 
         response = self.llm_client.evaluate_objective_completion(context)
-        return response.get("is_achieved", False)
+        verdict = self._objective_verdicts[state_key] = bool(response.get("is_achieved", False))
+        return verdict
 
-    def _prepare_context_for_json(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        """コンテキストをJSON直列化可能な形式に変換する。
+    def _serialized_context(self) -> Dict[str, Any]:
+        """current_contextをJSON直列化可能な形式に変換したものを取得する。
 
-        Args:
-            context: 変換するコンテキスト
+        変換結果はコンテキストの版数が変わるまで使い回す。呼び出し側は
+        戻り値を変更しないこと。
 
         Returns:
             JSON直列化可能なコンテキスト
         """
-        serializable_context = {}
-        for key, value in context.items():
-            if isinstance(value, datetime):
-                serializable_context[key] = value.isoformat()
-            elif isinstance(value, (list, dict)):
-                serializable_context[key] = self._prepare_nested_structure(value)
-            else:
-                serializable_context[key] = value
-        return serializable_context
+        cached = self._context_json
+        if cached is not None and cached[0] == self._context_version:
+            return cached[1]
 
-    def _prepare_nested_structure(self, data: Any) -> Any:
-        """ネストされたデータ構造をJSON直列化可能な形式に変換する。
+        version = self._context_version
+        serialized = self._prepare_context_for_json(self.current_context)
+        self._context_json = (version, serialized)
+        return serialized
+
+    def _prepare_context_for_json(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """コンテキストをJSON直列化可能な形式に変換する。
 
         Args:
-            data: 変換するデータ
+            context: 変換するコンテキスト
 
         Returns:
-            JSON直列化可能なデータ
+            JSON直列化可能なコンテキスト
         """
-        if isinstance(data, dict):
-            return {
-                key: self._prepare_nested_structure(value)
-                for key, value in data.items()
-            }
-        elif isinstance(data, list):
-            return [self._prepare_nested_structure(item) for item in data]
-        elif isinstance(data, datetime):
-            return data.isoformat()
-        else:
-            return data
+        return to_jsonable(context)
@@ -1,9 +1,16 @@
 """LLMクライアント。"""
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
+import asyncio
+import hashlib
+import importlib.util
 import json
 import logging
 import os
-from openai import OpenAI
+import time
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+import numpy as np
+from openai import AsyncOpenAI, OpenAI
 from openai.types.chat import (
     ChatCompletion,
     ChatCompletionMessage,
@@ -12,23 +19,454 @@ from openai.types.chat import (
     ChatCompletionUserMessageParam
 )
 
+from genesis_agi.utils.cache import Cache, SemanticCache
+from genesis_agi.utils.json_tree import canonical_dumps
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+# LLM応答のキャッシュ有効期限（秒）
+RESPONSE_CACHE_TTL = 24 * 60 * 60
+# 呼び出しの種類ごとの応答キャッシュの有効期限（秒）。0の種類はキャッシュせず、
+# 登録の無い種類はRESPONSE_CACHE_TTLを使用する
+CACHE_POLICY: Dict[str, int] = {
+    "analyze_task": 60 * 60,  # 同じ説明のタスクの分析は長く再利用する
+    "generate_tasks": 0,  # 新しいタスクを得るための呼び出しなので再利用しない
+    "plan_iteration": 0,  # 新しいタスクの生成を含むため再利用しない
+    "prioritize_tasks": 30,  # キューの状況に追従するよう短くする
+    "evaluate_objective_completion": 5 * 60,
+}
+
+# セマンティックキャッシュに使用する埋め込みモデル
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# 固定のシステムプロンプト（呼び出し間で同一に保ち、プレフィックスキャッシュを効かせる）
+STRATEGY_SYSTEM_PROMPT = (
+    "あなたはオペレーター生成戦略の専門家です。"
+    "既知の戦略とメタ知識、続くタスク情報に基づいて、最適な生成戦略を提案してください。"
+)
+OPERATOR_GENERATION_SYSTEM_PROMPT = (
+    "あなたはPythonオペレーターの生成の専門家です。"
+    "既知のオペレーターと続くタスク・コンテキスト・戦略に基づいて、オペレーターコードを生成してください。"
+)
+OPERATOR_EVOLUTION_SYSTEM_PROMPT = (
+    "あなたはPythonオペレーターの最適化の専門家です。"
+    "元のコードと続くパフォーマンス・改善戦略に基づいて、オペレーターを改善してください。"
+)
+ANALYSIS_SYSTEM_PROMPT = (
+    "あなたはタスク分析の専門家です。"
+    "生成戦略を踏まえてタスクを分析し、必要なオペレータータイプとパラメータを特定してください。"
+)
+ANALYSIS_BATCH_SYSTEM_PROMPT = (
+    "あなたはタスク分析の専門家です。"
+    "生成戦略を踏まえて番号付きの各タスクを分析し、"
+    '[{"index": 番号, "required_operator_type": オペレータータイプ, "description": 分析結果}] '
+    "の形式のJSON配列のみを返してください。"
+)
+TASK_GENERATION_SYSTEM_PROMPT = (
+    "あなたはタスク生成の専門家です。"
+    "目的と続く実行状況に基づいて、新しいタスクを生成してください。"
+)
+PRIORITIZATION_SYSTEM_PROMPT = (
+    "あなたはタスクの優先順位付けの専門家です。"
+    "目的と続くタスクの一覧に基づいて、タスクの優先順位を決定してください。"
+)
+PLANNING_SYSTEM_PROMPT = (
+    "あなたはタスク計画の専門家です。"
+    "目的と続く実行状況に基づいて、現在のタスクの優先順位付けと新しいタスクの生成を同時に行い、"
+    '{"priorities": [{"task_id": タスクID, "priority": 優先度}], '
+    '"new_tasks": [{"description": 説明, "operator_type": オペレータータイプ, "priority": 優先度, "params": {}}]} '
+    "の形式のJSONオブジェクトのみを返してください。"
+)
+EVALUATION_SYSTEM_PROMPT = (
+    "あなたは目的達成の評価の専門家です。"
+    "目的と続く実行状況に基づいて、目的の達成状況を評価してください。"
+)
+SUMMARY_SYSTEM_PROMPT = (
+    "あなたは実行履歴の要約の専門家です。"
+    "これまでの要約と続く実行記録を統合し、後続のタスク計画に必要な事実だけを簡潔にまとめてください。"
+)
+
+# プロンプトに含める直近の実行履歴の件数（それより前は要約して渡す）
+PROMPT_HISTORY_WINDOW = 10
+# 実行履歴の要約の最大トークン数
+HISTORY_SUMMARY_MAX_TOKENS = 512
+# 1回のプロンプトでまとめて分析するタスクの最大数
+ANALYSIS_BATCH_SIZE = 8
+# 目的達成の評価の最大トークン数
+EVALUATION_MAX_TOKENS = 64
+# 優先順位付けでタスク1件あたりに許す最大トークン数
+PRIORITY_TOKENS_PER_TASK = 20
+# 圧縮した実行履歴の見出し行（列は「|」区切り、dtは先頭の記録からの経過秒数）
+COMPACT_HISTORY_HEADER = "op|status|dt|qual|task"
+
+# API呼び出しで使い回すHTTP接続の上限
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+HTTP_TIMEOUT = 60.0
+# h2がインストールされていればHTTP/2で1接続に複数のリクエストを多重化する
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def history_to_compact_str(records: Sequence[Dict[str, Any]]) -> str:
+    """実行履歴をプロンプト用の区切り文字形式の文字列に圧縮する。
+
+    記録ごとに辞書のキーを繰り返さず、1行目の見出しで列を示す。
+    時刻は先頭の記録からの経過秒数、品質スコアは小数2桁で表す。
+    タスク名には「|」が含まれ得るため最後の列に置く。
+
+    Args:
+        records: 実行記録の辞書のリスト（operator, status, time, quality, taskを参照する）
+
+    Returns:
+        見出し行と記録ごとの行からなる文字列
+    """
+    lines = [COMPACT_HISTORY_HEADER]
+    base_time = None
+    for record in records:
+        if not isinstance(record, dict):
+            lines.append(f"-|unknown|-|-|{str(record)[:100]}")
+            continue
+        timestamp = record.get("time")
+        if isinstance(timestamp, (int, float)):
+            if base_time is None:
+                base_time = timestamp
+            dt = f"{timestamp - base_time:.0f}"
+        else:
+            dt = "-"
+        quality = record.get("quality")
+        qual = f"{quality:.2f}" if isinstance(quality, (int, float)) else "-"
+        task = " ".join(str(record.get("task", "")).split())[:100]
+        lines.append(
+            f"{record.get('operator') or '-'}|{record.get('status', 'unknown')}|{dt}|{qual}|{task}"
+        )
+    return "\n".join(lines)
+
 
 class LLMClient:
     """LLMクライアント。"""
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gpt-4",
+        cache: Optional[Cache] = None,
+        semantic_threshold: Optional[float] = None,
+        semantic_max_entries: int = 1000
+    ):
         """初期化。
 
         Args:
             api_key: OpenAI APIキー（Noneの場合は環境変数から取得）
             model: 使用するモデル名
+            cache: 応答キャッシュ（L1を有効にしたCacheを推奨）
+            semantic_threshold: セマンティックキャッシュの類似度閾値（Noneで無効）
+            semantic_max_entries: セマンティックキャッシュに保持する最大エントリ数
         """
         self.model = model
         if api_key:
             os.environ["OPENAI_API_KEY"] = api_key
-        self.client = OpenAI()
+        # 接続はクライアントの寿命の間使い回し、呼び出しごとのTCP/TLSハンドシェイクを避ける
+        self._http_client = httpx.Client(
+            http2=HTTP2_AVAILABLE, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT
+        )
+        self.client = OpenAI(http_client=self._http_client)
+        self._async_client: Optional[AsyncOpenAI] = None
+        self._prefix_hashes: Dict[str, str] = {}
+        self.cache = cache
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # 呼び出しの種類ごとのキャッシュのヒット・ミス数
+        self.cache_stats_by_policy: Dict[str, Dict[str, int]] = {}
+
+        self.semantic_cache: Optional[SemanticCache] = None
+        if semantic_threshold is not None:
+            self.semantic_cache = SemanticCache(
+                embedding_fn=self.embed,
+                cache=cache,
+                threshold=semantic_threshold,
+                max_entries=semantic_max_entries,
+                namespace=f"semantic:{model}",
+                ttl=RESPONSE_CACHE_TTL
+            )
+
+    def embed(self, text: str) -> List[float]:
+        """テキストの埋め込みベクトルを取得する。
+
+        Args:
+            text: テキスト
+
+        Returns:
+            埋め込みベクトル
+        """
+        response = self.client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+        return response.data[0].embedding
+
+    def _create_completion(
+        self,
+        messages: List[ChatCompletionMessageParam],
+        cache_policy: Optional[str] = None,
+        **params: Any
+    ) -> ChatCompletion:
+        """キャッシュを参照してからチャット補完APIを呼び出す。
+
+        完全一致のキャッシュ（L1/L2）にミスした場合は、セマンティックキャッシュで
+        近似一致するプロンプトの応答を探す。
+
+        Args:
+            messages: メッセージリスト
+            cache_policy: 呼び出しの種類（CACHE_POLICYで有効期限を決める）
+            **params: APIに渡す追加パラメータ
+
+        Returns:
+            ChatCompletion
+        """
+        ttl = CACHE_POLICY.get(cache_policy, RESPONSE_CACHE_TTL)
+        if ttl == 0 or (not self.cache and not self.semantic_cache):
+            return self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                **params
+            )
+
+        cache_key = None
+        if self.cache:
+            cache_key = self._completion_cache_key(messages, params)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._count_cache_result(cache_policy, hit=True)
+                return ChatCompletion.model_validate(cached)
+
+        prompt_text, embedding, cached = self._semantic_lookup(messages, params)
+        if cached is not None:
+            self._count_cache_result(cache_policy, hit=True)
+            return ChatCompletion.model_validate(cached)
+
+        self._count_cache_result(cache_policy, hit=False)
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            **params
+        )
+        self._store_completion(cache_key, prompt_text, embedding, response, ttl, params)
+        return response
+
+    def _count_cache_result(self, cache_policy: Optional[str], hit: bool) -> None:
+        """キャッシュのヒット・ミスを全体と呼び出しの種類ごとに数える。"""
+        policy = cache_policy or "default"
+        stats = self.cache_stats_by_policy.get(policy)
+        if stats is None:
+            stats = self.cache_stats_by_policy[policy] = {"hits": 0, "misses": 0}
+        if hit:
+            self.cache_hits += 1
+            stats["hits"] += 1
+        else:
+            self.cache_misses += 1
+            stats["misses"] += 1
+        logger.debug(
+            "応答キャッシュ%s: %s (ヒット%d件/ミス%d件)",
+            "ヒット" if hit else "ミス", policy, stats["hits"], stats["misses"]
+        )
+
+    def _semantic_scope(self, params: Dict[str, Any]) -> str:
+        """セマンティックキャッシュの検索範囲を、モデルとパラメータの組み合わせで決める。
+
+        temperatureやmax_tokensなどが異なる呼び出しの応答を取り違えないよう、
+        同じ組み合わせで保存したエントリだけを近似一致の対象にする。
+        """
+        return hashlib.sha256(canonical_dumps({"model": self.model, "params": params})).hexdigest()
+
+    def _semantic_lookup(
+        self,
+        messages: List[ChatCompletionMessageParam],
+        params: Dict[str, Any]
+    ) -> Tuple[Optional[str], Optional[np.ndarray], Optional[Any]]:
+        """セマンティックキャッシュで近似一致するプロンプトの応答を探す。
+
+        Args:
+            messages: メッセージリスト
+            params: APIに渡す追加パラメータ
+
+        Returns:
+            プロンプトのテキスト、埋め込み、キャッシュされた応答
+            （セマンティックキャッシュが無効、または失敗した場合は該当する値がNone）
+        """
+        if not self.semantic_cache:
+            return None, None, None
+        prompt_text = "\n".join(str(message["content"]) for message in messages)
+        try:
+            embedding = self.semantic_cache.embed(prompt_text)
+            cached = self.semantic_cache.lookup(
+                prompt_text, embedding, scope=self._semantic_scope(params)
+            )
+            return prompt_text, embedding, cached
+        except Exception as e:
+            logger.warning(f"セマンティックキャッシュの検索に失敗: {str(e)}")
+            return prompt_text, None, None
+
+    def _store_completion(
+        self,
+        cache_key: Optional[str],
+        prompt_text: Optional[str],
+        embedding: Optional[np.ndarray],
+        response: ChatCompletion,
+        ttl: int = RESPONSE_CACHE_TTL,
+        params: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """応答を完全一致キャッシュとセマンティックキャッシュに保存する。
+
+        セマンティックキャッシュにも呼び出しの種類ごとの有効期限を適用する。
+        """
+        if not cache_key and embedding is None:
+            return
+        data = response.model_dump(mode="json")
+        if cache_key:
+            self.cache.set(cache_key, data, ttl=ttl)
+        if self.semantic_cache and embedding is not None:
+            self.semantic_cache.add(
+                prompt_text, data, embedding, ttl=ttl, scope=self._semantic_scope(params or {})
+            )
+
+    def register_prompt_prefix(self, prompt: str) -> str:
+        """システムプロンプトを登録し、そのハッシュを取得する。
+
+        同じシステムプロンプトを共有する呼び出しは、キャッシュキーの
+        プレフィックスも共有する。
+
+        Args:
+            prompt: システムプロンプト
+
+        Returns:
+            プロンプトのハッシュ（16進数）
+        """
+        prefix_hash = self._prefix_hashes.get(prompt)
+        if prefix_hash is None:
+            prefix_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+            self._prefix_hashes[prompt] = prefix_hash
+        return prefix_hash
+
+    def _completion_cache_key(
+        self,
+        messages: List[ChatCompletionMessageParam],
+        params: Dict[str, Any]
+    ) -> str:
+        """チャット補完の完全一致キャッシュのキーを生成する。
+
+        先頭のシステムプロンプトは登録済みのハッシュを再利用し、
+        残りのメッセージとパラメータのみをハッシュする。
+        """
+        prefix_hash = "-"
+        if messages and messages[0]["role"] == "system" and isinstance(messages[0]["content"], str):
+            prefix_hash = self.register_prompt_prefix(messages[0]["content"])
+            messages = messages[1:]
+
+        body_hash = hashlib.sha256(canonical_dumps(
+            {"model": self.model, "messages": messages, "params": params}
+        )).hexdigest()
+        return f"llm:{prefix_hash}:{body_hash}"
+
+    async def acomplete(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> ChatCompletion:
+        """チャット補完を非同期に実行する。
+
+        Args:
+            messages: メッセージリスト
+            temperature: 温度パラメータ
+            max_tokens: 最大トークン数
+
+        Returns:
+            ChatCompletion
+        """
+        try:
+            return await self.acall(messages, temperature=temperature, max_tokens=max_tokens)
+        except Exception as e:
+            logger.error(f"非同期チャット補完の実行中にエラーが発生: {str(e)}")
+            raise
+
+    async def acall(
+        self,
+        messages: List[ChatCompletionMessageParam],
+        cache_policy: Optional[str] = None,
+        **params: Any
+    ) -> ChatCompletion:
+        """キャッシュを参照してからチャット補完APIを非同期に呼び出す。
+
+        イベントループをブロックしないため、複数の呼び出しをasyncio.gatherで
+        同時に発行できる。完全一致とセマンティックのキャッシュは_create_completionと
+        共有し、埋め込みの取得はワーカースレッドで行う。
+
+        Args:
+            messages: メッセージリスト
+            cache_policy: 呼び出しの種類（CACHE_POLICYで有効期限を決める）
+            **params: APIに渡す追加パラメータ
+
+        Returns:
+            ChatCompletion
+        """
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(
+                http_client=httpx.AsyncClient(
+                    http2=HTTP2_AVAILABLE, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT
+                )
+            )
+
+        ttl = CACHE_POLICY.get(cache_policy, RESPONSE_CACHE_TTL)
+        if ttl == 0:
+            return await self._async_client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                **params
+            )
+
+        cache_key = None
+        if self.cache:
+            cache_key = self._completion_cache_key(messages, params)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._count_cache_result(cache_policy, hit=True)
+                return ChatCompletion.model_validate(cached)
+
+        prompt_text, embedding, cached = None, None, None
+        if self.semantic_cache:
+            prompt_text, embedding, cached = await asyncio.to_thread(
+                self._semantic_lookup, messages, params
+            )
+        if cached is not None:
+            self._count_cache_result(cache_policy, hit=True)
+            return ChatCompletion.model_validate(cached)
+
+        self._count_cache_result(cache_policy, hit=False)
+        response = await self._async_client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            **params
+        )
+        self._store_completion(cache_key, prompt_text, embedding, response, ttl, params)
+        return response
+
+    def close(self) -> None:
+        """HTTP接続を閉じる。"""
+        self.client.close()
+
+    async def aclose(self) -> None:
+        """非同期クライアントを含むHTTP接続を閉じる。"""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+        self.close()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """応答キャッシュのヒット・ミス数（全体と呼び出しの種類ごと）を取得する。"""
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "by_policy": {policy: dict(stats) for policy, stats in self.cache_stats_by_policy.items()},
+        }
 
     def chat_completion(
         self,
@@ -66,9 +504,8 @@ class LLMClient:
                     )
 
             # APIリクエストを実行
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=formatted_messages,
+            response = self._create_completion(
+                formatted_messages,
                 temperature=temperature,
                 max_tokens=max_tokens if max_tokens is not None else None
             )
@@ -137,6 +574,32 @@ class LLMClient:
             )
         ]
 
+    def _create_layered_messages(
+        self,
+        system_content: str,
+        stable_content: str,
+        volatile_content: str
+    ) -> List[ChatCompletionMessageParam]:
+        """変化しにくい順に並べたメッセージリストを作成する。
+
+        固定の指示（システム）、実行中はほぼ変わらない情報、呼び出しごとに
+        変わる情報の順に並べることで、先頭部分がバイト単位で一致し、
+        プロバイダ側のプレフィックスキャッシュが効く。
+
+        Args:
+            system_content: 固定のシステムメッセージ
+            stable_content: 実行中はほぼ変わらない情報
+            volatile_content: 呼び出しごとに変わる情報
+
+        Returns:
+            メッセージリスト
+        """
+        return [
+            ChatCompletionSystemMessageParam(role="system", content=system_content),
+            ChatCompletionUserMessageParam(role="user", content=stable_content),
+            ChatCompletionUserMessageParam(role="user", content=volatile_content)
+        ]
+
     def generate_strategy(self, prompt: Dict[str, Any]) -> Dict[str, Any]:
         """生成戦略を生成する。
 
@@ -146,22 +609,21 @@ class LLMClient:
         Returns:
             生成された戦略
         """
-        messages = self._create_messages(
-            system_content="あなたはオペレーター生成戦略の専門家です。",
-            user_content=f"""
-            以下の情報に基づいて、最適な生成戦略を提案してください：
-
-            タスク: {prompt['task']}
-            コンテキスト: {prompt['context']}
-            既知の戦略: {prompt['known_strategies']}
-            実行履歴: {prompt['history']}
-            """
+        messages = self._create_layered_messages(
+            system_content=STRATEGY_SYSTEM_PROMPT,
+            stable_content=(
+                f"既知の戦略: {prompt['known_strategies']}\n"
+                f"メタ知識: {prompt.get('meta_knowledge', {})}"
+            ),
+            volatile_content=(
+                f"タスク: {prompt['task']}\n"
+                f"コンテキスト: {prompt['context']}\n"
+                f"有力な戦略: {prompt.get('best_strategies', [])}\n"
+                f"実行履歴: {prompt['history']}"
+            )
         )
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages
-        )
+        response = self._create_completion(messages)
 
         strategy_text = response.choices[0].message.content
         if not strategy_text:
@@ -186,22 +648,17 @@ class LLMClient:
         Returns:
             生成されたコード
         """
-        messages = self._create_messages(
-            system_content="あなたはPythonオペレーターの生成の専門家です。",
-            user_content=f"""
-            以下の情報に基づいて、オペレーターコードを生成してください：
-
-            タスク: {prompt['task']}
-            コンテキスト: {prompt['context']}
-            戦略: {prompt['strategy']}
-            既知のオペレーター: {prompt['known_operators']}
-            """
+        messages = self._create_layered_messages(
+            system_content=OPERATOR_GENERATION_SYSTEM_PROMPT,
+            stable_content=f"既知のオペレーター: {prompt['known_operators']}",
+            volatile_content=(
+                f"タスク: {prompt['task']}\n"
+                f"コンテキスト: {prompt['context']}\n"
+                f"戦略: {prompt['strategy']}"
+            )
         )
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages
-        )
+        response = self._create_completion(messages)
 
         operator_code = response.choices[0].message.content
         if not operator_code:
@@ -228,22 +685,17 @@ class LLMClient:
         Returns:
             進化したコード
         """
-        messages = self._create_messages(
-            system_content="あなたはPythonオペレーターの最適化の専門家です。",
-            user_content=f"""
-            以下の情報に基づいて、オペレーターを改善してください：
-
-            元のコード: {prompt['original_code']}
-            パフォーマンス: {prompt['performance']}
-            改善戦略: {prompt['strategy']}
-            改善フォーカス: {prompt['improvement_focus']}
-            """
+        messages = self._create_layered_messages(
+            system_content=OPERATOR_EVOLUTION_SYSTEM_PROMPT,
+            stable_content=f"元のコード: {prompt['original_code']}",
+            volatile_content=(
+                f"パフォーマンス: {prompt['performance']}\n"
+                f"改善戦略: {prompt['strategy']}\n"
+                f"改善フォーカス: {prompt['improvement_focus']}"
+            )
         )
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages
-        )
+        response = self._create_completion(messages)
 
         evolved_code = response.choices[0].message.content
         if not evolved_code:
@@ -270,21 +722,16 @@ class LLMClient:
         Returns:
             分析結果
         """
-        messages = self._create_messages(
-            system_content="あなたはタスク分析の専門家です。",
-            user_content=f"""
-            以下のタスクを分析し、必要なオペレータータイプとパラメータを特定してください：
-
-            タスク: {prompt.get('description', '')}
-            コンテキスト: {prompt.get('context', '')}
-            生成戦略: {prompt.get('generation_strategy', '')}
-            """
+        messages = self._create_layered_messages(
+            system_content=ANALYSIS_SYSTEM_PROMPT,
+            stable_content=f"生成戦略: {prompt.get('generation_strategy', '')}",
+            volatile_content=(
+                f"タスク: {prompt.get('description', '')}\n"
+                f"コンテキスト: {prompt.get('context', '')}"
+            )
         )
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages
-        )
+        response = self._create_completion(messages, cache_policy="analyze_task")
 
         analysis_text = response.choices[0].message.content
         if not analysis_text:
@@ -300,6 +747,68 @@ class LLMClient:
             }
         }
 
+    def analyze_tasks_batch(self, prompt: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """複数のタスクをまとめて分析する。
+
+        タスクは説明の長さ順に並べてANALYSIS_BATCH_SIZE件ずつ1つのプロンプトに
+        まとめ、システムプロンプトと生成戦略を共有する。応答に含まれなかった
+        タスクにはanalyze_taskと同じ既定の分析結果を返す。
+
+        Args:
+            prompt: プロンプト（descriptionsにタスクの説明のリストを指定する）
+
+        Returns:
+            タスクと同じ順序の分析結果のリスト
+        """
+        descriptions = prompt.get("descriptions", [])
+        analyses: List[Optional[Dict[str, Any]]] = [None] * len(descriptions)
+        order = sorted(range(len(descriptions)), key=lambda i: len(descriptions[i]))
+
+        for start in range(0, len(order), ANALYSIS_BATCH_SIZE):
+            batch = order[start:start + ANALYSIS_BATCH_SIZE]
+            messages = self._create_layered_messages(
+                system_content=ANALYSIS_BATCH_SYSTEM_PROMPT,
+                stable_content=f"生成戦略: {prompt.get('generation_strategy', '')}",
+                volatile_content=(
+                    "タスク:\n"
+                    + "\n".join(f"{n}. {descriptions[i]}" for n, i in enumerate(batch))
+                    + f"\nコンテキスト: {prompt.get('context', '')}"
+                )
+            )
+            items = self.parse_json_response(
+                self._create_completion(messages, cache_policy="analyze_task")
+            )
+            if not isinstance(items, list):
+                items = []
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+                n = item.get("index")
+                if not isinstance(n, int) or not 0 <= n < len(batch):
+                    continue
+                analyses[batch[n]] = {
+                    "required_operator_type": item.get(
+                        "required_operator_type", "DataAnalysisOperator"
+                    ),
+                    "required_params": {
+                        "description": item.get("description", ""),
+                        "priority": 1.0,
+                        "estimated_complexity": 0.5
+                    }
+                }
+
+        return [
+            analysis or {
+                "required_operator_type": "DataAnalysisOperator",
+                "required_params": {
+                    "description": "デフォルトの分析結果を使用します。",
+                    "priority": 1.0,
+                    "estimated_complexity": 0.5
+                }
+            }
+            for analysis in analyses
+        ]
+
     def generate_tasks(self, prompt: Dict[str, Any]) -> Dict[str, Any]:
         """新しいタスクを生成する。
 
@@ -309,25 +818,32 @@ class LLMClient:
         Returns:
             生成されたタスク
         """
-        # コンテキストを要約して短くする
-        execution_history_summary = []
-        if "execution_history" in prompt:
-            # 直近の5つの実行履歴のみを使用
-            history = prompt["execution_history"][-5:] if isinstance(prompt["execution_history"], list) else []
-            for item in history:
-                task_name = ""
-                if isinstance(item, dict):
-                    task_name = str(item.get("task", ""))
-                elif isinstance(item, str):
-                    task_name = str(item)
-                
-                if len(task_name) > 100:
-                    task_name = task_name[:100]
-                
-                execution_history_summary.append({
-                    "task": task_name,
-                    "status": item.get("status", "unknown") if isinstance(item, dict) else "unknown"
-                })
+        response = self._create_completion(
+            self._task_generation_messages(prompt), cache_policy="generate_tasks"
+        )
+        return self._parse_generated_tasks(response)
+
+    async def agenerate_tasks(self, prompt: Dict[str, Any]) -> Dict[str, Any]:
+        """新しいタスクを非同期に生成する。
+
+        Args:
+            prompt: プロンプト
+
+        Returns:
+            生成されたタスク
+        """
+        response = await self.acall(
+            self._task_generation_messages(prompt), cache_policy="generate_tasks"
+        )
+        return self._parse_generated_tasks(response)
+
+    def _task_generation_messages(self, prompt: Dict[str, Any]) -> List[ChatCompletionMessageParam]:
+        """タスク生成のメッセージを作成する。"""
+        # 直近5件の実行履歴のみを圧縮して使用
+        history = prompt.get("execution_history")
+        execution_history_summary = history_to_compact_str(
+            history[-5:] if isinstance(history, list) else []
+        )
 
         current_state_summary = {
             "total_tasks": prompt.get("current_state", {}).get("total_tasks", 0),
@@ -339,23 +855,21 @@ class LLMClient:
         if len(context_str) > 200:
             context_str = context_str[:200]
 
-        messages = self._create_messages(
-            system_content="あなたはタスク生成の専門家です。",
-            user_content=f"""
-            以下の情報に基づいて、新しいタスクを生成してください：
-
-            目的: {prompt.get('objective', '')}
-            コンテキスト: {context_str}
-            直近の実行履歴: {execution_history_summary}
-            現在の状態: {current_state_summary}
-            """
-        )
-
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages
+        return self._create_layered_messages(
+            system_content=TASK_GENERATION_SYSTEM_PROMPT,
+            stable_content=(
+                f"目的: {prompt.get('objective', '')}\n"
+                f"これまでの実行履歴の要約: {prompt.get('history_summary', '')}"
+            ),
+            volatile_content=(
+                f"コンテキスト: {context_str}\n"
+                f"直近の実行履歴:\n{execution_history_summary}\n"
+                f"現在の状態: {current_state_summary}"
+            )
         )
 
+    def _parse_generated_tasks(self, response: ChatCompletion) -> Dict[str, Any]:
+        """タスク生成の応答を解析する。"""
         task_text = response.choices[0].message.content
         if not task_text:
             task_text = "デフォルトのタスクを生成します。"
@@ -380,6 +894,36 @@ class LLMClient:
         Returns:
             優先順位付けの結果
         """
+        response = self._create_completion(
+            self._prioritization_messages(context),
+            cache_policy="prioritize_tasks",
+            max_tokens=self._priority_max_tokens(context)
+        )
+        return self._parse_priorities(response, context)
+
+    async def aprioritize_tasks(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """タスクの優先順位付けを非同期に行う。
+
+        Args:
+            context: コンテキスト
+
+        Returns:
+            優先順位付けの結果
+        """
+        response = await self.acall(
+            self._prioritization_messages(context),
+            cache_policy="prioritize_tasks",
+            max_tokens=self._priority_max_tokens(context)
+        )
+        return self._parse_priorities(response, context)
+
+    @staticmethod
+    def _priority_max_tokens(context: Dict[str, Any]) -> int:
+        """優先順位付けの応答に必要な最大トークン数（タスク数に比例）を求める。"""
+        return max(1, len(context.get("current_tasks", []))) * PRIORITY_TOKENS_PER_TASK
+
+    def _prioritization_messages(self, context: Dict[str, Any]) -> List[ChatCompletionMessageParam]:
+        """優先順位付けのメッセージを作成する。"""
         # コンテキストを要約して短くする
         current_tasks_summary = [
             {
@@ -399,22 +943,17 @@ class LLMClient:
                 task_str = str(task.get("task_name", "")) if task.get("task_name") else str(task)
                 completed_tasks_summary.append(task_str[:100])
 
-        messages = self._create_messages(
-            system_content="あなたはタスクの優先順位付けの専門家です。",
-            user_content=f"""
-            以下の情報に基づいて、タスクの優先順位を決定してください：
-
-            目的: {context.get('objective', '')}
-            現在のタスク: {current_tasks_summary}
-            直近の完了タスク: {completed_tasks_summary}
-            """
-        )
-
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages
+        return self._create_layered_messages(
+            system_content=PRIORITIZATION_SYSTEM_PROMPT,
+            stable_content=f"目的: {context.get('objective', '')}",
+            volatile_content=(
+                f"現在のタスク: {current_tasks_summary}\n"
+                f"直近の完了タスク: {completed_tasks_summary}"
+            )
         )
 
+    def _parse_priorities(self, response: ChatCompletion, context: Dict[str, Any]) -> Dict[str, Any]:
+        """優先順位付けの応答を解析する。"""
         priority_text = response.choices[0].message.content
         if not priority_text:
             # デフォルトの優先順位を返す
@@ -432,6 +971,95 @@ class LLMClient:
             ]
         }
 
+    def plan_iteration(self, prompt: Dict[str, Any]) -> Dict[str, Any]:
+        """現在のタスクの優先順位付けと新しいタスクの生成を1回の呼び出しで行う。
+
+        タスク生成と同じ目的・履歴の要約をプロンプトの先頭で共有し、
+        2回の往復を1回にまとめる。
+
+        Args:
+            prompt: タスク生成のプロンプト（current_tasksに現在のタスクを指定する）
+
+        Returns:
+            priorities（優先順位付けの結果）とtasks（生成されたタスク）
+        """
+        response = self._create_completion(
+            self._planning_messages(prompt), cache_policy="plan_iteration"
+        )
+        return self._parse_plan(response)
+
+    async def aplan_iteration(self, prompt: Dict[str, Any]) -> Dict[str, Any]:
+        """現在のタスクの優先順位付けと新しいタスクの生成を非同期に行う。
+
+        Args:
+            prompt: タスク生成のプロンプト（current_tasksに現在のタスクを指定する）
+
+        Returns:
+            priorities（優先順位付けの結果）とtasks（生成されたタスク）
+        """
+        response = await self.acall(
+            self._planning_messages(prompt), cache_policy="plan_iteration"
+        )
+        return self._parse_plan(response)
+
+    def _planning_messages(self, prompt: Dict[str, Any]) -> List[ChatCompletionMessageParam]:
+        """優先順位付けとタスク生成をまとめたメッセージを作成する。"""
+        history = prompt.get("execution_history")
+        current_tasks_summary = [
+            {"id": task.get("id", "unknown"), "description": str(task.get("description", ""))[:100]}
+            for task in prompt.get("current_tasks", [])
+        ]
+        context_str = str(prompt.get("context", ""))[:200]
+
+        return self._create_layered_messages(
+            system_content=PLANNING_SYSTEM_PROMPT,
+            stable_content=(
+                f"目的: {prompt.get('objective', '')}\n"
+                f"これまでの実行履歴の要約: {prompt.get('history_summary', '')}"
+            ),
+            volatile_content=(
+                f"コンテキスト: {context_str}\n"
+                f"直近の実行履歴:\n{history_to_compact_str(history[-5:] if isinstance(history, list) else [])}\n"
+                f"現在の状態: {prompt.get('current_state', {})}\n"
+                f"現在のタスク: {current_tasks_summary}"
+            )
+        )
+
+    def _parse_plan(self, response: ChatCompletion) -> Dict[str, Any]:
+        """優先順位付けとタスク生成をまとめた応答を解析する。
+
+        JSONとして読めない場合は、タスク生成と同様に応答の本文を1件のタスクとし、
+        現在のタスクの優先度は変更しない。
+        """
+        content = response.choices[0].message.content or ""
+        start_idx = content.find("{")
+        end_idx = content.rfind("}")
+        plan: Any = None
+        if start_idx != -1 and end_idx > start_idx:
+            try:
+                plan = json.loads(content[start_idx:end_idx + 1])
+            except json.JSONDecodeError as e:
+                logger.warning(f"計画のJSONのパースに失敗: {str(e)}")
+        if not isinstance(plan, dict):
+            return {"priorities": [], **self._parse_generated_tasks(response)}
+
+        priorities = [
+            {"task_id": item["task_id"], "priority": float(item.get("priority", 1.0))}
+            for item in plan.get("priorities", [])
+            if isinstance(item, dict) and "task_id" in item
+        ]
+        new_tasks = [
+            {
+                "description": str(item["description"]),
+                "operator_type": item.get("operator_type", "DataAnalysisOperator"),
+                "priority": float(item.get("priority", 1.0)),
+                "params": item.get("params") or {}
+            }
+            for item in plan.get("new_tasks", [])
+            if isinstance(item, dict) and item.get("description")
+        ]
+        return {"priorities": priorities, "tasks": new_tasks}
+
     def evaluate_objective_completion(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """目的の達成状況を評価する。
 
@@ -441,20 +1069,22 @@ class LLMClient:
         Returns:
             評価結果
         """
-        messages = self._create_messages(
-            system_content="あなたは目的達成の評価の専門家です。",
-            user_content=f"""
-            以下の情報に基づいて、目的の達成状況を評価してください：
-
-            目的: {context['objective']}
-            実行履歴: {context['execution_history']}
-            パフォーマンス指標: {context['performance_metrics']}
-            """
+        messages = self._create_layered_messages(
+            system_content=EVALUATION_SYSTEM_PROMPT,
+            stable_content=(
+                f"目的: {context['objective']}\n"
+                f"これまでの実行履歴の要約: {context.get('history_summary', '')}"
+            ),
+            volatile_content=(
+                f"直近の実行履歴:\n{history_to_compact_str(context['execution_history'])}\n"
+                f"パフォーマンス指標: {context['performance_metrics']}"
+            )
         )
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages
+        response = self._create_completion(
+            messages,
+            cache_policy="evaluate_objective_completion",
+            max_tokens=EVALUATION_MAX_TOKENS
         )
 
         evaluation_text = response.choices[0].message.content
@@ -465,4 +1095,230 @@ class LLMClient:
             "is_achieved": False,  # デフォルトではFalse
             "completion_rate": 0.0,
             "analysis": evaluation_text
-        } 
\ No newline at end of file
+        }
+
+    def summarize_history(self, summary: str, records: List[Dict[str, Any]]) -> str:
+        """これまでの要約に新しい実行記録を畳み込む。
+
+        Args:
+            summary: これまでの要約
+            records: 要約に加える実行記録
+
+        Returns:
+            更新された要約
+        """
+        messages = self._create_layered_messages(
+            system_content=SUMMARY_SYSTEM_PROMPT,
+            stable_content=f"これまでの要約: {summary}",
+            volatile_content=f"新しい実行記録:\n{history_to_compact_str(records)}"
+        )
+
+        response = self._create_completion(
+            messages,
+            temperature=0.0,
+            max_tokens=HISTORY_SUMMARY_MAX_TOKENS
+        )
+        return response.choices[0].message.content or summary
+
+
+class BatchLLMClient:
+    """複数のLLM呼び出しをまとめて処理するクライアント。
+
+    OpenAIのBatch APIが利用可能な場合はJSONLをアップロードして一括処理し、
+    利用できない場合はセマフォで同時実行数を制限した並行呼び出しにフォールバックする。
+    """
+
+    _TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        max_concurrency: int = 10,
+        use_batch_api: bool = False,
+        poll_interval: float = 5.0,
+        completion_window: str = "24h",
+    ):
+        """初期化。
+
+        Args:
+            llm_client: ラップするLLMクライアント
+            max_concurrency: 並行呼び出し時の最大同時実行数
+            use_batch_api: OpenAIのBatch APIを使用するかどうか
+            poll_interval: Batch APIのステータス確認間隔（秒）
+            completion_window: Batch APIの完了期限
+        """
+        self.llm_client = llm_client
+        self.max_concurrency = max_concurrency
+        self.use_batch_api = use_batch_api
+        self.poll_interval = poll_interval
+        self.completion_window = completion_window
+
+    def batch_complete(
+        self,
+        prompts: Sequence[List[Dict[str, str]]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> List[Optional[str]]:
+        """複数のプロンプトをまとめて補完する。
+
+        Args:
+            prompts: メッセージリストのリスト
+            temperature: 温度パラメータ
+            max_tokens: 最大トークン数
+
+        Returns:
+            各プロンプトに対応する応答テキスト（失敗した場合はNone）
+        """
+        if not prompts:
+            return []
+
+        if self.use_batch_api:
+            try:
+                return self._complete_with_batch_api(prompts, temperature, max_tokens)
+            except Exception as e:
+                logger.warning(f"Batch APIが利用できないため並行呼び出しにフォールバック: {str(e)}")
+
+        def complete(messages: List[Dict[str, str]]) -> Optional[str]:
+            response = self.llm_client.chat_completion(
+                messages,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            return response.choices[0].message.content
+
+        results = self.map(complete, prompts, return_exceptions=True)
+        contents: List[Optional[str]] = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"バッチ内の補完に失敗: {str(result)}")
+                contents.append(None)
+            else:
+                contents.append(result)
+        return contents
+
+    def map(
+        self,
+        func: Callable[[T], R],
+        items: Sequence[T],
+        return_exceptions: bool = False
+    ) -> List[Union[R, Exception]]:
+        """関数を各要素に並行適用する。
+
+        イベントループの実行中（非同期のコードから呼ばれた場合）はasyncio.runを
+        使えないため、max_concurrency個のスレッドで実行する。
+
+        Args:
+            func: 適用する関数（LLM呼び出しを含む同期関数）
+            items: 入力のリスト
+            return_exceptions: 例外を送出せず結果として返すかどうか
+
+        Returns:
+            入力と同じ順序の結果リスト
+        """
+        if not items:
+            return []
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._gather(func, items, return_exceptions))
+        return self._map_in_threads(func, items, return_exceptions)
+
+    def _map_in_threads(
+        self,
+        func: Callable[[T], R],
+        items: Sequence[T],
+        return_exceptions: bool
+    ) -> List[Union[R, Exception]]:
+        """スレッドプールで関数を並行実行する。"""
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_concurrency, len(items)), thread_name_prefix="llm-batch"
+        ) as executor:
+            futures = [executor.submit(func, item) for item in items]
+            results: List[Union[R, Exception]] = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    results.append(e)
+            return results
+
+    async def _gather(
+        self,
+        func: Callable[[T], R],
+        items: Sequence[T],
+        return_exceptions: bool
+    ) -> List[Union[R, Exception]]:
+        """セマフォで同時実行数を制限しながら関数を並行実行する。"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(item: T) -> R:
+            async with semaphore:
+                return await asyncio.to_thread(func, item)
+
+        return await asyncio.gather(
+            *(run(item) for item in items),
+            return_exceptions=return_exceptions
+        )
+
+    def _complete_with_batch_api(
+        self,
+        prompts: Sequence[List[Dict[str, str]]],
+        temperature: float,
+        max_tokens: Optional[int]
+    ) -> List[Optional[str]]:
+        """OpenAIのBatch APIを使用して補完する。
+
+        Raises:
+            RuntimeError: バッチ処理が完了しなかった場合
+        """
+        client = self.llm_client.client
+        lines = []
+        for i, messages in enumerate(prompts):
+            body: Dict[str, Any] = {
+                "model": self.llm_client.model,
+                "messages": messages,
+                "temperature": temperature
+            }
+            if max_tokens is not None:
+                body["max_tokens"] = max_tokens
+            lines.append(json.dumps({
+                "custom_id": f"request-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body
+            }, ensure_ascii=False))
+
+        batch_file = client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window=self.completion_window
+        )
+        logger.info(f"バッチを送信しました: ID={batch.id}, リクエスト数={len(prompts)}")
+
+        while batch.status not in self._TERMINAL_STATUSES:
+            time.sleep(self.poll_interval)
+            batch = client.batches.retrieve(batch.id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"バッチ処理が完了しませんでした: status={batch.status}")
+
+        results: List[Optional[str]] = [None] * len(prompts)
+        output = client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            index = int(record["custom_id"].rsplit("-", 1)[1])
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                logger.error(f"バッチ内のリクエストが失敗: {record.get('error')}")
+                continue
+            results[index] = response["body"]["choices"][0]["message"]["content"]
+
+        return results
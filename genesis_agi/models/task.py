@@ -9,6 +9,9 @@ class TaskMetadata(BaseModel):
     task_type: str
     params: Dict[str, Any] = Field(default_factory=dict)
     context: Dict[str, Any] = Field(default_factory=dict)
+    # 作成時のコンテキストの版数（内容はUnifiedManager.context_snapshotで参照する）
+    context_version: Optional[int] = None
+    depends_on: List[str] = Field(default_factory=list)
 
 
 class Task(BaseModel):
@@ -53,6 +56,7 @@ class ExecutionRecord(BaseModel):
     task: Task
     result: Dict[str, Any]
     operator: Optional[str] = None
+    operator_code: Optional[int] = None
     meta_data: Optional[Dict[str, Any]] = None
     timestamp: datetime = Field(default_factory=datetime.now)
 
@@ -1,11 +1,75 @@
 """基本オペレータークラス。"""
-from typing import Any, Dict, List
+import sys
+from typing import Any, Dict, List, Type
 from abc import ABC, abstractmethod
 
+# オペレーター名と整数コードの対応表（コードは登録順の連番）
+OPERATOR_CODES: Dict[str, int] = {}
+OPERATOR_NAMES: List[str] = []
+
+
+def operator_code(name: str) -> int:
+    """オペレーター名に対応する整数コードを取得する。
+
+    未登録の名前には新しいコードを割り当てる。
+
+    Args:
+        name: オペレーター名
+
+    Returns:
+        オペレーターコード（OPERATOR_NAMESの添字）
+    """
+    code = OPERATOR_CODES.get(name)
+    if code is None:
+        name = sys.intern(name)
+        code = OPERATOR_CODES.setdefault(name, len(OPERATOR_NAMES))
+        if code == len(OPERATOR_NAMES):
+            OPERATOR_NAMES.append(name)
+    return code
+
+
+def extract_class_state(cls: Type[Any]) -> Dict[str, Any]:
+    """クラスの公開属性とメソッド名を抽出する。
+
+    Args:
+        cls: 対象のクラス
+
+    Returns:
+        クラスの状態
+    """
+    members = vars(cls)
+    return {
+        "name": cls.__name__,
+        "attributes": {
+            name: value for name, value in members.items()
+            if not name.startswith("_") and not callable(value)
+        },
+        "methods": sorted(
+            name for name, value in members.items()
+            if callable(value) and not name.startswith("_")
+        )
+    }
+
 
 class BaseOperator(ABC):
     """全てのオペレーターの基底クラス。"""
 
+    @classmethod
+    def cached_state(cls) -> Dict[str, Any]:
+        """クラスの状態を取得する。
+
+        クラスの定義は実行中に変わらないため、初回に抽出した結果をクラスに保持して
+        使い回す。返り値は共有されるため変更しないこと。
+
+        Returns:
+            クラスの状態
+        """
+        state = cls.__dict__.get("_state_cache")
+        if state is None:
+            state = extract_class_state(cls)
+            cls._state_cache = state
+        return state
+
     def __init__(self, task_id: str, params: Dict[str, Any] = None):
         """初期化。
 
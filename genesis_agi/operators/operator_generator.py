@@ -62,11 +62,10 @@ class OperatorGenerator:
             logger.debug(f"生成されたオペレータータイプ: {operator_type}")
 
             # 既存のオペレーターをチェック
-            if self.registry.has_operator(operator_type):
-                existing_operator = self.registry.get_operator(operator_type)
-                if existing_operator:
-                    logger.info(f"既存のオペレーターを使用: {operator_type}")
-                    return existing_operator
+            existing_operator = self.registry.get_operator(operator_type)
+            if existing_operator:
+                logger.info(f"既存のオペレーターを使用: {operator_type}")
+                return existing_operator
 
             # オペレーターコードを生成
             operator_code = self._generate_operator_code(
@@ -1,5 +1,5 @@
 """オペレーターの登録と管理を行うレジストリ。"""
-from typing import Dict, Type, Optional, List
+from typing import Dict, Type, Optional, List, Set
 import json
 import inspect
 from sqlalchemy.orm import Session
@@ -22,10 +22,15 @@ class OperatorRegistry:
         """
         self.db_session = db_session
         self._operator_cache: Dict[str, Type[BaseOperator]] = {}
+        # データベースに存在しないことを確認したオペレータータイプ（登録時に取り除く）
+        self._missing: Set[str] = set()
 
-    def has_operator(self, operator_type: str) -> bool:
+    def contains(self, operator_type: str) -> bool:
         """指定されたタイプのオペレーターが存在するかどうかを確認する。
 
+        存在の有無はキャッシュし、同じタイプについて繰り返しデータベースを
+        問い合わせない。
+
         Args:
             operator_type: オペレータータイプ
 
@@ -35,15 +40,31 @@ class OperatorRegistry:
         # キャッシュをチェック
         if operator_type in self._operator_cache:
             return True
+        if operator_type in self._missing:
+            return False
 
         # データベースをチェック
-        operator = self.db_session.query(Operator).filter_by(
+        operator = self.db_session.query(Operator.id).filter_by(
             name=operator_type,
             is_active=True
         ).first()
-
+        if operator is None:
+            self._missing.add(operator_type)
         return operator is not None
 
+    __contains__ = contains
+
+    def has_operator(self, operator_type: str) -> bool:
+        """指定されたタイプのオペレーターが存在するかどうかを確認する。
+
+        Args:
+            operator_type: オペレータータイプ
+
+        Returns:
+            オペレーターが存在する場合はTrue
+        """
+        return self.contains(operator_type)
+
     def register_operator(self, operator_class: Type[BaseOperator], description: Optional[str] = None) -> None:
         """オペレーターを登録する。
 
@@ -81,6 +102,7 @@ class OperatorRegistry:
             
             # キャッシュを更新
             self._operator_cache[operator_type] = operator_class
+            self._missing.discard(operator_type)
             logger.info(f"オペレーター '{operator_type}' を正常に登録しました")
 
         except Exception as e:
@@ -99,8 +121,9 @@ class OperatorRegistry:
             オペレータークラス
         """
         # キャッシュをチェック
-        if operator_type in self._operator_cache:
-            return self._operator_cache[operator_type]
+        operator_class = self._operator_cache.get(operator_type)
+        if operator_class is not None or operator_type in self._missing:
+            return operator_class
 
         # データベースから取得
         operator = self.db_session.query(Operator).filter_by(
@@ -113,6 +136,7 @@ class OperatorRegistry:
             self._operator_cache[operator_type] = operator_class
             return operator_class
 
+        self._missing.add(operator_type)
         return None
 
     def list_operators(self) -> List[Dict]:
@@ -143,8 +167,8 @@ class OperatorRegistry:
         if operator:
             operator.is_active = False
             self.db_session.commit()
-            if operator_type in self._operator_cache:
-                del self._operator_cache[operator_type]
+            self._operator_cache.pop(operator_type, None)
+            self._missing.add(operator_type)
 
     def update_performance_metrics(self, operator_type: str, metrics: Dict) -> None:
         """オペレーターのパフォーマンスメトリクスを更新する。
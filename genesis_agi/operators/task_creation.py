@@ -9,6 +9,12 @@ from genesis_agi.operators import BaseOperator, Task
 class TaskCreationOperator(BaseOperator):
     """タスク生成オペレーター。"""
 
+    SYSTEM_PROMPT = (
+        "あなたはタスク生成アシスタントです。"
+        "与えられた目標とタスク履歴に基づいて、"
+        "次に実行すべきタスクのリストを生成してください。"
+    )
+
     def __init__(self, llm_client: LLMClient):
         """初期化。
 
@@ -35,11 +41,7 @@ class TaskCreationOperator(BaseOperator):
         messages = [
             {
                 "role": "system",
-                "content": (
-                    "あなたはタスク生成アシスタントです。"
-                    "与えられた目標とタスク履歴に基づいて、"
-                    "次に実行すべきタスクのリストを生成してください。"
-                ),
+                "content": self.SYSTEM_PROMPT,
             },
             {
                 "role": "user",
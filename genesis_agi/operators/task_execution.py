@@ -7,6 +7,11 @@ from genesis_agi.operators import BaseOperator, Task
 class TaskExecutionOperator(BaseOperator):
     """タスクを実行するオペレーター。"""
 
+    SYSTEM_PROMPT = (
+        "あなたはタスク実行アシスタントです。"
+        "与えられたタスクを実行し、結果を返してください。"
+    )
+
     def __init__(self, llm_client: LLMClient):
         """初期化。
 
@@ -33,10 +38,7 @@ class TaskExecutionOperator(BaseOperator):
         messages = [
             {
                 "role": "system",
-                "content": (
-                    "あなたはタスク実行アシスタントです。"
-                    "与えられたタスクを実行し、結果を返してください。"
-                ),
+                "content": self.SYSTEM_PROMPT,
             },
             {
                 "role": "user",
@@ -50,7 +50,7 @@ class TaskExecutionOperator:
         """
         try:
             logger.debug(f"タスク実行開始: {task.name}")
-            logger.debug(f"コンテキスト: {context}")
+            logger.debug("コンテキスト: %s", context)
 
             # タスクの実行
             messages = [
@@ -115,15 +115,15 @@ class TaskExecutionOperator:
                 temperature=0.7,
                 seed=42
             )
-            logger.debug(f"LLMからの応答を受信: {response}")
+            logger.debug("LLMからの応答を受信: %s", response)
 
             content = response.choices[0].message.content
             if not content:
                 raise ValueError("LLMからの応答が空です")
             
-            logger.debug(f"応答内容: {content}")
+            logger.debug("応答内容: %s", content)
             result_json = json.loads(content)
-            logger.debug(f"パース済み結果: {result_json}")
+            logger.debug("パース済み結果: %s", result_json)
 
             # メトリクスの初期化と検証
             metrics = result_json.get("metrics", {})
@@ -161,7 +161,7 @@ class TaskExecutionOperator:
                 "recommendations": []
             })
 
-            logger.debug(f"最終結果: {result_json}")
+            logger.debug("最終結果: %s", result_json)
             return result_json
 
         except Exception as e:
@@ -7,6 +7,11 @@ from genesis_agi.operators import BaseOperator, Task
 class TaskPrioritizationOperator(BaseOperator):
     """タスク優先順位付けオペレーター。"""
 
+    SYSTEM_PROMPT = (
+        "あなたはタスク優先順位付けの専門家です。"
+        "与えられたタスクリストの優先順位を決定してください。"
+    )
+
     def __init__(self, llm_client: LLMClient):
         """初期化。
 
@@ -28,16 +33,14 @@ class TaskPrioritizationOperator(BaseOperator):
         # タスクの実行履歴を取得
         task_history = context.get("task_history", [])
         objective = context.get("objective", "タスクの優先順位付け")
+        # 現在のタスク（直列化済みの辞書で渡されることもある）
         current_tasks = context.get("current_tasks", [])
 
         # プロンプトの構築
         messages = [
             {
                 "role": "system",
-                "content": (
-                    "あなたはタスク優先順位付けの専門家です。"
-                    "与えられたタスクリストの優先順位を決定してください。"
-                ),
+                "content": self.SYSTEM_PROMPT,
             },
             {
                 "role": "user",
@@ -45,7 +48,7 @@ class TaskPrioritizationOperator(BaseOperator):
 目標: {objective}
 
 現在のタスク:
-{[task.model_dump() for task in current_tasks]}
+{[task if isinstance(task, dict) else task.model_dump() for task in current_tasks]}
 
 タスク履歴:
 {task_history}
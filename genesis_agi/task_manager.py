@@ -1,12 +1,15 @@
 """タスク管理システム。"""
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 from uuid import uuid4
+import asyncio
+import heapq
+import itertools
 import logging
 import time
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 
-from genesis_agi.llm.client import LLMClient
+from genesis_agi.llm.client import BatchLLMClient, LLMClient
 from genesis_agi.operators import BaseOperator, Task
 from genesis_agi.utils.cache import Cache
 from genesis_agi.models.task_record import TaskRecord
@@ -14,6 +17,9 @@ from genesis_agi.models.task_record import TaskRecord
 # ロガーの設定
 logger = logging.getLogger(__name__)
 
+# 無効な要素がこの倍率を超えて溜まったらタスクのヒープを作り直す
+TASK_HEAP_COMPACT_RATIO = 2
+
 class TaskManager:
     """タスク管理システム。"""
 
@@ -28,6 +34,7 @@ class TaskManager:
         retry_delay: float = 1.0,
         execution_timeout: int = 300,  # 5分
         max_api_calls_per_minute: int = 50,
+        max_concurrency: int = 10,
     ):
         """初期化。
 
@@ -41,6 +48,7 @@ class TaskManager:
             retry_delay: リトライ間の待機時間（秒）
             execution_timeout: タスク実行のタイムアウト時間（秒）
             max_api_calls_per_minute: 1分あたりの最大API呼び出し回数
+            max_concurrency: まとめて実行する際・非同期実行時の最大同時実行数
         """
         logger.info(f"TaskManagerを初期化: 目標「{objective}」")
         self.llm_client = llm_client
@@ -48,8 +56,16 @@ class TaskManager:
         self.cache = cache
         self.objective = objective
         self.operators: Dict[str, BaseOperator] = {}
+        # オペレーターが要求するコンテキストのキー（オペレーターの種類ごとに1回だけ取得する）
+        self._required_context: Dict[str, Tuple[str, ...]] = {}
         self.task_history: List[Dict[str, Any]] = []
-        self.current_tasks: List[Task] = []
+        # 現在のタスクは(-優先度, 投入順, タスク)のヒープで管理する。優先度を変更した
+        # タスクは新しい要素を積み直し、古い要素は取り出した時点で読み捨てる
+        self._task_heap: List[Tuple[float, int, Task]] = []
+        self._task_entries: Dict[str, Tuple[float, int, Task]] = {}
+        self._task_counter = itertools.count()
+        # 未完了タスクの直列化結果（ヒープに積むたびに作り直し、プロンプトと履歴で使い回す）
+        self._task_dumps: Dict[str, Dict[str, Any]] = {}
         self.performance_metrics: Dict[str, Any] = {}
         
         # 実行制御用パラメータ
@@ -58,11 +74,64 @@ class TaskManager:
         self.retry_delay = retry_delay
         self.execution_timeout = execution_timeout
         self.max_api_calls_per_minute = max_api_calls_per_minute
+        self.max_concurrency = max_concurrency
+        self.batch_client = BatchLLMClient(llm_client, max_concurrency=max_concurrency)
+
+        # 非同期実行用（セマフォはイベントループ内で生成する）
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._running_task_ids: Set[str] = set()
         
         # API呼び出し制御用
         self.api_call_history: List[datetime] = []
         self.consecutive_errors = 0
 
+        # オペレーターが要求するコンテキストのキーごとの取得関数
+        self._context_providers: Dict[str, Callable[[], Any]] = {
+            "task_history": lambda: self.task_history,
+            "objective": lambda: self.objective,
+            "task_list": lambda: self.current_tasks,
+            "performance_metrics": lambda: self.performance_metrics,
+        }
+
+    @property
+    def current_tasks(self) -> List[Task]:
+        """未完了のタスク（追加順）。"""
+        return [entry[2] for entry in self._task_entries.values()]
+
+    def _push_task(self, task: Task) -> None:
+        """タスクをヒープに投入する（同じIDの既存の要素は無効になる）。"""
+        self._push_tasks([task])
+
+    def _push_tasks(self, tasks: List[Task]) -> None:
+        """複数のタスクをまとめてヒープに投入する。
+
+        無効な要素が溜まる場合は1件ずつ積まず、有効な要素だけで
+        ヒープを1回作り直す。
+
+        Args:
+            tasks: 投入するタスクのリスト
+        """
+        entries = [(-task.priority, next(self._task_counter), task) for task in tasks]
+        for entry in entries:
+            self._task_entries[entry[2].id] = entry
+            self._task_dumps[entry[2].id] = entry[2].model_dump()
+        if len(self._task_heap) + len(entries) > TASK_HEAP_COMPACT_RATIO * len(self._task_entries) + 64:
+            self._task_heap = list(self._task_entries.values())
+            heapq.heapify(self._task_heap)
+        else:
+            for entry in entries:
+                heapq.heappush(self._task_heap, entry)
+
+    def _remove_task(self, task: Task) -> None:
+        """タスクを現在のタスクから取り除く（ヒープ上の要素は取り出した時点で読み捨てる）。"""
+        self._task_entries.pop(task.id, None)
+        self._task_dumps.pop(task.id, None)
+
+    def _task_dump(self, task: Task) -> Dict[str, Any]:
+        """タスクの直列化結果を取得する（未完了のタスクは保存済みのものを返す）。"""
+        dump = self._task_dumps.get(task.id)
+        return dump if dump is not None else task.model_dump()
+
     def add_operator(self, operator: BaseOperator) -> None:
         """オペレーターを追加する。
 
@@ -72,6 +141,7 @@ class TaskManager:
         operator_type = operator.__class__.__name__
         logger.info(f"オペレーターを追加: {operator_type}")
         self.operators[operator_type] = operator
+        self._required_context[operator_type] = tuple(operator.get_required_context())
 
     def create_initial_task(self) -> Task:
         """初期タスクを生成する。
@@ -87,7 +157,7 @@ class TaskManager:
             priority=1,
             metadata={"task_type": "creation"},
         )
-        self.current_tasks.append(task)
+        self._push_task(task)
         logger.info(f"初期タスクを生成: ID={task.id}, 名前={task.name}")
 
         # データベースに保存
@@ -110,14 +180,16 @@ class TaskManager:
         Returns:
             次のタスク
         """
-        logger.debug(f"次のタスクを取得中 (現在のタスク数: {len(self.current_tasks)})")
-        if not self.current_tasks:
+        logger.debug(f"次のタスクを取得中 (現在のタスク数: {len(self._task_entries)})")
+        if not self._task_entries:
             logger.info("実行可能なタスクがありません")
             return None
 
-        # 優先度でソート
-        self.current_tasks.sort(key=lambda x: x.priority, reverse=True)
-        next_task = self.current_tasks[0]
+        # 先頭の無効な要素を読み捨て、優先度の最も高いタスクを参照する
+        heap = self._task_heap
+        while self._task_entries.get(heap[0][2].id) is not heap[0]:
+            heapq.heappop(heap)
+        next_task = heap[0][2]
         logger.info(f"次のタスクを選択: ID={next_task.id}, 名前={next_task.name}, 優先度={next_task.priority}")
         return next_task
 
@@ -159,7 +231,7 @@ class TaskManager:
                     raise ValueError(f"Task validation failed: {task.dict()}")
 
                 # コンテキストの準備
-                context = self._prepare_context(operator.get_required_context())
+                context = self._prepare_context(self._required_context_for(operator_type))
 
                 # タスクの実行
                 result = operator.execute(task, context)
@@ -172,7 +244,7 @@ class TaskManager:
                 
                 # 履歴の更新
                 self.task_history.append({
-                    "task": task.dict(),
+                    "task": self._task_dump(task),
                     "result": result,
                     "operator": operator_type,
                 })
@@ -181,8 +253,7 @@ class TaskManager:
                 self._save_task_result(task, result, operator_type)
 
                 # 現在のタスクから削除
-                if task in self.current_tasks:
-                    self.current_tasks.remove(task)
+                self._remove_task(task)
 
                 return result
 
@@ -198,19 +269,264 @@ class TaskManager:
                     raise Exception("連続エラーが多すぎます")
                 
                 if retries <= self.max_retries:
-                    wait_time = self.retry_delay * (2 ** (retries - 1))  # 指数バックオフ
+                    wait_time = self._retry_wait(retries)
                     logger.warning(f"タスク実行に失敗、{wait_time}秒後にリトライ ({retries}/{self.max_retries}): {str(e)}")
                     time.sleep(wait_time)
                 else:
                     logger.error(f"リトライ回数が上限に達しました: {str(e)}")
                     error_result = {"status": "error", "error": str(e)}
                     self._save_task_result(task, error_result)
+                    # 失敗が確定したタスクは再び選ばれないよう現在のタスクから外す
+                    self._remove_task(task)
                     raise
 
         error_result = {"status": "error", "error": str(last_error)}
         self._save_task_result(task, error_result)
         return error_result
 
+    def execute_tasks(self, tasks: List[Task]) -> List[Dict[str, Any]]:
+        """複数のタスクをまとめて実行する。
+
+        各タスクのLLM呼び出しを並行してディスパッチし、履歴とデータベースへの
+        記録は呼び出し元のスレッドで順番に行う。失敗したタスクはexecute_taskと
+        同様に指数バックオフでリトライする。
+
+        Args:
+            tasks: 実行するタスクのリスト
+
+        Returns:
+            タスクと同じ順序の実行結果リスト
+        """
+        if not tasks:
+            return []
+
+        logger.info(f"タスクの一括実行開始: {len(tasks)}件")
+        self._wait_for_api_limit()
+
+        outcomes = self.batch_client.map(self._run_with_retries, tasks, return_exceptions=True)
+        results = [self._record_outcome(task, outcome) for task, outcome in zip(tasks, outcomes)]
+
+        if self.consecutive_errors >= self.max_consecutive_errors:
+            logger.error(f"連続エラーが制限を超えました: {self.consecutive_errors}回")
+            raise Exception("連続エラーが多すぎます")
+
+        logger.info(f"タスクの一括実行完了: {len(results)}件")
+        return results
+
+    async def aexecute_task(self, task: Task) -> Dict[str, Any]:
+        """タスクを非同期に実行する。
+
+        オペレーターの実行はワーカースレッドで行い、同時実行数はmax_concurrencyで
+        制限する。失敗した場合はexecute_taskと同様に指数バックオフでリトライする
+        （待機中はセマフォを解放する）。履歴とデータベースへの記録はイベントループ上で行う。
+
+        Args:
+            task: 実行するタスク
+
+        Returns:
+            実行結果
+        """
+        logger.info(f"タスク非同期実行開始: ID={task.id}, 名前={task.name}")
+        await asyncio.to_thread(self._wait_for_api_limit)
+
+        retries = 0
+        while True:
+            try:
+                _, operator, context = self._resolve_operator(task)
+                async with self._get_semaphore():
+                    outcome = await asyncio.to_thread(operator.execute, task, context)
+                break
+            except Exception as e:
+                outcome = e
+                retries += 1
+                if retries > self.max_retries:
+                    break
+                wait_time = self._retry_wait(retries)
+                logger.warning(f"タスク実行に失敗、{wait_time}秒後にリトライ ({retries}/{self.max_retries}): {str(e)}")
+                await asyncio.sleep(wait_time)
+
+        result = self._record_outcome(task, outcome)
+        if self.consecutive_errors >= self.max_consecutive_errors:
+            logger.error(f"連続エラーが制限を超えました: {self.consecutive_errors}回")
+            raise Exception("連続エラーが多すぎます")
+        return result
+
+    async def step(self) -> Optional[Dict[str, Any]]:
+        """優先度の最も高い未着手のタスクを1件実行し、新しいタスクを生成する。
+
+        asyncio.gatherで複数のstepを並行させても、同じタスクが重複して
+        選ばれることはない。
+
+        Returns:
+            実行結果（実行可能なタスクが無い場合はNone）
+        """
+        tasks = self._claim_tasks(1)
+        if not tasks:
+            logger.info("実行可能なタスクがありません")
+            return None
+
+        task = tasks[0]
+        try:
+            result = await self.aexecute_task(task)
+            new_tasks = await self.acreate_new_tasks(task, result)
+            logger.info(f"生成された新しいタスク: {new_tasks}")
+            return result
+        finally:
+            self._running_task_ids.discard(task.id)
+
+    async def aexecute_iteration(self, batch_size: int = 1) -> List[Dict[str, Any]]:
+        """1イテレーション分の処理を非同期に実行する。
+
+        優先度の高いタスクを最大batch_size件並行して実行した後、
+        各タスクからの新しいタスクの生成と優先順位付けのLLM呼び出しを
+        同時に発行する。
+
+        Args:
+            batch_size: 並行して実行するタスク数
+
+        Returns:
+            実行結果のリスト（実行可能なタスクが無い場合は空）
+        """
+        tasks = self._claim_tasks(batch_size)
+        if not tasks:
+            logger.info("実行可能なタスクがありません")
+            return []
+
+        try:
+            results = await asyncio.gather(*[self.aexecute_task(task) for task in tasks])
+            await asyncio.gather(
+                *[self.acreate_new_tasks(task, result) for task, result in zip(tasks, results)],
+                self.aprioritize_tasks()
+            )
+        finally:
+            for task in tasks:
+                self._running_task_ids.discard(task.id)
+
+        self.analyze_performance()
+        return list(results)
+
+    def _claim_tasks(self, count: int) -> List[Task]:
+        """優先度の高い未着手のタスクを実行中として確保する。
+
+        Args:
+            count: 確保する最大数
+
+        Returns:
+            確保したタスクのリスト
+        """
+        tasks: List[Task] = []
+        popped: List[Tuple[float, int, Task]] = []
+        while self._task_heap and len(tasks) < count:
+            entry = heapq.heappop(self._task_heap)
+            task = entry[2]
+            if self._task_entries.get(task.id) is not entry:
+                continue
+            popped.append(entry)
+            if task.id not in self._running_task_ids:
+                tasks.append(task)
+        # 確保したタスクも完了するまでは現在のタスクに残す
+        for entry in popped:
+            heapq.heappush(self._task_heap, entry)
+        for task in tasks:
+            self._running_task_ids.add(task.id)
+        return tasks
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """非同期実行の同時実行数を制限するセマフォを取得する。"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _resolve_operator(self, task: Task) -> Tuple[str, BaseOperator, Dict[str, Any]]:
+        """タスクを実行するオペレーターとコンテキストを準備する。
+
+        Args:
+            task: タスク
+
+        Returns:
+            オペレータータイプ、オペレーター、実行コンテキスト
+
+        Raises:
+            ValueError: オペレーターが無い場合、またはタスクの検証に失敗した場合
+        """
+        operator_type = self._get_operator_type(task)
+        operator = self.operators.get(operator_type)
+        if not operator:
+            raise ValueError(f"No operator found for task type: {operator_type}")
+        if not operator.validate(task):
+            raise ValueError(f"Task validation failed: {task.dict()}")
+        context = self._prepare_context(self._required_context_for(operator_type))
+        return operator_type, operator, context
+
+    def _retry_wait(self, retries: int) -> float:
+        """リトライ前の待機時間（指数バックオフ）を求める。
+
+        Args:
+            retries: これまでに失敗した回数
+
+        Returns:
+            待機時間（秒）
+        """
+        return self.retry_delay * (2 ** (retries - 1))
+
+    def _run_with_retries(self, task: Task) -> Dict[str, Any]:
+        """オペレーターを実行し、失敗した場合は指数バックオフでリトライする。
+
+        Args:
+            task: 実行するタスク
+
+        Returns:
+            実行結果
+
+        Raises:
+            Exception: max_retries回リトライしても失敗した場合は最後の例外
+        """
+        retries = 0
+        while True:
+            try:
+                _, operator, context = self._resolve_operator(task)
+                return operator.execute(task, context)
+            except Exception as e:
+                retries += 1
+                if retries > self.max_retries:
+                    raise
+                wait_time = self._retry_wait(retries)
+                logger.warning(f"タスク実行に失敗、{wait_time}秒後にリトライ ({retries}/{self.max_retries}): {str(e)}")
+                time.sleep(wait_time)
+
+    def _record_outcome(self, task: Task, outcome: Any) -> Dict[str, Any]:
+        """オペレーターの実行結果（または例外）を履歴とデータベースに記録する。
+
+        例外はリトライを使い切った後の最終的な失敗として扱い、タスクを
+        現在のタスクから外す。
+
+        Args:
+            task: 実行したタスク
+            outcome: 実行結果、または発生した例外
+
+        Returns:
+            記録した実行結果
+        """
+        if isinstance(outcome, Exception):
+            self.consecutive_errors += 1
+            logger.error(f"タスク実行に失敗: {task.name}: {str(outcome)}")
+            result = {"status": "error", "error": str(outcome)}
+            self._save_task_result(task, result)
+            self._remove_task(task)
+            return result
+
+        self.consecutive_errors = 0
+        operator_type = self._get_operator_type(task)
+        self.api_call_history.append(datetime.now())
+        self.task_history.append({
+            "task": self._task_dump(task),
+            "result": outcome,
+            "operator": operator_type,
+        })
+        self._save_task_result(task, outcome, operator_type)
+        self._remove_task(task)
+        return outcome
+
     def _wait_for_api_limit(self) -> None:
         """API呼び出し制限に基づいて待機する。"""
         now = datetime.now()
@@ -236,22 +552,45 @@ class TaskManager:
             生成されたタスクのリスト
         """
         logger.info(f"新規タスク生成開始: 元タスク={task.name}")
-        
+        operator, context = self._prepare_creation()
+        creation_result = operator.execute(task, context)
+        return self._add_created_tasks(creation_result)
+
+    async def acreate_new_tasks(self, task: Task, result: Dict[str, Any]) -> List[Task]:
+        """新しいタスクを非同期に生成する。
+
+        Args:
+            task: 元のタスク
+            result: 実行結果
+
+        Returns:
+            生成されたタスクのリスト
+        """
+        logger.info(f"新規タスク非同期生成開始: 元タスク={task.name}")
+        operator, context = self._prepare_creation()
+        async with self._get_semaphore():
+            creation_result = await asyncio.to_thread(operator.execute, task, context)
+        return self._add_created_tasks(creation_result)
+
+    def _prepare_creation(self) -> Tuple[BaseOperator, Dict[str, Any]]:
+        """タスク生成用のオペレーターとコンテキストを準備する。"""
         operator = self.operators.get("TaskCreationOperator")
         if not operator:
             logger.error("TaskCreationOperatorが見つかりません")
             raise ValueError("TaskCreationOperator not found")
 
-        context = self._prepare_context(operator.get_required_context())
+        context = self._prepare_context(self._required_context_for("TaskCreationOperator"))
         logger.debug("タスク生成のコンテキストを準備完了")
-        
-        creation_result = operator.execute(task, context)
-        logger.debug(f"タスク生成の実行結果: {creation_result}")
+        return operator, context
+
+    def _add_created_tasks(self, creation_result: Dict[str, Any]) -> List[Task]:
+        """タスク生成の結果を現在のタスクに追加する。"""
+        logger.debug("タスク生成の実行結果: %s", creation_result)
 
         new_tasks = []
         for task_data in creation_result.get("new_tasks", []):
             new_task = Task(**task_data)
-            self.current_tasks.append(new_task)
+            self._push_task(new_task)
             new_tasks.append(new_task)
             logger.info(f"新規タスクを追加: ID={new_task.id}, 名前={new_task.name}")
 
@@ -261,10 +600,38 @@ class TaskManager:
     def prioritize_tasks(self) -> None:
         """タスクの優先順位を更新する。"""
         logger.info("タスクの優先順位付けを開始")
-        if not self.current_tasks:
-            logger.info("優先順位付けするタスクがありません")
+        prepared = self._prepare_prioritization()
+        if prepared is None:
             return
 
+        operator, prioritization_task, context = prepared
+        logger.debug("優先順位付けを実行中")
+        result = operator.execute(prioritization_task, context)
+        self._apply_priorities(result)
+
+    async def aprioritize_tasks(self) -> None:
+        """タスクの優先順位を非同期に更新する。"""
+        logger.info("タスクの非同期優先順位付けを開始")
+        prepared = self._prepare_prioritization()
+        if prepared is None:
+            return
+
+        operator, prioritization_task, context = prepared
+        logger.debug("優先順位付けを実行中")
+        async with self._get_semaphore():
+            result = await asyncio.to_thread(operator.execute, prioritization_task, context)
+        self._apply_priorities(result)
+
+    def _prepare_prioritization(self) -> Optional[Tuple[BaseOperator, Task, Dict[str, Any]]]:
+        """優先順位付け用のオペレーター、タスク、コンテキストを準備する。
+
+        Returns:
+            オペレーター、優先順位付けタスク、コンテキスト（タスクが無い場合はNone）
+        """
+        if not self._task_entries:
+            logger.info("優先順位付けするタスクがありません")
+            return None
+
         operator = self.operators.get("TaskPrioritizationOperator")
         if not operator:
             logger.error("TaskPrioritizationOperatorが見つかりません")
@@ -280,34 +647,38 @@ class TaskManager:
         )
         logger.debug(f"優先順位付けタスクを作成: ID={prioritization_task.id}")
 
-        # コンテキストの準備
+        # コンテキストの準備（実行中に変更されないようリストを複製する）
+        # タスクはヒープに積んだ時点の直列化結果をそのまま渡す
         context = {
             "objective": self.objective,
-            "task_history": self.task_history,
-            "current_tasks": self.current_tasks
+            "task_history": list(self.task_history),
+            "current_tasks": [self._task_dumps[task_id] for task_id in self._task_entries]
         }
+        return operator, prioritization_task, context
 
-        # 優先順位付けの実行
-        logger.debug("優先順位付けを実行中")
-        result = operator.execute(prioritization_task, context)
-
-        # 優先順位の更新
+    def _apply_priorities(self, result: Any) -> None:
+        """優先順位付けの結果を現在のタスクに反映する。"""
         update_count = 0
+        changed: List[Task] = []
         prioritized_tasks = result.get("prioritized_tasks", []) if isinstance(result, dict) else result
         
         for task_data in prioritized_tasks:
             task_id = task_data.get("id") if isinstance(task_data, dict) else None
             new_priority = task_data.get("priority") if isinstance(task_data, dict) else None
             
-            if task_id and new_priority is not None:
-                for task in self.current_tasks:
-                    if task.id == task_id:
-                        old_priority = task.priority
-                        task.priority = float(new_priority)
-                        logger.debug(f"タスク{task_id}の優先度を更新: {old_priority} → {new_priority}")
-                        update_count += 1
-                        break
-
+            entry = self._task_entries.get(task_id) if task_id else None
+            if entry is not None and new_priority is not None:
+                task = entry[2]
+                old_priority = task.priority
+                task.priority = float(new_priority)
+                if task.priority != old_priority:
+                    changed.append(task)
+                logger.debug(f"タスク{task_id}の優先度を更新: {old_priority} → {new_priority}")
+                update_count += 1
+
+        # 優先度が変わったタスクはまとめて1回でヒープに積み直す
+        if changed:
+            self._push_tasks(changed)
         logger.info(f"優先順位付け完了: {update_count}件のタスクを更新")
 
     def analyze_performance(self) -> Dict[str, Any]:
@@ -330,8 +701,10 @@ class TaskManager:
             "successful_tasks": successful_tasks,
             "success_rate": success_rate,
             "average_priority": sum(
-                task.priority for task in self.current_tasks
-            ) / len(self.current_tasks) if self.current_tasks else 0,
+                entry[2].priority for entry in self._task_entries.values()
+            ) / len(self._task_entries) if self._task_entries else 0,
+            "llm_cache_hits": self.llm_client.cache_hits,
+            "llm_cache_misses": self.llm_client.cache_misses,
         })
 
         return self.performance_metrics
@@ -363,7 +736,24 @@ class TaskManager:
         else:
             return "TaskExecutionOperator"  # デフォルト
 
-    def _prepare_context(self, required_keys: List[str]) -> Dict[str, Any]:
+    def _required_context_for(self, operator_type: str) -> Tuple[str, ...]:
+        """オペレーターが要求するコンテキストのキーを取得する。
+
+        キーはオペレーターのクラスごとに固定なので、初回に取得したものを使い回す。
+
+        Args:
+            operator_type: オペレーターのタイプ
+
+        Returns:
+            必要なコンテキストのキー
+        """
+        required_keys = self._required_context.get(operator_type)
+        if required_keys is None:
+            required_keys = tuple(self.operators[operator_type].get_required_context())
+            self._required_context[operator_type] = required_keys
+        return required_keys
+
+    def _prepare_context(self, required_keys: Tuple[str, ...]) -> Dict[str, Any]:
         """実行コンテキストを準備する。
 
         Args:
@@ -372,18 +762,8 @@ class TaskManager:
         Returns:
             実行コンテキスト
         """
-        context = {}
-        for key in required_keys:
-            if key == "task_history":
-                context[key] = self.task_history
-            elif key == "objective":
-                context[key] = self.objective
-            elif key == "task_list":
-                context[key] = [task for task in self.current_tasks if task is not None]
-            elif key == "performance_metrics":
-                context[key] = self.performance_metrics
-
-        return context 
+        providers = self._context_providers
+        return {key: providers[key]() for key in required_keys if key in providers} 
 
     def _save_task_result(self, task: Task, result: Dict[str, Any], operator_type: Optional[str] = None) -> None:
         """タスクの実行結果をデータベースに保存する。
@@ -1,6 +1,14 @@
 """キャッシュの実装。"""
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 from genesis_agi.utils.cache_backends import (
     CacheBackend,
@@ -18,6 +26,8 @@ class Cache:
         cache_dir: Optional[Union[str, Path]] = None,
         redis_config: Optional[Dict[str, Any]] = None,
         max_size: Optional[int] = None,
+        l1_size: int = 0,
+        namespace_ttls: Optional[Dict[str, int]] = None,
     ):
         """初期化。
 
@@ -26,7 +36,19 @@ class Cache:
             cache_dir: キャッシュディレクトリ（filesystemバックエンド用）
             redis_config: Redisの設定（redisバックエンド用）
             max_size: キャッシュの最大サイズ（filesystemバックエンド用）
+            l1_size: プロセス内LRUキャッシュ（L1）の最大エントリ数（0で無効）
+            namespace_ttls: 名前空間（キーの最初の":"より前）ごとの既定の有効期限（秒）
         """
+        self.l1_size = l1_size
+        self._l1: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._l1_lock = threading.Lock()
+        self.l1_hits = 0
+        self.l1_misses = 0
+        self.l1_evictions = 0
+        self.namespace_ttls: Dict[str, int] = dict(namespace_ttls or {})
+        self._namespace_stats: Dict[str, Dict[str, int]] = {}
+        self._pipeline_local = threading.local()
+
         if backend == "filesystem":
             if cache_dir is None:
                 cache_dir = Path.home() / ".genesis_agi" / "cache"
@@ -42,8 +64,81 @@ class Cache:
             raise ValueError(f"Unsupported backend: {backend}")
 
     def get(self, key: str) -> Optional[Any]:
-        """キーに対応する値を取得する。"""
-        return self.backend.get(key)
+        """キーに対応する値を取得する。
+
+        L1が有効な場合はまずプロセス内のLRUを参照し、ミスした場合のみ
+        バックエンド（L2）を参照してL1に昇格させる。昇格したエントリには
+        L2に残っている有効期限を引き継ぐ。
+        """
+        if self.l1_size > 0:
+            with self._l1_lock:
+                entry = self._l1.get(key)
+                if entry is not None:
+                    value, expires_at = entry
+                    if expires_at is None or expires_at > time.monotonic():
+                        self._l1.move_to_end(key)
+                        self.l1_hits += 1
+                        self._count_locked(key, True)
+                        return value
+                    del self._l1[key]
+                self.l1_misses += 1
+
+        if self.l1_size == 0:
+            value = self.backend.get(key)
+            self._count(key, value is not None)
+            return value
+
+        value, ttl = self.backend.get_with_ttl(key)
+        self._count(key, value is not None)
+        if value is not None:
+            self._set_l1(key, value, ttl)
+        return value
+
+    def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """複数のキーに対応する値をまとめて取得する。
+
+        L1でミスしたキーだけをバックエンドから一括で取得する。
+
+        Args:
+            keys: キーのリスト
+
+        Returns:
+            キーと同じ順序の値のリスト（存在しないキーはNone）
+        """
+        values: List[Optional[Any]] = [None] * len(keys)
+        missing: List[int] = []
+        if self.l1_size > 0:
+            now = time.monotonic()
+            with self._l1_lock:
+                for i, key in enumerate(keys):
+                    entry = self._l1.get(key)
+                    if entry is not None:
+                        value, expires_at = entry
+                        if expires_at is None or expires_at > now:
+                            self._l1.move_to_end(key)
+                            self.l1_hits += 1
+                            self._count_locked(key, True)
+                            values[i] = value
+                            continue
+                        del self._l1[key]
+                    self.l1_misses += 1
+                    missing.append(i)
+        else:
+            missing = list(range(len(keys)))
+
+        if missing and self.l1_size == 0:
+            fetched = self.backend.mget(keys)
+            for i, value in enumerate(fetched):
+                values[i] = value
+                self._count(keys[i], value is not None)
+        elif missing:
+            fetched_with_ttl = self.backend.mget_with_ttl([keys[i] for i in missing])
+            for i, (value, ttl) in zip(missing, fetched_with_ttl):
+                values[i] = value
+                self._count(keys[i], value is not None)
+                if value is not None:
+                    self._set_l1(keys[i], value, ttl)
+        return values
 
     def set(
         self,
@@ -52,17 +147,332 @@ class Cache:
         ttl: Optional[int] = None,
         metadata: Optional[Dict[str, Any]] = None,
     ) -> None:
-        """キーと値のペアを保存する。"""
-        self.backend.set(key, value, ttl=ttl, metadata=metadata)
+        """キーと値のペアを保存する。
+
+        ttlを省略した場合は名前空間ごとの既定の有効期限を使用する。
+        """
+        if ttl is None:
+            ttl = self.namespace_ttls.get(self._namespace(key))
+        pending = getattr(self._pipeline_local, "pending", None)
+        if pending is not None:
+            pending.append((key, value, ttl, metadata))
+        else:
+            self.backend.set(key, value, ttl=ttl, metadata=metadata)
+        if self.l1_size > 0:
+            self._set_l1(key, value, ttl)
+
+    @contextmanager
+    def pipeline(self) -> Iterator["Cache"]:
+        """ブロック内の書き込みをまとめてバックエンドに送る。
+
+        ブロック内のsetはL1には即座に反映し、バックエンドへはブロックを抜けるときに
+        一括で書き込む（Redisでは1回の往復になる）。入れ子にした場合は最も外側の
+        ブロックを抜けるときに書き込む。
+
+        Yields:
+            このキャッシュ
+        """
+        if getattr(self._pipeline_local, "pending", None) is not None:
+            yield self
+            return
+
+        self._pipeline_local.pending = []
+        try:
+            yield self
+        finally:
+            pending = self._pipeline_local.pending
+            self._pipeline_local.pending = None
+            self.backend.set_many(pending)
 
     def delete(self, key: str) -> None:
         """キーに対応する値を削除する。"""
+        if self.l1_size > 0:
+            with self._l1_lock:
+                self._l1.pop(key, None)
         self.backend.delete(key)
 
     def clear(self) -> None:
         """すべてのキャッシュをクリアする。"""
+        with self._l1_lock:
+            self._l1.clear()
         self.backend.clear()
 
     def get_stats(self) -> Dict[str, Any]:
         """キャッシュの統計情報を取得する。"""
-        return self.backend.get_stats() 
\ No newline at end of file
+        stats = self.backend.get_stats()
+        if self.l1_size > 0:
+            stats.update({
+                "l1_items": len(self._l1),
+                "l1_size": self.l1_size,
+                "l1_hits": self.l1_hits,
+                "l1_misses": self.l1_misses,
+                "l1_evictions": self.l1_evictions,
+            })
+        with self._l1_lock:
+            stats["namespaces"] = {
+                namespace: dict(counts)
+                for namespace, counts in self._namespace_stats.items()
+            }
+        return stats
+
+    @staticmethod
+    def _namespace(key: str) -> str:
+        """キーの名前空間を取得する。"""
+        return key.split(":", 1)[0] if ":" in key else ""
+
+    def _count(self, key: str, hit: bool) -> None:
+        """名前空間ごとのヒット・ミス数を記録する。"""
+        with self._l1_lock:
+            self._count_locked(key, hit)
+
+    def _count_locked(self, key: str, hit: bool) -> None:
+        """名前空間ごとのヒット・ミス数を記録する（ロック取得済み）。"""
+        counts = self._namespace_stats.get(self._namespace(key))
+        if counts is None:
+            counts = self._namespace_stats[self._namespace(key)] = {"hits": 0, "misses": 0}
+        counts["hits" if hit else "misses"] += 1
+
+    def _set_l1(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        """L1に値を保存し、最大エントリ数を超えた分を古い順に破棄する。"""
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._l1_lock:
+            self._l1[key] = (value, expires_at)
+            self._l1.move_to_end(key)
+            while len(self._l1) > self.l1_size:
+                self._l1.popitem(last=False)
+                self.l1_evictions += 1
+
+
+# SemanticCacheが永続化するキー一覧の1セグメントあたりのキー数
+SEMANTIC_KEYS_SEGMENT_SIZE = 64
+
+
+class SemanticCache:
+    """埋め込みベクトルの類似度で近似一致を判定する応答キャッシュ。
+
+    表現が少し異なるだけのプロンプトでも、コサイン類似度が閾値以上であれば
+    過去の応答を返す。ベクトルは正規化して保持し、検索は1回の行列積で行う。
+    永続化するキーの一覧は一定数ごとのセグメントに分け、追加時には
+    末尾のセグメントだけを書き直す。
+    """
+
+    def __init__(
+        self,
+        embedding_fn: Callable[[str], Sequence[float]],
+        cache: Optional[Cache] = None,
+        threshold: float = 0.95,
+        namespace: str = "semantic",
+        max_entries: int = 1000,
+        ttl: Optional[int] = None,
+    ):
+        """初期化。
+
+        Args:
+            embedding_fn: テキストを埋め込みベクトルに変換する関数
+            cache: エントリを永続化するキャッシュ（Redisを指定すると共有される）
+            threshold: ヒットとみなすコサイン類似度の閾値
+            namespace: 永続化時のキーのプレフィックス
+            max_entries: 保持する最大エントリ数
+            ttl: エントリの既定の有効期限（秒）
+        """
+        self.embedding_fn = embedding_fn
+        self.cache = cache
+        self.threshold = threshold
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._keys: List[str] = []
+        self._responses: List[Any] = []
+        self._expires_at: List[float] = []
+        self._scopes: List[str] = []
+        self._embeddings: Optional[np.ndarray] = None
+        # 永続化したキー一覧の末尾のセグメント（番号とキー）
+        self._segment_index = 0
+        self._segment_keys: List[str] = []
+
+        if self.cache:
+            self._load()
+
+    def embed(self, text: str) -> np.ndarray:
+        """テキストを正規化済みの埋め込みベクトルに変換する。"""
+        vector = np.asarray(self.embedding_fn(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def lookup(
+        self,
+        text: str,
+        embedding: Optional[np.ndarray] = None,
+        scope: str = ""
+    ) -> Optional[Any]:
+        """類似するプロンプトの応答を検索する。
+
+        Args:
+            text: プロンプト
+            embedding: 計算済みの埋め込みベクトル
+            scope: 検索対象を絞り込む識別子（同じscopeで追加したエントリだけを比較する）
+
+        Returns:
+            類似度が閾値以上の応答（見つからない場合はNone）
+        """
+        with self._lock:
+            self._evict_expired()
+            embeddings = self._embeddings
+            responses = list(self._responses)
+            expires_at = np.asarray(self._expires_at, dtype=np.float64)
+            scopes = list(self._scopes)
+
+        if embeddings is None or not responses:
+            self.misses += 1
+            return None
+
+        query = embedding if embedding is not None else self.embed(text)
+        # 有効期限はエントリごとに異なるため、期限切れや別scopeのエントリは除外して比較する
+        valid = expires_at > time.time()
+        valid &= np.fromiter((s == scope for s in scopes), dtype=bool, count=len(scopes))
+        scores = np.where(valid, embeddings @ query, -np.inf)
+        best = int(np.argmax(scores))
+        if scores[best] >= self.threshold:
+            self.hits += 1
+            return responses[best]
+
+        self.misses += 1
+        return None
+
+    def add(
+        self,
+        text: str,
+        response: Any,
+        embedding: Optional[np.ndarray] = None,
+        ttl: Optional[int] = None,
+        scope: str = ""
+    ) -> None:
+        """プロンプトと応答のペアを追加する。
+
+        Args:
+            text: プロンプト
+            response: 応答
+            embedding: 計算済みの埋め込みベクトル
+            ttl: このエントリの有効期限（秒、Noneの場合はキャッシュ全体の設定を使う）
+            scope: 検索対象を絞り込む識別子
+        """
+        vector = embedding if embedding is not None else self.embed(text)
+        ttl = self.ttl if ttl is None else ttl
+        key = hashlib.sha256(f"{scope}\n{text}".encode("utf-8")).hexdigest()
+        expires_at = time.time() + ttl if ttl is not None else math.inf
+
+        with self._lock:
+            self._append(key, vector, response, expires_at, scope)
+            if self.cache:
+                if len(self._segment_keys) >= SEMANTIC_KEYS_SEGMENT_SIZE:
+                    self._segment_index += 1
+                    self._segment_keys = []
+                self._segment_keys.append(key)
+                segment_index = self._segment_index
+                segment_keys = list(self._segment_keys)
+
+        if self.cache:
+            with self.cache.pipeline():
+                self.cache.set(
+                    f"{self.namespace}:{key}",
+                    {
+                        "embedding": vector.tolist(),
+                        "response": response,
+                        "scope": scope,
+                        # 読み込み時に残りの有効期限を復元できるよう時刻で保存する
+                        "expires_at": expires_at if ttl is not None else None,
+                    },
+                    ttl=ttl,
+                )
+                self.cache.set(
+                    f"{self.namespace}:keys:{segment_index}", segment_keys, ttl=self.ttl
+                )
+                self.cache.set(
+                    f"{self.namespace}:keys:count", segment_index + 1, ttl=self.ttl
+                )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """統計情報を取得する。"""
+        return {
+            "entries": len(self._responses),
+            "hits": self.hits,
+            "misses": self.misses,
+            "threshold": self.threshold,
+        }
+
+    def _append(
+        self,
+        key: str,
+        vector: np.ndarray,
+        response: Any,
+        expires_at: float,
+        scope: str
+    ) -> None:
+        """エントリを追加し、最大数を超えた分を古い順に破棄する。"""
+        if self._embeddings is None:
+            self._embeddings = vector[np.newaxis, :]
+        else:
+            self._embeddings = np.vstack([self._embeddings, vector])
+        self._keys.append(key)
+        self._responses.append(response)
+        self._expires_at.append(expires_at)
+        self._scopes.append(scope)
+
+        overflow = len(self._keys) - self.max_entries
+        if overflow > 0:
+            self._drop_oldest(overflow)
+
+    def _evict_expired(self) -> None:
+        """先頭から連続して有効期限を過ぎたエントリを破棄する。
+
+        有効期限はエントリごとに異なるため、途中の期限切れエントリは
+        lookupで除外し、古い順に並ぶ先頭側だけをここでまとめて破棄する。
+        """
+        now = time.time()
+        expired = 0
+        while expired < len(self._expires_at) and self._expires_at[expired] <= now:
+            expired += 1
+        if expired:
+            self._drop_oldest(expired)
+
+    def _drop_oldest(self, count: int) -> None:
+        """古い順にエントリを破棄する。"""
+        del self._keys[:count]
+        del self._responses[:count]
+        del self._expires_at[:count]
+        del self._scopes[:count]
+        self._embeddings = self._embeddings[count:] if self._keys else None
+
+    def _load(self) -> None:
+        """永続化されたエントリを読み込む。
+
+        max_entriesに収まる分だけ末尾のセグメントから読み、期限切れの
+        エントリは読み飛ばす。
+        """
+        count = self.cache.get(f"{self.namespace}:keys:count") or 0
+        if count == 0:
+            return
+        first = max(0, count - math.ceil(self.max_entries / SEMANTIC_KEYS_SEGMENT_SIZE) - 1)
+        segments = self.cache.mget(
+            [f"{self.namespace}:keys:{index}" for index in range(first, count)]
+        )
+        self._segment_index = count - 1
+        self._segment_keys = list(segments[-1] or [])
+
+        keys = [key for segment in segments for key in segment or []]
+        entries = self.cache.mget([f"{self.namespace}:{key}" for key in keys])
+        now = time.time()
+        for key, entry in zip(keys, entries):
+            if entry is None:
+                continue
+            expires_at = entry.get("expires_at")
+            if expires_at is None:
+                expires_at = math.inf
+            elif expires_at <= now:
+                continue
+            vector = np.asarray(entry["embedding"], dtype=np.float32)
+            self._append(key, vector, entry["response"], expires_at, entry.get("scope", ""))
@@ -1,16 +1,95 @@
 """キャッシュバックエンドの実装。"""
 import json
 import os
+import threading
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse
 
 import msgpack
 import redis
 
 from genesis_agi.utils.cache_types import CacheItem
 
+# Redisの接続プールの既定値
+REDIS_MAX_CONNECTIONS = 32
+
+# 残りの有効期限を返せないバックエンドで、L1への昇格時に使う有効期限（秒）
+PROMOTION_TTL = 60
+
+# 接続先ごとに共有するRedisの接続プール
+_redis_pools: Dict[Tuple[Any, ...], redis.ConnectionPool] = {}
+_redis_pools_lock = threading.Lock()
+
+
+def get_redis_pool(
+    host: str = "localhost",
+    port: int = 6379,
+    db: int = 0,
+    password: Optional[str] = None,
+    max_connections: int = REDIS_MAX_CONNECTIONS,
+    **kwargs,
+) -> redis.ConnectionPool:
+    """接続先ごとに共有されるRedisの接続プールを取得する。
+
+    同じ接続先に対して複数のキャッシュを作成しても、TCP接続は使い回される。
+
+    Args:
+        host: ホスト名
+        port: ポート番号
+        db: データベース番号
+        password: パスワード
+        max_connections: プールの最大接続数
+        **kwargs: ConnectionPoolに渡す追加の引数
+
+    Returns:
+        接続プール
+    """
+    kwargs.setdefault("socket_keepalive", True)
+    pool_key = (host, port, db, password, max_connections, tuple(sorted(kwargs.items())))
+    with _redis_pools_lock:
+        pool = _redis_pools.get(pool_key)
+        if pool is None:
+            pool = redis.ConnectionPool(
+                host=host,
+                port=port,
+                db=db,
+                password=password,
+                max_connections=max_connections,
+                **kwargs,
+            )
+            _redis_pools[pool_key] = pool
+        return pool
+
+
+def redis_config_from_url(url: str, **overrides: Any) -> Dict[str, Any]:
+    """Redis URLをRedisBackend用の設定に変換する。
+
+    redis:// と rediss://（TLS）の両方に対応し、認証情報とDB番号も解釈する。
+
+    Args:
+        url: Redis URL（例: redis://:password@localhost:6379/0）
+        **overrides: 設定に追加・上書きする値（prefixなど）
+
+    Returns:
+        Redisの設定
+    """
+    parsed = urlparse(url)
+    config: Dict[str, Any] = {
+        "host": parsed.hostname or "localhost",
+        "port": parsed.port or 6379,
+        "db": int(parsed.path.lstrip("/") or 0),
+        "password": parsed.password,
+    }
+    if parsed.username:
+        config["username"] = parsed.username
+    if parsed.scheme == "rediss":
+        config["connection_class"] = redis.SSLConnection
+    config.update(overrides)
+    return config
+
 
 class CacheBackend(ABC):
     """キャッシュバックエンドの基底クラス。"""
@@ -31,6 +110,37 @@ class CacheBackend(ABC):
         """キーと値のペアを保存する。"""
         pass
 
+    def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """複数のキーに対応する値をまとめて取得する。"""
+        return [self.get(key) for key in keys]
+
+    def get_with_ttl(self, key: str) -> Tuple[Optional[Any], Optional[float]]:
+        """値と残りの有効期限（秒）を取得する。
+
+        残りの有効期限を返せないバックエンドでは、上位のキャッシュが古い値を
+        持ち続けないよう PROMOTION_TTL を返す。
+
+        Returns:
+            (値, 残りの有効期限) のタプル（有効期限がない場合はNone）
+        """
+        return self.get(key), PROMOTION_TTL
+
+    def mget_with_ttl(self, keys: List[str]) -> List[Tuple[Optional[Any], Optional[float]]]:
+        """複数のキーの値と残りの有効期限をまとめて取得する。"""
+        return [self.get_with_ttl(key) for key in keys]
+
+    def set_many(
+        self,
+        items: List[Tuple[str, Any, Optional[int], Optional[Dict[str, Any]]]],
+    ) -> None:
+        """複数のキーと値をまとめて保存する。
+
+        Args:
+            items: (キー, 値, 有効期限, メタデータ)のリスト
+        """
+        for key, value, ttl, metadata in items:
+            self.set(key, value, ttl=ttl, metadata=metadata)
+
     @abstractmethod
     def delete(self, key: str) -> None:
         """キーに対応する値を削除する。"""
@@ -61,6 +171,18 @@ class FileSystemBackend(CacheBackend):
 
     def get(self, key: str) -> Optional[Any]:
         """キーに対応する値を取得する。"""
+        item = self._read_item(key)
+        return item.value if item is not None else None
+
+    def get_with_ttl(self, key: str) -> Tuple[Optional[Any], Optional[float]]:
+        """値と残りの有効期限（秒）を取得する。"""
+        item = self._read_item(key)
+        if item is None:
+            return None, None
+        return item.value, item.remaining_ttl
+
+    def _read_item(self, key: str) -> Optional[CacheItem]:
+        """ファイルからアイテムを読み込む。期限切れの場合は削除してNoneを返す。"""
         path = self._get_path(key)
         if not path.exists():
             return None
@@ -80,7 +202,7 @@ class FileSystemBackend(CacheBackend):
                     self.delete(key)
                     return None
 
-                return item.value
+                return item
         except Exception:
             return None
 
@@ -198,13 +320,14 @@ class RedisBackend(CacheBackend):
         **kwargs,
     ):
         self.prefix = prefix
-        self.client = redis.Redis(
+        self.pool = get_redis_pool(
             host=host,
             port=port,
             db=db,
             password=password,
             **kwargs,
         )
+        self.client = redis.Redis(connection_pool=self.pool)
 
     def _get_key(self, key: str) -> str:
         """プレフィックス付きのキーを取得する。"""
@@ -213,7 +336,44 @@ class RedisBackend(CacheBackend):
     def get(self, key: str) -> Optional[Any]:
         """キーに対応する値を取得する。"""
         full_key = self._get_key(key)
-        data = self.client.get(full_key)
+        return self._unpack(key, self.client.get(full_key))
+
+    def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """複数のキーに対応する値を1回の往復で取得する。"""
+        if not keys:
+            return []
+        values = self.client.mget([self._get_key(key) for key in keys])
+        return [self._unpack(key, data) for key, data in zip(keys, values)]
+
+    def get_with_ttl(self, key: str) -> Tuple[Optional[Any], Optional[float]]:
+        """値と残りの有効期限（秒）を取得する。"""
+        return self._unpack_with_ttl(key, self.client.get(self._get_key(key)))
+
+    def mget_with_ttl(self, keys: List[str]) -> List[Tuple[Optional[Any], Optional[float]]]:
+        """複数のキーの値と残りの有効期限を1回の往復で取得する。"""
+        if not keys:
+            return []
+        values = self.client.mget([self._get_key(key) for key in keys])
+        return [self._unpack_with_ttl(key, data) for key, data in zip(keys, values)]
+
+    def _unpack(self, key: str, data: Optional[bytes]) -> Optional[Any]:
+        """Redisから取得したデータを値に変換する。"""
+        item = self._unpack_item(key, data)
+        return item.value if item is not None else None
+
+    def _unpack_with_ttl(
+        self,
+        key: str,
+        data: Optional[bytes],
+    ) -> Tuple[Optional[Any], Optional[float]]:
+        """Redisから取得したデータを値と残りの有効期限に変換する。"""
+        item = self._unpack_item(key, data)
+        if item is None:
+            return None, None
+        return item.value, item.remaining_ttl
+
+    def _unpack_item(self, key: str, data: Optional[bytes]) -> Optional[CacheItem]:
+        """Redisから取得したデータをアイテムに変換する。"""
         if data is None:
             return None
 
@@ -231,7 +391,7 @@ class RedisBackend(CacheBackend):
                 self.delete(key)
                 return None
 
-            return item.value
+            return item
         except Exception:
             return None
 
@@ -243,6 +403,29 @@ class RedisBackend(CacheBackend):
         metadata: Optional[Dict[str, Any]] = None,
     ) -> None:
         """キーと値のペアを保存する。"""
+        self._write(self.client, key, value, ttl, metadata)
+
+    def set_many(
+        self,
+        items: List[Tuple[str, Any, Optional[int], Optional[Dict[str, Any]]]],
+    ) -> None:
+        """複数のキーと値をパイプラインで1回の往復で保存する。"""
+        if not items:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for key, value, ttl, metadata in items:
+            self._write(pipe, key, value, ttl, metadata)
+        pipe.execute()
+
+    def _write(
+        self,
+        client: Any,
+        key: str,
+        value: Any,
+        ttl: Optional[int],
+        metadata: Optional[Dict[str, Any]],
+    ) -> None:
+        """値を直列化してクライアント（またはパイプライン）に書き込む。"""
         item = CacheItem(
             key=key,
             value=value,
@@ -262,9 +445,9 @@ class RedisBackend(CacheBackend):
         full_key = self._get_key(key)
         packed_data = msgpack.packb(data, use_bin_type=True)
         if ttl is not None:
-            self.client.setex(full_key, ttl, packed_data)
+            client.setex(full_key, ttl, packed_data)
         else:
-            self.client.set(full_key, packed_data)
+            client.set(full_key, packed_data)
 
     def delete(self, key: str) -> None:
         """キーに対応する値を削除する。"""
@@ -319,4 +502,5 @@ class RedisBackend(CacheBackend):
             "valid_items": valid_items,
             "memory_usage_bytes": memory_usage,
             "prefix": self.prefix,
+            "pool_max_connections": self.pool.max_connections,
         } 
\ No newline at end of file
@@ -19,4 +19,11 @@ class CacheItem:
         """TTLに基づいて有効期限切れかどうかを判定する。"""
         if self.ttl is None:
             return False
-        return (datetime.now() - self.created_at).total_seconds() > self.ttl 
\ No newline at end of file
+        return (datetime.now() - self.created_at).total_seconds() > self.ttl
+
+    @property
+    def remaining_ttl(self) -> Optional[float]:
+        """残りの有効期限（秒）を取得する。TTLがない場合はNone。"""
+        if self.ttl is None:
+            return None
+        return max(0.0, self.ttl - (datetime.now() - self.created_at).total_seconds())
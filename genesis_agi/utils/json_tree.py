@@ -0,0 +1,136 @@
+"""ネストしたデータ構造をJSON直列化可能な形式に変換するユーティリティ。"""
+import json
+from collections import deque
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # orjsonが無い環境ではPythonで再帰的に変換する
+    orjson = None
+
+# そのまま返す型
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def _default(obj: Any) -> Any:
+    """orjsonが直接扱えないオブジェクトを変換する。"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset, deque)):
+        return list(obj)
+    return str(obj)
+
+
+def to_jsonable(data: Any) -> Any:
+    """ネストしたデータ構造をJSON直列化可能な形式に変換する。
+
+    orjsonが利用可能な場合は木の走査をC実装に任せ、一度バイト列にしてから
+    読み戻す。datetimeはISO形式の文字列に、pydanticモデルは辞書になる。
+
+    Args:
+        data: 変換するデータ
+
+    Returns:
+        JSON直列化可能なデータ
+    """
+    if isinstance(data, _SCALAR_TYPES):
+        return data
+    if orjson is not None:
+        try:
+            return orjson.loads(orjson.dumps(
+                data,
+                default=_default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            ))
+        except orjson.JSONEncodeError:
+            # 64ビットを超える整数などはPython実装で変換する
+            pass
+    return walk(data)
+
+
+def canonical_dumps(data: Any) -> bytes:
+    """キー順を固定した区切り文字の無いJSONのバイト列に変換する。
+
+    同じ内容には常に同じバイト列を返すため、キャッシュキーのハッシュ入力に使える。
+    orjsonが無い環境でも同じ形式になるよう、標準のjsonは区切りを詰めて出力する。
+
+    Args:
+        data: 変換するデータ
+
+    Returns:
+        JSONのバイト列
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                data,
+                default=_default,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+            )
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(
+        walk(data), sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str
+    ).encode("utf-8")
+
+
+def walk(data: Any) -> Any:
+    """ネストしたデータ構造をPythonで再帰的に変換する。
+
+    値の型ごとの変換関数を表引きし、isinstanceの連鎖を避ける。
+
+    Args:
+        data: 変換するデータ
+
+    Returns:
+        JSON直列化可能なデータ
+    """
+    convert = _CONVERTERS.get(type(data))
+    if convert is None:
+        convert = _CONVERTERS[type(data)] = _resolve_converter(type(data))
+    return convert(data)
+
+
+def _identity(data: Any) -> Any:
+    return data
+
+
+def _walk_dict(data: Dict[Any, Any]) -> Dict[Any, Any]:
+    return {key: walk(value) for key, value in data.items()}
+
+
+def _walk_list(data: Iterable[Any]) -> list:
+    return [walk(item) for item in data]
+
+
+def _isoformat(data: date) -> str:
+    return data.isoformat()
+
+
+def _model_dump(data: BaseModel) -> Dict[str, Any]:
+    return data.model_dump(mode="json")
+
+
+def _resolve_converter(data_type: type) -> Callable[[Any], Any]:
+    """サブクラスを含む型に対応する変換関数を決定する。"""
+    if issubclass(data_type, dict):
+        return _walk_dict
+    if issubclass(data_type, (list, deque)):
+        return _walk_list
+    if issubclass(data_type, date):
+        return _isoformat
+    if issubclass(data_type, BaseModel):
+        return _model_dump
+    return _identity
+
+
+# 型から変換関数への対応表（未知の型は初回に解決して追加する）
+_CONVERTERS: Dict[type, Callable[[Any], Any]] = {
+    **{scalar_type: _identity for scalar_type in _SCALAR_TYPES},
+    dict: _walk_dict,
+    list: _walk_list,
+    datetime: _isoformat,
+}
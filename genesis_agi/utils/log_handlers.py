@@ -0,0 +1,78 @@
+"""ログ出力用のハンドラ。"""
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Union
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """レコードごとにflushせず、一定件数ごとにまとめてflushするファイルハンドラ。"""
+
+    def __init__(
+        self,
+        filename: Union[str, Path],
+        encoding: str = "utf-8",
+        flush_interval: int = 100,
+    ):
+        """初期化。
+
+        Args:
+            filename: ログファイルのパス
+            encoding: 文字コード
+            flush_interval: flushするまでに書き込むレコード数
+        """
+        super().__init__(filename, encoding=encoding, delay=True)
+        self.flush_interval = flush_interval
+        self._pending = 0
+        self._in_emit = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """レコードを書き込む（StreamHandler.emit内のflushは行わない）。"""
+        self._in_emit = True
+        try:
+            super().emit(record)
+        finally:
+            self._in_emit = False
+
+        self._pending += 1
+        if self._pending >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """バッファの内容をファイルに書き出す。"""
+        if self._in_emit:
+            return
+        self._pending = 0
+        super().flush()
+
+
+def setup_queue_logging(*handlers: logging.Handler, level: int = logging.INFO) -> QueueListener:
+    """ルートロガーの出力をキュー経由でバックグラウンドスレッドに委譲する。
+
+    ログを出力するスレッドはキューへの追加のみを行い、ファイルへの書き込みは
+    QueueListenerのスレッドで行われる。終了時にはキューを処理し切ってから停止する。
+
+    Args:
+        *handlers: 実際に出力を行うハンドラ
+        level: ルートロガーのログレベル
+
+    Returns:
+        開始済みのQueueListener
+    """
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+
+    def stop() -> None:
+        listener.stop()
+        for handler in handlers:
+            handler.flush()
+
+    atexit.register(stop)
+
+    root_logger = logging.getLogger()
+    root_logger.addHandler(QueueHandler(log_queue))
+    root_logger.setLevel(level)
+    return listener
@@ -1,7 +1,7 @@
 """セマンティック検索の実装。"""
 import json
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import openai
@@ -9,6 +9,22 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 
 from genesis_agi.utils.cache import Cache
 
+try:
+    import faiss
+except ImportError:  # faissが無い環境では全件の行列積で検索する
+    faiss = None
+
+# 埋め込みAPIに1回で送るテキストの最大数
+EMBEDDING_BATCH_SIZE = 64
+
+# HNSWインデックスの設定
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+# この件数未満では全件の行列積で検索する
+HNSW_MIN_DOCUMENTS = 1000
+# インデックス内の削除済みの行がこの割合を超えたら作り直す
+INDEX_REBUILD_RATIO = 0.25
+
 
 @dataclass
 class SearchResult:
@@ -28,6 +44,7 @@ class SemanticSearch:
         api_key: Optional[str] = None,
         model: str = "text-embedding-ada-002",
         cache: Optional[Cache] = None,
+        ef_search: int = 64,
     ):
         """初期化。
 
@@ -35,6 +52,7 @@ class SemanticSearch:
             api_key: OpenAI APIキー
             model: 埋め込みモデル名
             cache: キャッシュ
+            ef_search: HNSW検索時の候補数（大きいほど精度が上がり遅くなる）
         """
         self.api_key = api_key
         if api_key:
@@ -44,6 +62,17 @@ class SemanticSearch:
         self.documents: Dict[str, str] = {}
         self.embeddings: Dict[str, np.ndarray] = {}
         self.metadata: Dict[str, Dict[str, Any]] = {}
+        self.ef_search = ef_search
+
+        # 検索用のインデックス。追加したドキュメントは次の検索時に末尾へ追記し、
+        # 削除・更新したドキュメントの行は削除済み（None）として検索結果から除く
+        self._index_ids: List[Optional[str]] = []
+        self._index_rows: Dict[str, int] = {}
+        self._pending_ids: Dict[str, None] = {}
+        self._tombstones = 0
+        self._matrix: Optional[np.ndarray] = None
+        self._hnsw = None
+        self._index_dirty = True
 
     @retry(
         stop=stop_after_attempt(3),
@@ -74,10 +103,52 @@ class SemanticSearch:
 
         # キャッシュに保存
         if self.cache:
-            self.cache.set(cache_key, embedding.tolist(), ttl=86400)  # 24時間キャッシュ
+            self.cache.set(cache_key, embedding.tolist(), ttl=3600)  # 1時間キャッシュ
 
         return embedding
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+    )
+    def _get_embeddings(self, texts: List[str]) -> List[np.ndarray]:
+        """複数のテキストの埋め込みベクトルをまとめて取得する。
+
+        Args:
+            texts: テキストのリスト
+
+        Returns:
+            テキストと同じ順序の埋め込みベクトルのリスト
+        """
+        embeddings: List[Optional[np.ndarray]] = [None] * len(texts)
+
+        # キャッシュをチェック
+        if self.cache:
+            cached = self.cache.mget([f"embedding:{hash(text)}" for text in texts])
+            for i, cached_embedding in enumerate(cached):
+                if cached_embedding is not None:
+                    embeddings[i] = np.array(cached_embedding)
+
+        # キャッシュに無いものだけをバッチで取得
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        for start in range(0, len(missing), EMBEDDING_BATCH_SIZE):
+            batch = missing[start:start + EMBEDDING_BATCH_SIZE]
+            response = openai.Embedding.create(
+                input=[texts[i] for i in batch],
+                model=self.model,
+            )
+            for item in response["data"]:
+                i = batch[item["index"]]
+                embeddings[i] = np.array(item["embedding"])
+                if self.cache:
+                    self.cache.set(
+                        f"embedding:{hash(texts[i])}",
+                        embeddings[i].tolist(),
+                        ttl=3600,
+                    )
+
+        return embeddings
+
     def _cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
         """コサイン類似度を計算する。
 
@@ -106,6 +177,7 @@ class SemanticSearch:
         self.documents[doc_id] = content
         self.embeddings[doc_id] = self._get_embedding(content)
         self.metadata[doc_id] = metadata or {}
+        self._mark_changed(doc_id)
 
         # キャッシュに保存
         if self.cache:
@@ -119,6 +191,39 @@ class SemanticSearch:
                 metadata={"type": "document"},
             )
 
+    def index_documents_batch(
+        self,
+        documents: List[Tuple[str, str, Optional[Dict[str, Any]]]],
+    ) -> None:
+        """複数のドキュメントをまとめてインデックスに追加する。
+
+        埋め込みベクトルはバッチで取得する。
+
+        Args:
+            documents: (ドキュメントID, 内容, メタデータ)のリスト
+        """
+        if not documents:
+            return
+
+        embeddings = self._get_embeddings([content for _, content, _ in documents])
+        for (doc_id, content, metadata), embedding in zip(documents, embeddings):
+            self.documents[doc_id] = content
+            self.embeddings[doc_id] = embedding
+            self.metadata[doc_id] = metadata or {}
+            self._mark_changed(doc_id)
+
+            # キャッシュに保存
+            if self.cache:
+                self.cache.set(
+                    f"document:{doc_id}",
+                    {
+                        "content": content,
+                        "embedding": embedding.tolist(),
+                        "metadata": self.metadata[doc_id],
+                    },
+                    metadata={"type": "document"},
+                )
+
     def remove_document(self, doc_id: str) -> None:
         """ドキュメントをインデックスから削除する。
 
@@ -128,6 +233,7 @@ class SemanticSearch:
         self.documents.pop(doc_id, None)
         self.embeddings.pop(doc_id, None)
         self.metadata.pop(doc_id, None)
+        self._mark_removed(doc_id)
 
         # キャッシュから削除
         if self.cache:
@@ -151,15 +257,41 @@ class SemanticSearch:
         Returns:
             検索結果のリスト
         """
-        if not self.embeddings:
+        if not self.embeddings or limit <= 0:
             return []
 
         # クエリの埋め込みベクトルを取得
-        query_embedding = self._get_embedding(query)
+        query_embedding = np.asarray(self._get_embedding(query), dtype=np.float32)
+        norm = np.linalg.norm(query_embedding)
+        if norm > 0:
+            query_embedding = query_embedding / norm
+
+        # 類似度の高い順に候補を取得（メタデータで絞り込む場合は多めに取る）
+        self._ensure_index()
+        k = limit if not filter_metadata else max(limit * 10, 100)
+        # 削除済みの行が候補に含まれる分だけ多めに取る
+        k = min(k + self._tombstones, len(self._index_ids))
+        if self._hnsw is not None:
+            scores, indices = self._hnsw.search(query_embedding[np.newaxis, :], k)
+            candidates = zip(scores[0], indices[0])
+        else:
+            all_scores = self._matrix @ query_embedding
+            if filter_metadata:
+                # 全件を走査する場合は絞り込んでから上位を取る
+                top = np.argsort(-all_scores, kind="stable")
+            else:
+                top = np.argpartition(-all_scores, k - 1)[:k]
+                top = top[np.argsort(-all_scores[top], kind="stable")]
+            candidates = ((all_scores[i], i) for i in top)
 
-        # 類似度を計算
         results = []
-        for doc_id, doc_embedding in self.embeddings.items():
+        for score, index in candidates:
+            if index < 0 or score < min_score:
+                continue
+            doc_id = self._index_ids[index]
+            if doc_id is None:
+                continue
+
             # メタデータフィルタリング
             if filter_metadata:
                 doc_metadata = self.metadata[doc_id]
@@ -168,20 +300,89 @@ class SemanticSearch:
                 ):
                     continue
 
-            score = self._cosine_similarity(query_embedding, doc_embedding)
-            if score >= min_score:
-                results.append(
-                    SearchResult(
-                        id=doc_id,
-                        content=self.documents[doc_id],
-                        score=score,
-                        metadata=self.metadata[doc_id],
-                    )
+            results.append(
+                SearchResult(
+                    id=doc_id,
+                    content=self.documents[doc_id],
+                    score=float(score),
+                    metadata=self.metadata[doc_id],
                 )
-
-        # スコアでソート
-        results.sort(key=lambda x: x.score, reverse=True)
-        return results[:limit]
+            )
+            if len(results) >= limit:
+                break
+
+        return results
+
+    def _mark_changed(self, doc_id: str) -> None:
+        """追加・更新したドキュメントを次の検索時にインデックスへ追記する。"""
+        self._mark_removed(doc_id)
+        self._pending_ids[doc_id] = None
+
+    def _mark_removed(self, doc_id: str) -> None:
+        """ドキュメントのインデックス内の行を削除済みにする。"""
+        self._pending_ids.pop(doc_id, None)
+        row = self._index_rows.pop(doc_id, None)
+        if row is not None:
+            self._index_ids[row] = None
+            self._tombstones += 1
+
+    @staticmethod
+    def _normalized(embeddings: List[np.ndarray]) -> np.ndarray:
+        """埋め込みベクトルを正規化した行列にする。"""
+        matrix = np.stack(embeddings).astype(np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms > 0, norms, 1.0)
+        return matrix
+
+    def _ensure_index(self) -> None:
+        """検索用のインデックスを必要に応じて更新する。
+
+        ベクトルは正規化して内積をコサイン類似度として扱う。件数が少ない間は
+        行列のまま検索し、一定数を超えたらHNSWインデックスに登録する。
+        追加されたドキュメントは末尾に追記し、作り直すのは初回、HNSWへの
+        切り替え時、削除済みの行が増えすぎたときだけにする。
+        """
+        live = len(self._index_rows) + len(self._pending_ids)
+        use_hnsw = faiss is not None and live >= HNSW_MIN_DOCUMENTS
+        if (
+            self._index_dirty
+            or self._tombstones > len(self._index_ids) * INDEX_REBUILD_RATIO
+            or use_hnsw != (self._hnsw is not None)
+        ):
+            self._rebuild_index(use_hnsw)
+            return
+        if not self._pending_ids:
+            return
+
+        new_ids = list(self._pending_ids)
+        self._pending_ids.clear()
+        matrix = self._normalized([self.embeddings[doc_id] for doc_id in new_ids])
+        start = len(self._index_ids)
+        if self._hnsw is not None:
+            self._hnsw.add(matrix)
+        else:
+            self._matrix = np.vstack([self._matrix, matrix])
+        self._index_ids.extend(new_ids)
+        self._index_rows.update((doc_id, start + i) for i, doc_id in enumerate(new_ids))
+
+    def _rebuild_index(self, use_hnsw: bool) -> None:
+        """全ドキュメントからインデックスを作り直す。"""
+        self._index_ids = list(self.embeddings)
+        self._index_rows = {doc_id: i for i, doc_id in enumerate(self._index_ids)}
+        self._pending_ids.clear()
+        self._tombstones = 0
+        self._index_dirty = False
+
+        matrix = self._normalized([self.embeddings[doc_id] for doc_id in self._index_ids])
+        self._hnsw = None
+        self._matrix = matrix
+        if use_hnsw:
+            index = faiss.IndexHNSWFlat(matrix.shape[1], HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+            index.hnsw.efSearch = self.ef_search
+            index.add(matrix)
+            self._hnsw = index
+            self._matrix = None
 
     def get_stats(self) -> Dict[str, Any]:
         """インデックスの統計情報を取得する。
@@ -0,0 +1,65 @@
+"""実行履歴の統計を集計する数値カーネル。"""
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numbaが無い環境ではNumPy実装を使用する
+    njit = None
+
+
+def _reduce_op_stats_loop(
+    op_ids: np.ndarray,
+    oks: np.ndarray,
+    times: np.ndarray,
+    gens: np.ndarray,
+    n_ops: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """オペレーター別の統計を1パスで集計する（numbaでコンパイルされる）。"""
+    counts = np.zeros(n_ops, dtype=np.int64)
+    successes = np.zeros(n_ops, dtype=np.int64)
+    total_times = np.zeros(n_ops, dtype=np.float64)
+    generated = np.zeros(n_ops, dtype=np.int64)
+    for i in range(op_ids.shape[0]):
+        op = op_ids[i]
+        counts[op] += 1
+        if oks[i]:
+            successes[op] += 1
+        total_times[op] += times[i]
+        generated[op] += gens[i]
+    return counts, successes, total_times, generated
+
+
+def _reduce_op_stats_numpy(
+    op_ids: np.ndarray,
+    oks: np.ndarray,
+    times: np.ndarray,
+    gens: np.ndarray,
+    n_ops: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """オペレーター別の統計をnp.bincountで集計する。"""
+    counts = np.bincount(op_ids, minlength=n_ops).astype(np.int64)
+    successes = np.bincount(op_ids, weights=oks, minlength=n_ops).astype(np.int64)
+    total_times = np.bincount(op_ids, weights=times, minlength=n_ops)
+    generated = np.bincount(op_ids, weights=gens, minlength=n_ops).astype(np.int64)
+    return counts, successes, total_times, generated
+
+
+# 同じオペレーターへの加算が競合するため、parallel=Trueは使用しない
+reduce_op_stats = (
+    njit(cache=True)(_reduce_op_stats_loop) if njit is not None
+    else _reduce_op_stats_numpy
+)
+reduce_op_stats.__doc__ = """オペレーター別の実行回数・成功数・合計実行時間・生成タスク数を集計する。
+
+Args:
+    op_ids: レコードごとのオペレーターコード（operator_codeで割り当てた整数）
+    oks: レコードごとの成功フラグ（bool）
+    times: レコードごとの実行時間（浮動小数点）
+    gens: レコードごとの生成タスク数（整数）
+    n_ops: オペレーターの種類数
+
+Returns:
+    オペレーターコードで添字付けされた(実行回数, 成功数, 合計実行時間, 生成タスク数)
+"""
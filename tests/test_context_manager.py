@@ -0,0 +1,102 @@
+"""Test cases for context manager indexing."""
+import threading
+import zlib
+from typing import Generator
+
+import numpy as np
+import pytest
+
+from genesis_agi.context.context_manager import ContextManager
+from genesis_agi.utils.semantic_search import SemanticSearch
+
+
+def _embed(text: str) -> np.ndarray:
+    """テキストごとに決まった埋め込みベクトルを返す。"""
+    rng = np.random.default_rng(zlib.crc32(text.encode()))
+    return rng.standard_normal(8)
+
+
+@pytest.fixture
+def search() -> SemanticSearch:
+    """埋め込みAPIを呼び出さないSemanticSearchを作成する。"""
+    search = SemanticSearch()
+    search._get_embedding = _embed
+    search._get_embeddings = lambda texts: [_embed(text) for text in texts]
+    return search
+
+
+@pytest.fixture(params=[False, True], ids=["sync", "background"])
+def manager(
+    request: pytest.FixtureRequest,
+    search: SemanticSearch
+) -> Generator[ContextManager, None, None]:
+    """同期・バックグラウンドそれぞれのインデックス登録でContextManagerを作成する。"""
+    manager = ContextManager(semantic_search=search, background_indexing=request.param)
+    yield manager
+    manager.close()
+
+
+class TestContextIndexing:
+    """コンテキストのインデックス登録のテスト。"""
+
+    def test_flush_indexes_queued_documents(
+        self,
+        manager: ContextManager,
+        search: SemanticSearch
+    ) -> None:
+        """flush_index(force=True)で待ち中のドキュメントが全て登録されることのテスト。"""
+        for i in range(5):
+            manager.add_to_context(f"key-{i}", f"value {i}")
+
+        manager.flush_index(force=True)
+
+        assert search.documents == {f"key-{i}": f"value {i}" for i in range(5)}
+        assert not manager._pending_index
+
+    def test_relevant_context_sees_latest_writes(self, manager: ContextManager) -> None:
+        """直前の追加・更新が関連コンテキストの検索に反映されることのテスト。"""
+        manager.add_to_context("plan", "old plan")
+        manager.add_to_context("goal", "ship it")
+        manager.add_to_context("plan", "new plan")
+
+        relevant = manager.get_relevant_context("new plan", limit=1, min_score=0.99)
+        assert relevant == {"plan": "new plan"}
+        assert manager.get_relevant_context("old plan", limit=1, min_score=0.99) == {}
+
+    def test_close_registers_remaining_documents(self, search: SemanticSearch) -> None:
+        """close()で残りが登録され、以降の追加は同期的に登録されることのテスト。"""
+        manager = ContextManager(semantic_search=search, background_indexing=True)
+        indexer = manager._indexer
+        for i in range(3):
+            manager.add_to_context(f"key-{i}", f"value {i}")
+
+        manager.close()
+
+        assert not indexer.is_alive()
+        assert manager._idx_queue is None
+        assert set(search.documents) == {"key-0", "key-1", "key-2"}
+
+        manager.add_to_context("late", "late value")
+        manager.flush_index(force=True)
+        assert search.documents["late"] == "late value"
+
+    def test_close_while_adding(self, search: SemanticSearch) -> None:
+        """追加中にclose()しても取りこぼしが無いことのテスト。"""
+        manager = ContextManager(semantic_search=search, background_indexing=True)
+        start = threading.Barrier(5)
+
+        def add(worker: int) -> None:
+            start.wait()
+            for i in range(50):
+                manager.add_to_context(f"key-{worker}-{i}", f"value {worker} {i}")
+
+        threads = [threading.Thread(target=add, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        manager.close()
+        for thread in threads:
+            thread.join()
+        manager.flush_index(force=True)
+
+        assert len(search.documents) == 4 * 50
@@ -0,0 +1,51 @@
+"""Test cases for JSON tree conversion."""
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from genesis_agi.utils.json_tree import canonical_dumps, to_jsonable, walk
+
+
+class Point(BaseModel):
+    """テスト用のモデル。"""
+
+    x: int
+    y: int
+
+
+class TestToJsonable:
+    """JSON直列化可能な形式への変換のテスト。"""
+
+    def test_nested(self) -> None:
+        """ネストした構造の変換のテスト。"""
+        data = {
+            "time": datetime(2024, 1, 2, 3, 4, 5),
+            "items": [{"point": Point(x=1, y=2)}, "text", 3, None],
+        }
+        expected = {
+            "time": "2024-01-02T03:04:05",
+            "items": [{"point": {"x": 1, "y": 2}}, "text", 3, None],
+        }
+
+        assert to_jsonable(data) == expected
+        assert walk(data) == expected
+
+    def test_subclass(self) -> None:
+        """dictのサブクラスの変換のテスト。"""
+
+        class Context(dict):
+            pass
+
+        assert walk(Context(a=[datetime(2024, 1, 1)])) == {"a": ["2024-01-01T00:00:00"]}
+
+
+class TestCanonicalDumps:
+    """キー順を固定したJSON変換のテスト。"""
+
+    def test_key_order(self) -> None:
+        """キーの順序に依らず同じバイト列になることのテスト。"""
+        first = canonical_dumps({"b": [1, "あ"], "a": {"d": None, "c": True}})
+        second = canonical_dumps({"a": {"c": True, "d": None}, "b": [1, "あ"]})
+
+        assert first == second
+        assert first == '{"a":{"c":true,"d":null},"b":[1,"あ"]}'.encode("utf-8")
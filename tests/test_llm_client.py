@@ -0,0 +1,114 @@
+"""Test cases for LLM client response caching."""
+import asyncio
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from openai.types.chat import ChatCompletion
+
+from genesis_agi.llm import client as client_module
+from genesis_agi.llm.client import BatchLLMClient, LLMClient
+from genesis_agi.utils.cache import Cache
+
+
+def make_completion(content: str) -> ChatCompletion:
+    """テスト用のChatCompletionを作成する。"""
+    return ChatCompletion.model_validate({
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4",
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": content},
+        }],
+    })
+
+
+@pytest.fixture
+def llm_client(tmp_path: Path) -> LLMClient:
+    """APIを呼び出さないLLMClientを作成する。"""
+    cache = Cache(backend="filesystem", cache_dir=tmp_path / "cache", l1_size=16)
+    client = LLMClient(api_key="dummy_key", cache=cache)
+    client.client = MagicMock()
+    client.client.chat.completions.create.return_value = make_completion("response")
+    return client
+
+
+class TestCompletionCache:
+    """チャット補完の応答キャッシュのテスト。"""
+
+    MESSAGES = [
+        {"role": "system", "content": "You are a planner."},
+        {"role": "user", "content": "Plan the next step."},
+    ]
+
+    def test_default_policy_hits_cache(self, llm_client: LLMClient) -> None:
+        """同じ呼び出しの2回目はキャッシュから返すことのテスト。"""
+        llm_client._create_completion(self.MESSAGES)
+        llm_client._create_completion(self.MESSAGES)
+
+        assert llm_client.client.chat.completions.create.call_count == 1
+        assert llm_client.get_cache_stats()["hits"] == 1
+
+    def test_zero_ttl_bypasses_cache(self, llm_client: LLMClient) -> None:
+        """有効期限が0の種類の呼び出しはキャッシュしないことのテスト。"""
+        llm_client._create_completion(self.MESSAGES, cache_policy="generate_tasks")
+        llm_client._create_completion(self.MESSAGES, cache_policy="generate_tasks")
+
+        assert llm_client.client.chat.completions.create.call_count == 2
+        assert llm_client.get_cache_stats()["hits"] == 0
+
+    def test_params_are_part_of_key(self, llm_client: LLMClient) -> None:
+        """パラメータが異なる呼び出しは別の応答として扱うことのテスト。"""
+        llm_client._create_completion(self.MESSAGES, temperature=0.0)
+        llm_client._create_completion(self.MESSAGES, temperature=1.0)
+
+        assert llm_client.client.chat.completions.create.call_count == 2
+
+    def test_short_ttl_expires(self, llm_client: LLMClient) -> None:
+        """有効期限の短い種類の応答は期限切れ後に返さないことのテスト。"""
+        with patch.dict(client_module.CACHE_POLICY, {"prioritize_tasks": 1}):
+            llm_client._create_completion(self.MESSAGES, cache_policy="prioritize_tasks")
+            llm_client._create_completion(self.MESSAGES, cache_policy="prioritize_tasks")
+            assert llm_client.client.chat.completions.create.call_count == 1
+
+            time.sleep(1.1)
+            llm_client._create_completion(self.MESSAGES, cache_policy="prioritize_tasks")
+            assert llm_client.client.chat.completions.create.call_count == 2
+
+
+class TestBatchMap:
+    """BatchLLMClient.mapのテスト。"""
+
+    @staticmethod
+    def double(value: int) -> int:
+        """負の値では例外を送出する関数。"""
+        if value < 0:
+            raise ValueError("negative")
+        return value * 2
+
+    def test_map(self) -> None:
+        """イベントループの外から呼んだ場合のテスト。"""
+        batch = BatchLLMClient(MagicMock(), max_concurrency=2)
+        assert batch.map(self.double, [1, 2, 3]) == [2, 4, 6]
+
+    def test_map_inside_event_loop(self) -> None:
+        """イベントループの実行中に呼んでも結果と例外が順序通りに返ることのテスト。"""
+        batch = BatchLLMClient(MagicMock(), max_concurrency=2)
+
+        async def main() -> list:
+            return batch.map(self.double, [1, -1, 3], return_exceptions=True)
+
+        results = asyncio.run(main())
+        assert results[0] == 2
+        assert isinstance(results[1], ValueError)
+        assert results[2] == 6
+
+        async def main_raising() -> list:
+            return batch.map(self.double, [1, -1])
+
+        with pytest.raises(ValueError):
+            asyncio.run(main_raising())
@@ -0,0 +1,204 @@
+"""Test cases for semantic search indexing."""
+import zlib
+from types import SimpleNamespace
+from typing import List
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from genesis_agi.utils import semantic_search
+from genesis_agi.utils.semantic_search import SemanticSearch
+
+
+def _embed(text: str) -> np.ndarray:
+    """テキストごとに決まった埋め込みベクトルを返す。"""
+    rng = np.random.default_rng(zlib.crc32(text.encode()))
+    return rng.standard_normal(8)
+
+
+class _FakeHNSW:
+    """全件の内積で検索するHNSWインデックスの代用。"""
+
+    def __init__(self, dim: int, m: int, metric: int) -> None:
+        self.hnsw = SimpleNamespace()
+        self.matrix = np.zeros((0, dim), dtype=np.float32)
+        self.requested_k: List[int] = []
+
+    def add(self, matrix: np.ndarray) -> None:
+        self.matrix = np.vstack([self.matrix, matrix])
+
+    def search(self, query: np.ndarray, k: int):
+        self.requested_k.append(k)
+        scores = self.matrix @ query[0]
+        top = np.argsort(-scores, kind="stable")[:k]
+        return scores[top][np.newaxis, :], top[np.newaxis, :]
+
+
+@pytest.fixture
+def search() -> SemanticSearch:
+    """埋め込みAPIを呼び出さないSemanticSearchを作成する。"""
+    search = SemanticSearch()
+    search._get_embedding = _embed
+    search._get_embeddings = lambda texts: [_embed(text) for text in texts]
+    return search
+
+
+@pytest.fixture
+def fake_faiss(monkeypatch: pytest.MonkeyPatch) -> None:
+    """件数に関わらずHNSWの代用インデックスを使わせる。"""
+    fake = SimpleNamespace(IndexHNSWFlat=_FakeHNSW, METRIC_INNER_PRODUCT=0)
+    monkeypatch.setattr(semantic_search, "faiss", fake)
+    monkeypatch.setattr(semantic_search, "HNSW_MIN_DOCUMENTS", 1)
+
+
+def _index(search: SemanticSearch, count: int) -> None:
+    """doc-0からdoc-{count-1}までをまとめて登録する。"""
+    search.index_documents_batch(
+        [(f"doc-{i}", f"content {i}", {"group": i % 2}) for i in range(count)]
+    )
+
+
+def _brute_force(search: SemanticSearch, query: str) -> List[str]:
+    """登録中の全ドキュメントをコサイン類似度の高い順に並べる。"""
+    query_embedding = _embed(query)
+    scores = {
+        doc_id: search._cosine_similarity(query_embedding, embedding)
+        for doc_id, embedding in search.embeddings.items()
+    }
+    return sorted(scores, key=lambda doc_id: -scores[doc_id])
+
+
+class TestIndexMaintenance:
+    """インデックスの追記・削除済み行・作り直しのテスト。"""
+
+    def test_new_documents_are_appended(self, search: SemanticSearch) -> None:
+        """追加したドキュメントが作り直さずに末尾へ追記されることのテスト。"""
+        _index(search, 3)
+        search._ensure_index()
+        ids_before = list(search._index_ids)
+
+        search.index_document("doc-3", "content 3")
+        search.index_document("doc-4", "content 4")
+        with patch.object(search, "_rebuild_index") as rebuild:
+            search._ensure_index()
+
+        rebuild.assert_not_called()
+        assert search._index_ids == ids_before + ["doc-3", "doc-4"]
+        assert search._index_rows["doc-4"] == 4
+        assert search._matrix.shape[0] == 5
+        assert not search._pending_ids
+
+    def test_update_and_remove_leave_tombstones(self, search: SemanticSearch) -> None:
+        """更新・削除したドキュメントの行が削除済みになることのテスト。"""
+        _index(search, 10)
+        search._ensure_index()
+
+        search.index_document("doc-1", "updated content 1")
+        search.remove_document("doc-2")
+
+        assert search._index_ids[1] is None
+        assert search._index_ids[2] is None
+        assert search._tombstones == 2
+        assert list(search._pending_ids) == ["doc-1"]
+
+        # 削除済みの行が閾値以下なら更新したドキュメントを末尾に追記する
+        search._ensure_index()
+        assert search._tombstones == 2
+        assert len(search._index_ids) == 11
+        assert search._index_rows["doc-1"] == 10
+
+    def test_rebuild_when_tombstones_exceed_ratio(self, search: SemanticSearch) -> None:
+        """削除済みの行が閾値を超えたらインデックスを作り直すことのテスト。"""
+        _index(search, 8)
+        search._ensure_index()
+
+        for i in range(3):
+            search.remove_document(f"doc-{i}")
+        assert search._tombstones > len(search._index_ids) * semantic_search.INDEX_REBUILD_RATIO
+
+        search._ensure_index()
+        assert search._tombstones == 0
+        assert None not in search._index_ids
+        assert sorted(search._index_ids) == sorted(search.embeddings)
+        assert search._matrix.shape[0] == 5
+
+
+class TestSearch:
+    """検索結果のテスト。"""
+
+    def test_ranking_matches_brute_force(self, search: SemanticSearch) -> None:
+        """上位の結果が全件のコサイン類似度による順位と一致することのテスト。"""
+        _index(search, 50)
+        search.index_document("doc-7", "updated content 7")
+        search.remove_document("doc-9")
+
+        results = search.search("query", limit=5, min_score=-1.0)
+
+        assert [result.id for result in results] == _brute_force(search, "query")[:5]
+        for result in results:
+            expected = search._cosine_similarity(_embed("query"), search.embeddings[result.id])
+            assert result.score == pytest.approx(expected, abs=1e-5)
+
+    def test_removed_and_updated_documents_are_not_returned(
+        self,
+        search: SemanticSearch
+    ) -> None:
+        """削除・更新前のドキュメントが検索結果に現れないことのテスト。"""
+        _index(search, 20)
+        search._ensure_index()
+        search.remove_document("doc-3")
+        search.index_document("doc-5", "updated content 5")
+
+        results = search.search("query", limit=100, min_score=-1.0)
+        ids = [result.id for result in results]
+
+        assert "doc-3" not in ids
+        assert len(ids) == len(set(ids)) == 19
+        updated = next(result for result in results if result.id == "doc-5")
+        assert updated.content == "updated content 5"
+        assert updated.score == pytest.approx(
+            search._cosine_similarity(_embed("query"), _embed("updated content 5")),
+            abs=1e-5,
+        )
+
+    def test_overfetch_with_tombstones(
+        self,
+        search: SemanticSearch,
+        fake_faiss: None
+    ) -> None:
+        """削除済みの行の分だけ候補を多めに取ることのテスト。"""
+        _index(search, 20)
+        search._ensure_index()
+        for i in range(4):
+            search.remove_document(f"doc-{i}")
+
+        results = search.search("query", limit=3, min_score=-1.0)
+
+        assert search._hnsw.requested_k == [3 + 4]
+        assert [result.id for result in results] == _brute_force(search, "query")[:3]
+
+    def test_overfetch_with_metadata_filter(
+        self,
+        search: SemanticSearch,
+        fake_faiss: None
+    ) -> None:
+        """メタデータで絞り込む場合に削除済みの行の分も含めて多めに取ることのテスト。"""
+        _index(search, 150)
+        search._ensure_index()
+        for i in range(10):
+            search.remove_document(f"doc-{i}")
+
+        results = search.search(
+            "query",
+            limit=5,
+            min_score=-1.0,
+            filter_metadata={"group": 1},
+        )
+
+        assert search._hnsw.requested_k == [100 + 10]
+        expected = [
+            doc_id for doc_id in _brute_force(search, "query")
+            if search.metadata[doc_id]["group"] == 1
+        ]
+        assert [result.id for result in results] == expected[:5]
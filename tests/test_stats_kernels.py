@@ -0,0 +1,43 @@
+"""Test cases for statistics kernels."""
+import numpy as np
+
+from genesis_agi.core.history import ExecutionHistorySoA
+from genesis_agi.operators.base_operator import operator_code
+from genesis_agi.utils.stats_kernels import reduce_op_stats
+
+
+class TestReduceOpStats:
+    """オペレーター別統計カーネルのテスト。"""
+
+    def test_reduce(self) -> None:
+        """集計結果のテスト。"""
+        op_ids = np.array([0, 1, 0, 0], dtype=np.int32)
+        oks = np.array([True, False, False, True])
+        times = np.array([1.0, 2.0, 3.0, 4.0])
+        gens = np.array([1, 0, 2, 3], dtype=np.int64)
+
+        counts, successes, total_times, generated = reduce_op_stats(
+            op_ids, oks, times, gens, 2
+        )
+
+        assert counts.tolist() == [3, 1]
+        assert successes.tolist() == [2, 0]
+        assert total_times.tolist() == [8.0, 2.0]
+        assert generated.tolist() == [6, 0]
+
+
+class TestExecutionHistorySoA:
+    """列指向の実行履歴のテスト。"""
+
+    def test_operator_stats(self) -> None:
+        """容量を超えて追加した記録がオペレーター別に集計されることのテスト。"""
+        history = ExecutionHistorySoA(capacity=1)
+        history.record(operator_code("SoATestA"), True, 1.0, 2)
+        history.record(operator_code("SoATestB"), False, 2.0, 0)
+        history.record(operator_code("SoATestA"), False, 3.0, 1)
+
+        stats = history.operator_stats()
+
+        assert len(history) == 3
+        assert stats["SoATestA"] == {"count": 2, "success": 1, "total_time": 4.0, "generated": 3}
+        assert stats["SoATestB"] == {"count": 1, "success": 0, "total_time": 2.0, "generated": 0}
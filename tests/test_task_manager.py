@@ -184,4 +184,42 @@ class TestTaskManager:
         
         assert suggestions is not None
         assert isinstance(suggestions, list)
-        assert len(suggestions) > 0
\ No newline at end of file
+        assert len(suggestions) > 0
+
+class TestTaskQueue:
+    """タスクのヒープ（優先度キュー）のテスト。"""
+
+    @pytest.fixture
+    def queue_manager(self) -> TaskManager:
+        """LLMとデータベースを使わないTaskManagerを作成する。"""
+        return TaskManager(llm_client=MagicMock(), db_session=MagicMock())
+
+    def test_priority_update_and_stale_entries(self, queue_manager: TaskManager) -> None:
+        """優先度の変更が反映され、古いヒープ要素が読み捨てられることのテスト。"""
+        low = Task(id="low", name="Low", description="low priority", priority=1)
+        high = Task(id="high", name="High", description="high priority", priority=2)
+        queue_manager._push_tasks([low, high])
+        assert queue_manager.get_next_task().id == "high"
+
+        # 優先度を上げたタスクが先頭になり、変更前の要素は無効になる
+        queue_manager._apply_priorities({"prioritized_tasks": [{"id": "low", "priority": 5}]})
+        assert queue_manager.get_next_task().id == "low"
+
+        # 取り除いたタスクの要素は取り出し時に読み捨てられる
+        queue_manager._remove_task(low)
+        assert queue_manager.get_next_task().id == "high"
+        assert [task.id for task in queue_manager.current_tasks] == ["high"]
+
+    def test_claim_skips_running_tasks(self, queue_manager: TaskManager) -> None:
+        """実行中のタスクが重複して確保されないことのテスト。"""
+        tasks = [
+            Task(id=f"task-{i}", name=f"Task {i}", description="queued", priority=i)
+            for i in range(3)
+        ]
+        queue_manager._push_tasks(tasks)
+
+        first = queue_manager._claim_tasks(2)
+        second = queue_manager._claim_tasks(2)
+
+        assert [task.id for task in first] == ["task-2", "task-1"]
+        assert [task.id for task in second] == ["task-0"]
@@ -0,0 +1,102 @@
+"""Test cases for UnifiedManager execution recording."""
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from genesis_agi.core.unified_manager import UnifiedManager
+
+
+@pytest.fixture
+def operator() -> MagicMock:
+    """実行結果を返すオペレーターのモックを作成する。"""
+    operator = MagicMock()
+    operator.execute.return_value = {
+        "status": "success",
+        "output": "done",
+        "metrics": {"quality_score": 0.8, "execution_time": 0.5},
+    }
+    return operator
+
+
+@pytest.fixture
+def manager(operator: MagicMock, tmp_path: Path) -> UnifiedManager:
+    """LLMを呼び出さないUnifiedManagerを作成する。"""
+    registry = MagicMock()
+    registry.get_operator.return_value = operator
+    manager = UnifiedManager(
+        llm_client=MagicMock(),
+        registry=registry,
+        history_path=str(tmp_path / "history.jsonl"),
+        history_window=2,
+    )
+    # 後続タスクの計画（LLM呼び出し）は行わない
+    manager._plan_iteration = MagicMock()
+    return manager
+
+
+class TestExecutionRecording:
+    """execute_next_taskによる実行記録のテスト。"""
+
+    def test_success_is_recorded_once(self, manager: UnifiedManager, tmp_path: Path) -> None:
+        """成功した実行が1回だけ記録され、各集計に反映されることのテスト。"""
+        manager.create_task("analyze data", "analysis")
+
+        result = manager.execute_next_task()
+        manager.close()
+
+        assert result["status"] == "success"
+        assert len(manager.execution_history) == 1
+        assert len((tmp_path / "history.jsonl").read_text().splitlines()) == 1
+        assert manager._total_stats == {"total": 1, "lenient_success": 1, "lenient_failed": 0}
+        assert manager.operator_stats["analysis"]["count"] == 1
+        assert manager.operator_stats["analysis"]["success"] == 1
+        assert manager._window_operator_stats["analysis"]["successful"] == 1
+        manager._plan_iteration.assert_called_once()
+
+        metrics = manager.current_context["performance_metrics"]
+        assert metrics["total_tasks"] == 1
+        assert metrics["success_rate"] == 1.0
+        assert metrics["window_total_tasks"] == 1
+
+    def test_operator_error_is_recorded_once(
+        self,
+        manager: UnifiedManager,
+        operator: MagicMock
+    ) -> None:
+        """オペレーターの例外が失敗として1回だけ記録されることのテスト。"""
+        operator.execute.side_effect = RuntimeError("boom")
+        manager.create_task("analyze data", "analysis")
+
+        result = manager.execute_next_task()
+
+        assert result["status"] == "failed"
+        assert len(manager.execution_history) == 1
+        assert manager._total_stats == {"total": 1, "lenient_success": 0, "lenient_failed": 1}
+        assert manager.operator_stats["analysis"]["success"] == 0
+        assert manager._window_operator_stats["analysis"]["failed"] == 1
+
+    def test_totals_outlive_history_window(
+        self,
+        manager: UnifiedManager,
+        operator: MagicMock
+    ) -> None:
+        """総数は全記録、window_*はメモリ上の直近の履歴で数えることのテスト。"""
+        for i in range(3):
+            if i == 2:
+                operator.execute.return_value = {
+                    "status": "failed",
+                    "output": "",
+                    "metrics": {"quality_score": 0.0},
+                }
+            manager.create_task(f"analyze data {i}", "analysis")
+            manager.execute_next_task()
+
+        metrics = manager.current_context["performance_metrics"]
+        assert metrics["total_tasks"] == 3
+        assert metrics["successful_tasks"] == 2
+        assert metrics["window_total_tasks"] == 2
+        assert metrics["window_successful_tasks"] == 1
+        assert metrics["window_success_rate"] == 0.5
+        assert manager.operator_stats["analysis"]["count"] == 3
+        assert manager._window_operator_stats["analysis"]["total"] == 2